@@ -0,0 +1,169 @@
+# alarm.py
+import os
+import logging
+
+from PyQt5 import QtCore
+from PyQt5.QtMultimedia import QSoundEffect
+from logging_config import log_exceptions
+from sound_cache import PcmCache, DecodeWorker
+from clock import get_clock
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class AlarmPlayer(QtCore.QObject):
+    """
+    Звук окончания отсчёта, заранее загруженный в QSoundEffect.
+
+    Файл проверяется и декодируется при применении настроек (load), а не
+    в момент финиша; повторно — только если сменились путь или mtime файла
+    (refresh, вызывается при запуске отсчёта). WAV загружается напрямую,
+    сжатые форматы декодируются в фоновом потоке (sound_cache) и кэшируются.
+    play() лишь запускает уже готовый эффект и замеряет задержку
+    «дедлайн → начало воспроизведения».
+    """
+    SUPPORTED = (".wav", ".mp3", ".ogg", ".oga", ".flac", ".m4a", ".aac", ".wma")
+
+    _decode_requested = QtCore.pyqtSignal(str, "qint64")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._effect = QSoundEffect(self)
+        self._effect.statusChanged.connect(self._on_status)
+        self._effect.playingChanged.connect(self._on_playing)
+        self._path   = ""
+        self._mtime  = None
+        self._source_set = False          # эффект указывает на текущий файл
+        self.cache   = PcmCache()
+        self._thread = None               # поток декодера — при первом сжатом файле
+        self._clock  = get_clock()        # дедлайны — по тем же часам, что и ядро таймера
+        self._deadline_ns = None
+        self.last_play_delay_ns  = None   # дедлайн → вызов play()
+        self.last_start_delay_ns = None   # дедлайн → фактический старт звука
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def is_ready(self) -> bool:
+        return bool(self._path) and self._effect.status() == QSoundEffect.Ready
+
+    @log_exceptions
+    def load(self, path: str) -> bool:
+        """
+        Проверяет и загружает звук (пустой путь — звука нет). Тот же файл
+        с тем же mtime повторно не загружается. False — файл непригоден.
+        """
+        if not path:
+            self._path, self._mtime = "", None
+            self._source_set = False
+            self._effect.setSource(QtCore.QUrl())
+            return False
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            logger.warning("Звуковой файл не найден: %s", path)
+            self._path, self._mtime = "", None
+            return False
+
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in self.SUPPORTED:
+            logger.warning("Неподдерживаемый формат звука %s", path)
+            self._path, self._mtime = "", None
+            return False
+
+        if path == self._path and mtime == self._mtime:
+            return True
+
+        self._path, self._mtime = path, mtime
+        if ext == ".wav":
+            self._set_source(path)
+            return True
+
+        # сжатый формат: готовый PCM из кэша или декодирование в фоне
+        cached = self.cache.get(path, mtime)
+        if cached is not None:
+            self._set_source(cached.wav_path)
+        else:
+            self._source_set = False
+            self._ensure_decoder()
+            self._decode_requested.emit(path, mtime)
+        return True
+
+    def _set_source(self, file_path: str) -> None:
+        # setSource с тем же URL ничего не перечитывает — сбрасываем источник
+        self._effect.setSource(QtCore.QUrl())
+        self._effect.setSource(QtCore.QUrl.fromLocalFile(file_path))
+        self._source_set = True
+
+    def _ensure_decoder(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = QtCore.QThread(self)
+        self._worker = DecodeWorker()
+        self._worker.moveToThread(self._thread)
+        self._decode_requested.connect(self._worker.decode)
+        self._worker.decoded.connect(self._on_decoded)
+        self._worker.failed.connect(self._on_decode_failed)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.start()
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def shutdown(self) -> None:
+        """Останавливает поток декодера (при выходе из приложения)."""
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+
+    def _on_decoded(self, sound):
+        self.cache.put(sound)
+        logger.debug(
+            "Звук %s декодирован за %.1f мс (кэш: %d шт., %.1f МБ, попаданий %.0f%%)",
+            sound.path, sound.decode_ns / 1e6, len(self.cache),
+            self.cache.size_bytes / 2**20, self.cache.hit_rate * 100,
+        )
+        if (sound.path, sound.mtime) == (self._path, self._mtime):
+            self._set_source(sound.wav_path)
+
+    def _on_decode_failed(self, path: str, mtime: int, reason: str):
+        logger.warning("Не удалось декодировать звук %s: %s", path, reason)
+        if (path, mtime) == (self._path, self._mtime):
+            self._path, self._mtime = "", None
+
+    def refresh(self) -> None:
+        """Перезагружает звук, если файл изменился на диске (по mtime)."""
+        if self._path:
+            self.load(self._path)
+
+    def play(self, deadline_ns: int | None = None) -> None:
+        """Мгновенно проигрывает заранее загруженный звук."""
+        if not self._path:
+            return
+        if not self._source_set:
+            logger.warning("Звук %s ещё декодируется — пропускаем", self._path)
+            return
+        self._deadline_ns = deadline_ns
+        if deadline_ns is not None:
+            self.last_play_delay_ns = self._clock() - deadline_ns
+        self._effect.play()
+
+    def _on_status(self):
+        if self._effect.status() == QSoundEffect.Error:
+            logger.warning("Не удалось загрузить звук %s", self._path)
+
+    def _on_playing(self):
+        if not self._effect.isPlaying() or self._deadline_ns is None:
+            return
+        self.last_start_delay_ns = self._clock() - self._deadline_ns
+        self._deadline_ns = None
+        if instrumentation.enabled:
+            instrumentation.record("sound_start_delay", self.last_start_delay_ns)
+        logger.debug(
+            "Звук окончания: play() через %.1f мс, старт через %.1f мс после дедлайна",
+            (self.last_play_delay_ns or 0) / 1e6, self.last_start_delay_ns / 1e6,
+        )
@@ -0,0 +1,295 @@
+# app_versions.py
+"""
+Установленные версии приложения и атомарное переключение между ними.
+
+    <папка приложения>/
+      main.py, timer.py, …     — исходная установка (пока нет обновлений)
+      current.json             — {"current": "1.0.2", "history": ["1.0.1", …]}
+      versions/1.0.2/…         — полные деревья версий
+      store/objects/ab/ab12…   — содержимое файлов по SHA-256
+      store/manifests/1.0.2.json — {путь: SHA-256} файлов версии
+
+Обновление собирается в versions/.staging-… и становится текущим одной
+атомарной заменой current.json (os.replace). Оборвать установку можно
+в любой момент — до замены указателя запускается прежняя версия.
+Файлы версий — жёсткие ссылки на объекты store, поэтому неизменившийся
+файл в N версиях хранится один раз. Какие объекты ещё нужны, prune
+узнаёт из манифестов оставленных версий, а не по числу ссылок: без
+жёстких ссылок (копии) у каждого объекта ссылка одна. Модуль без Qt: он нужен main.py
+до импорта остального приложения.
+"""
+import os
+import sys
+import json
+import shutil
+import runpy
+
+from update_manifest import file_sha256
+
+VERSIONS_DIR = "versions"
+STORE_DIR    = os.path.join("store", "objects")
+MANIFESTS_DIR = os.path.join("store", "manifests")
+POINTER_FILE = "current.json"
+
+
+def install_root(app_dir: str) -> str:
+    """Папка установки по папке запущенного кода (versions/<v> → её корень)."""
+    app_dir = os.path.abspath(app_dir)
+    parent  = os.path.dirname(app_dir)
+    if os.path.basename(parent) == VERSIONS_DIR:
+        return os.path.dirname(parent)
+    return app_dir
+
+
+def launcher_path(app_dir: str) -> str:
+    """Что запускать для перезапуска: main.py в корне установки (или exe сборки)."""
+    if getattr(sys, "frozen", False):
+        return sys.executable
+    return os.path.join(install_root(app_dir), "main.py")
+
+
+def run_installed_version(main_file: str) -> bool:
+    """
+    Вызывается из main.py до импорта приложения: если установлена версия из
+    versions/, запускает её main.py вместо кода рядом. False — запускать
+    код рядом (обновлений нет, уже внутри версии или сборка PyInstaller).
+
+    Версия запускается в том же интерпретаторе, поэтому модули, уже
+    загруженные из корня установки (этот и update_manifest), выгружаются —
+    версия импортирует свои.
+    """
+    here = os.path.dirname(os.path.abspath(main_file))
+    if getattr(sys, "frozen", False) or install_root(here) != here:
+        return False
+    version_dir = VersionStore(here).current_dir()
+    entry = os.path.join(version_dir, "main.py")
+    if version_dir == here or not os.path.isfile(entry):
+        return False
+    sys.path[0] = version_dir
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name != "__main__" and path and os.path.dirname(os.path.abspath(path)) == here:
+            del sys.modules[name]
+    runpy.run_path(entry, run_name="__main__")
+    return True
+
+
+class VersionStore:
+    """Версии в root/versions, объекты в root/store, указатель root/current.json."""
+    KEEP = 3        # сколько версий хранить, включая текущую
+
+    def __init__(self, root: str):
+        self.root         = os.path.abspath(root)
+        self.versions_dir = os.path.join(self.root, VERSIONS_DIR)
+        self.objects_dir  = os.path.join(self.root, STORE_DIR)
+        self.manifests_dir = os.path.join(self.root, MANIFESTS_DIR)
+        self.pointer      = os.path.join(self.root, POINTER_FILE)
+        self.linked = 0     # файлов последней установки, взятых из store без копирования
+        self.stored = 0     # новых объектов в store
+        self._staged: dict[str, str] = {}   # путь → SHA-256 собираемой версии
+
+    # ──────────────────────────────────────────────────────────────
+    #  указатель
+    # ──────────────────────────────────────────────────────────────
+    def _read_pointer(self) -> dict:
+        try:
+            with open(self.pointer, encoding="utf-8") as f:
+                data = json.load(f)
+            return {"current": data.get("current"), "history": list(data.get("history", []))}
+        except (OSError, ValueError, AttributeError):
+            return {"current": None, "history": []}
+
+    @staticmethod
+    def _write_json(path: str, data: dict) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _write_pointer(self, data: dict) -> None:
+        self._write_json(self.pointer, data)   # атомарное переключение версии
+
+    def current(self) -> str | None:
+        """Текущая версия; None — исходная установка в корне."""
+        return self._read_pointer()["current"]
+
+    def history(self) -> list:
+        """Прежние версии, от последней к первой (None — исходная установка)."""
+        return self._read_pointer()["history"]
+
+    def version_dir(self, version: str | None) -> str:
+        return self.root if version is None else os.path.join(self.versions_dir, version)
+
+    def current_dir(self) -> str:
+        path = self.version_dir(self.current())
+        return path if os.path.isdir(path) else self.root
+
+    # ──────────────────────────────────────────────────────────────
+    #  хранилище объектов
+    # ──────────────────────────────────────────────────────────────
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def _store(self, src: str, sha256: str, move: bool) -> str:
+        obj = self._object_path(sha256)
+        if os.path.exists(obj):
+            if move:
+                os.remove(src)
+            return obj
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        if move:
+            os.replace(src, obj)
+        else:
+            try:
+                os.link(src, obj)
+            except OSError:
+                # копия — под временным именем: оборванная не станет объектом
+                shutil.copy2(src, obj + ".tmp")
+                os.replace(obj + ".tmp", obj)
+        self.stored += 1
+        return obj
+
+    def _manifest_path(self, version: str) -> str:
+        return os.path.join(self.manifests_dir, version + ".json")
+
+    def _version_objects(self, version: str) -> set | None:
+        """
+        SHA-256 файлов версии: из её манифеста, а без него (версия
+        поставлена до манифестов) — по самим файлам. None — не узнать.
+        """
+        try:
+            with open(self._manifest_path(version), encoding="utf-8") as f:
+                return set(json.load(f).values())
+        except (OSError, ValueError, AttributeError):
+            pass
+        hashes = set()
+        try:
+            for dirpath, _dirnames, filenames in os.walk(self.version_dir(version)):
+                for name in filenames:
+                    hashes.add(file_sha256(os.path.join(dirpath, name)))
+        except OSError:
+            return None
+        return hashes
+
+    def _link(self, obj: str, dst: str) -> None:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.link(obj, dst)
+            self.linked += 1
+        except OSError:                        # ФС без жёстких ссылок — копия
+            shutil.copy2(obj, dst)
+
+    # ──────────────────────────────────────────────────────────────
+    #  установка
+    # ──────────────────────────────────────────────────────────────
+    def begin(self, version: str) -> str:
+        """Новая пустая staging-папка; остатки прерванных установок удаляются."""
+        if not version or version.startswith(".") or any(c in version for c in '/\\:'):
+            raise ValueError(f"Недопустимое имя версии: {version!r}")
+        os.makedirs(self.versions_dir, exist_ok=True)
+        for name in os.listdir(self.versions_dir):
+            if name.startswith((".staging-", ".trash-")):
+                shutil.rmtree(os.path.join(self.versions_dir, name), ignore_errors=True)
+        self.linked = self.stored = 0
+        self._staged = {}
+        staging = os.path.join(self.versions_dir, f".staging-{version}-{os.getpid()}")
+        os.makedirs(staging)
+        return staging
+
+    def add_file(self, staging: str, rel: str, src: str, sha256: str, move: bool = False) -> None:
+        """Кладёт src в store (move — перенося, иначе ссылкой) и ссылку на него в staging/rel."""
+        obj = self._store(src, sha256, move)
+        self._link(obj, os.path.join(staging, *rel.split("/")))
+        self._staged[rel] = sha256
+
+    def absorb(self, staging: str) -> None:
+        """Заменяет файлы, распакованные в staging, ссылками на объекты store."""
+        for dirpath, _dirnames, filenames in os.walk(staging):
+            for name in filenames:
+                path   = os.path.join(dirpath, name)
+                sha256 = file_sha256(path)
+                obj    = self._store(path, sha256, move=True)
+                self._link(obj, path)
+                self._staged[os.path.relpath(path, staging).replace(os.sep, "/")] = sha256
+
+    def commit(self, version: str, staging: str) -> str:
+        """
+        Делает собранную версию текущей: staging → versions/<version>,
+        затем атомарная замена указателя. Возвращает папку версии.
+        """
+        final = self.version_dir(version)
+        if os.path.exists(final):
+            if os.path.abspath(final) == os.path.abspath(self.current_dir()):
+                raise RuntimeError(f"Версия {version} уже установлена и запущена")
+            trash = os.path.join(self.versions_dir, f".trash-{version}-{os.getpid()}")
+            os.rename(final, trash)
+            shutil.rmtree(trash, ignore_errors=True)
+        os.rename(staging, final)
+        # манифест — до указателя: у текущей версии он всегда есть
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        self._write_json(self._manifest_path(version), self._staged)
+
+        data = self._read_pointer()
+        history = [data["current"]] + [v for v in data["history"] if v != data["current"]]
+        history = [v for v in history if v != version]
+        self._write_pointer({"current": version, "history": history})
+        self.prune()
+        return final
+
+    def rollback(self) -> str | None:
+        """Возвращает предыдущую версию (None — исходную установку)."""
+        data = self._read_pointer()
+        if not data["history"]:
+            raise RuntimeError("Нет предыдущей версии для отката")
+        previous, *rest = data["history"]
+        self._write_pointer({"current": previous, "history": [data["current"]] + rest})
+        return previous
+
+    def prune(self) -> None:
+        """Удаляет версии сверх KEEP и объекты, которых нет ни в одной оставленной версии."""
+        data = self._read_pointer()
+        keep = {v for v in [data["current"]] + data["history"][: self.KEEP - 1] if v}
+        if data["history"][self.KEEP - 1:]:
+            self._write_pointer({"current": data["current"], "history": data["history"][: self.KEEP - 1]})
+        if os.path.isdir(self.versions_dir):
+            for name in os.listdir(self.versions_dir):
+                if not name.startswith(".") and name not in keep:
+                    shutil.rmtree(os.path.join(self.versions_dir, name), ignore_errors=True)
+        if os.path.isdir(self.manifests_dir):
+            for name in os.listdir(self.manifests_dir):
+                if name[: -len(".json")] not in keep:
+                    try:
+                        os.remove(os.path.join(self.manifests_dir, name))
+                    except OSError:
+                        pass
+        reachable = set()
+        for version in keep:
+            hashes = self._version_objects(version)
+            if hashes is None:
+                return              # не знаем, что нужно версии, — store не трогаем
+            reachable |= hashes
+        if os.path.isdir(self.objects_dir):
+            for dirpath, _dirnames, filenames in os.walk(self.objects_dir):
+                for name in filenames:
+                    if name not in reachable:
+                        try:
+                            os.remove(os.path.join(dirpath, name))
+                        except OSError:
+                            pass
+
+
+if __name__ == "__main__":
+    # python app_versions.py [папка] list | rollback
+    args = sys.argv[1:]
+    root = args.pop(0) if len(args) == 2 else os.path.dirname(os.path.abspath(__file__))
+    store = VersionStore(install_root(root))
+    if args == ["list"]:
+        print("current:", store.current() or "(исходная установка)")
+        for v in store.history():
+            print("        ", v or "(исходная установка)")
+    elif args == ["rollback"]:
+        print("current:", store.rollback() or "(исходная установка)")
+    else:
+        sys.exit("usage: python app_versions.py [папка] list|rollback")
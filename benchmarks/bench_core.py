@@ -0,0 +1,157 @@
+# benchmarks/bench_core.py
+"""
+Пропускная способность timer_core.TimerCore — без Qt, без WinAPI и без
+headless.py: ядро импортируется напрямую, как из скриптов и тестов.
+
+--ops операций (по умолчанию миллион) над одним ядром:
+
+    add    — добавить 1 с к длительности;
+    start  — запуск (после паузы);
+    pause  — пауза (после запуска);
+    tick   — тик запущенного таймера;
+    mixed  — цикл add → start → tick → pause, как в окне.
+
+Время передаётся явным `now` (целые нс, шаг 1 мс) — в замер не попадает
+сам вызов часов; `mixed-clock` — тот же цикл на time.monotonic_ns.
+Отчёт: нс на операцию и операций в секунду (лучший из --rounds).
+
+    python benchmarks/bench_core.py [--ops 1000000] [--rounds 3] [--out core.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timer_core import TimerCore, NS   # noqa: E402
+
+MS = 1_000_000
+
+
+def _running_core() -> TimerCore:
+    core = TimerCore()
+    core.set(10 ** 9)                        # не закончится за прогон
+    core.start(0)
+    return core
+
+
+def bench_add(n: int) -> int:
+    core = TimerCore()
+    add = core.add
+    t0 = time.perf_counter_ns()
+    for _ in range(n):
+        add(1)
+    return time.perf_counter_ns() - t0
+
+
+def bench_start(n: int) -> int:
+    core = _running_core()
+    start, pause = core.start, core.pause
+    total = 0
+    for i in range(n):
+        pause(i * MS)
+        t0 = time.perf_counter_ns()
+        start(i * MS)
+        total += time.perf_counter_ns() - t0
+    return total
+
+
+def bench_pause(n: int) -> int:
+    core = _running_core()
+    start, pause = core.start, core.pause
+    total = 0
+    for i in range(n):
+        start(i * MS)
+        t0 = time.perf_counter_ns()
+        pause(i * MS)
+        total += time.perf_counter_ns() - t0
+    return total
+
+
+def bench_tick(n: int) -> int:
+    core = _running_core()
+    tick = core.tick
+    t0 = time.perf_counter_ns()
+    for i in range(n):
+        tick(i * MS)
+    return time.perf_counter_ns() - t0
+
+
+def bench_mixed(n: int) -> int:
+    core = TimerCore()
+    add, start, tick, pause = core.add, core.start, core.tick, core.pause
+    t0 = time.perf_counter_ns()
+    for i in range(n // 4):
+        now = i * 4 * MS
+        add(1)
+        start(now)
+        tick(now + MS)
+        pause(now + 2 * MS)
+    return time.perf_counter_ns() - t0
+
+
+def bench_mixed_clock(n: int) -> int:
+    core = TimerCore()
+    add, start, tick, pause = core.add, core.start, core.tick, core.pause
+    t0 = time.perf_counter_ns()
+    for _ in range(n // 4):
+        add(1)
+        start()
+        tick()
+        pause()
+    return time.perf_counter_ns() - t0
+
+
+CASES = {
+    "add":         bench_add,
+    "start":       bench_start,
+    "pause":       bench_pause,
+    "tick":        bench_tick,
+    "mixed":       bench_mixed,
+    "mixed-clock": bench_mixed_clock,
+}
+
+
+def check_exact(n: int) -> bool:
+    """n циклов запуск → 1 мс → пауза дают ровно n мс — без дрейфа float."""
+    core = TimerCore()
+    core.set(n)
+    for i in range(n):
+        core.start(i * 3 * MS)
+        core.pause(i * 3 * MS + MS)
+    return core.elapsed_ns == n * MS
+
+
+def run(ops: int, rounds: int) -> dict:
+    cases = {}
+    for name, bench in CASES.items():
+        ns = min(bench(ops) for _ in range(rounds))
+        cases[name] = {
+            "ns_per_op":  round(ns / ops, 1),
+            "ops_per_s":  round(ops * NS / ns),
+        }
+    return {"ops": ops, "rounds": rounds, "exact": check_exact(min(ops, 100_000)), "cases": cases}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=1_000_000, help="операций на случай (по умолчанию 1000000)")
+    parser.add_argument("--rounds", type=int, default=3, help="проходов, берётся лучший (по умолчанию 3)")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    report = run(args.ops, args.rounds)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"{'case':13}{'ns/op':>10}{'ops/s':>14}")
+    for name, r in report["cases"].items():
+        print(f"{name:13}{r['ns_per_op']:>10}{r['ops_per_s']:>14,}")
+    print(f"exact elapsed after start/pause cycles: {report['exact']}")
+    return 0 if report["exact"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# benchmarks/bench_engine.py
+"""
+Стоимость TimerEngine на --timers таймерах (по умолчанию 10 000) со
+ступенчатыми дедлайнами: i-й таймер — на 1 с + i × --step мс, добавляются
+в случайном порядке. Без Qt: часы — clock.VirtualClock, переданный
+движку, «будильник ОС» — счётчик взведений.
+
+    schedule — добавить все таймеры (add со стартом);
+    churn    — пауза и продолжение каждого таймера в случайном порядке;
+    fire     — пройти все дедлайны: часы переводятся на взведённый
+               будильник, fire() снимает наступившие финиши.
+
+Для сравнения — тот же schedule при поиске ближайшего дедлайна
+перебором всех таймеров (linear_schedule_ms) — как если бы каждый из
+многих таймеров не лежал в общей куче.
+
+    python benchmarks/bench_engine.py [--timers 10000] [--step 37] [--seed 1] [--out engine.json]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import VirtualClock         # noqa: E402
+from timer_engine import TimerEngine   # noqa: E402
+
+NS = 1_000_000_000
+MS = 1_000_000
+
+
+def _plan(timers: int, step_ms: int, seed: int) -> list:
+    plan = [(f"t{i}", 1 + i * step_ms / 1000) for i in range(timers)]
+    random.Random(seed).shuffle(plan)
+    return plan
+
+
+def bench_engine(plan) -> dict:
+    clock = VirtualClock(start_ns=1_000 * NS)
+    armed = []
+    engine = TimerEngine(arm=armed.append, clock=clock)
+
+    t0 = time.perf_counter_ns()
+    for timer_id, secs in plan:
+        engine.add(timer_id, secs)
+    schedule_ns = time.perf_counter_ns() - t0
+    schedule_arms = len(armed)
+
+    order = [timer_id for timer_id, _ in plan]
+    random.Random(len(plan)).shuffle(order)
+    t0 = time.perf_counter_ns()
+    for timer_id in order:
+        engine.pause(timer_id)
+        engine.resume(timer_id)
+    churn_ns = time.perf_counter_ns() - t0
+
+    fired, wakeups = 0, 0
+    t0 = time.perf_counter_ns()
+    while True:
+        deadline = engine.next_deadline()
+        if deadline is None:
+            break
+        clock.advance_to(deadline)
+        fired   += len(engine.fire())
+        wakeups += 1
+    fire_ns = time.perf_counter_ns() - t0
+
+    n = len(plan)
+    return {
+        "schedule_ms":    round(schedule_ns / 1e6, 2),
+        "schedule_us_op": round(schedule_ns / n / 1000, 2),
+        "schedule_arms":  schedule_arms,
+        "churn_ms":       round(churn_ns / 1e6, 2),
+        "churn_us_op":    round(churn_ns / (2 * n) / 1000, 2),
+        "fire_ms":        round(fire_ns / 1e6, 2),
+        "fire_us_op":     round(fire_ns / n / 1000, 2),
+        "fired":          fired,
+        "wakeups":        wakeups,
+    }
+
+
+def bench_linear(plan) -> float:
+    """schedule с перебором: ближайший дедлайн — min() по всем таймерам."""
+    now = 1_000 * NS
+    deadlines, armed = {}, None
+    t0 = time.perf_counter_ns()
+    for timer_id, secs in plan:
+        deadlines[timer_id] = now + int(round(secs * NS))
+        earliest = min(deadlines.values())
+        if earliest != armed:
+            armed = earliest
+    return round((time.perf_counter_ns() - t0) / 1e6, 2)
+
+
+def run(timers: int, step_ms: int, seed: int) -> dict:
+    plan = _plan(timers, step_ms, seed)
+    report = {"timers": timers, "step_ms": step_ms, **bench_engine(plan)}
+    report["linear_schedule_ms"] = bench_linear(plan)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timers", type=int, default=10_000, help="таймеров (по умолчанию 10000)")
+    parser.add_argument("--step", type=int, default=37, help="шаг дедлайнов, мс (по умолчанию 37)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    report = run(args.timers, args.step, args.seed)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    for key, value in report.items():
+        print(f"{key:22} {value}")
+    return 0 if report["fired"] == args.timers else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# benchmarks/bench_glyphs.py
+"""
+Микробенчмарк надписи HH:MM:SS (offscreen): атлас глифов (glyph_atlas.py)
+против прежнего пути paintEvent — новый QFont и два drawText (обводка 3px
+и заливка 1px) на каждый кадр, в вертикальной ориентации ещё и
+save/translate/rotate/restore.
+
+Для ориентации × темы × размера шрифта надпись рисуется --frames раз в
+QImage, на каждом кадре — новое время. Отчёт: мкс на надпись для обоих
+путей (лучший из --rounds проходов), ускорение и время построения атласа
+(платится один раз при смене шрифта/темы/ориентации).
+
+    python benchmarks/bench_glyphs.py [--frames 2000] [--rounds 3] [--out glyphs.json]
+"""
+import sys
+import json
+import time
+import argparse
+import itertools
+
+import headless
+
+ORIENTATIONS = ("horizontal", "vertical")
+THEMES       = ("dark", "light")
+FONT_SIZES   = (8, 12, 16, 22)
+FAMILY       = "Arial"
+CANVAS       = (240, 48)              # горизонтальное окно; вертикальное — повёрнуто
+
+
+def _labels(frames: int) -> list:
+    return [f"{h:02d}:{m:02d}:{s:02d}"
+            for h, m, s in ((i // 3600 % 24, i // 60 % 60, i % 60) for i in range(frames))]
+
+
+def _outline_pens(theme: str):
+    from PyQt5 import QtGui
+    white, black = QtGui.QColor(255, 255, 255), QtGui.QColor(0, 0, 0)
+    if theme == "light":
+        return QtGui.QPen(white, 3), QtGui.QPen(black, 1)
+    return QtGui.QPen(black, 3), QtGui.QPen(white, 1)
+
+
+def draw_text(p, label: str, rect, theme: str, size: int, vertical: bool) -> None:
+    """Прежний путь paintEvent (до атласа)."""
+    from PyQt5 import QtCore, QtGui
+    outline, fill = _outline_pens(theme)
+    p.setFont(QtGui.QFont(FAMILY, size, QtGui.QFont.Bold))
+    if not vertical:
+        p.setPen(outline)
+        p.drawText(rect, QtCore.Qt.AlignCenter, label)
+        p.setPen(fill)
+        p.drawText(rect, QtCore.Qt.AlignCenter, label)
+        return
+    w, h = rect.width(), rect.height()
+    p.save()
+    p.translate(w / 2, h / 2)
+    p.rotate(-90)
+    rotated = QtCore.QRectF(-h / 2, -w / 2, h, w)
+    p.setPen(outline)
+    p.drawText(rotated, QtCore.Qt.AlignCenter, label)
+    p.setPen(fill)
+    p.drawText(rotated, QtCore.Qt.AlignCenter, label)
+    p.restore()
+
+
+def draw_atlas(p, label: str, rect, atlas) -> None:
+    for pos, pix in atlas.layout(label, rect):
+        p.drawPixmap(pos, pix)
+
+
+def _time_frames(image, labels, draw) -> float:
+    """мкс на надпись: кадры рисуются, как в paintEvent, — свой QPainter на кадр."""
+    from PyQt5 import QtCore, QtGui
+    rect = image.rect()
+    t0 = time.perf_counter_ns()
+    for label in labels:
+        image.fill(QtCore.Qt.transparent)
+        p = QtGui.QPainter(image)
+        p.setRenderHint(QtGui.QPainter.Antialiasing)
+        draw(p, label, rect)
+        p.end()
+    return (time.perf_counter_ns() - t0) / len(labels) / 1000
+
+
+def bench_case(orientation: str, theme: str, size: int, labels, rounds: int) -> dict:
+    from PyQt5 import QtGui
+    from glyph_atlas import GlyphAtlas
+    vertical = orientation == "vertical"
+    w, h = CANVAS if not vertical else CANVAS[::-1]
+    image = QtGui.QImage(w, h, QtGui.QImage.Format_ARGB32_Premultiplied)
+
+    t0 = time.perf_counter_ns()
+    atlas = GlyphAtlas(FAMILY, size, theme, vertical, image.devicePixelRatio())
+    build_ms = (time.perf_counter_ns() - t0) / 1e6
+
+    text_us  = min(_time_frames(image, labels, lambda p, l, r: draw_text(p, l, r, theme, size, vertical))
+                   for _ in range(rounds))
+    atlas_us = min(_time_frames(image, labels, lambda p, l, r: draw_atlas(p, l, r, atlas))
+                   for _ in range(rounds))
+    return {
+        "drawtext_us":    round(text_us, 2),
+        "atlas_us":       round(atlas_us, 2),
+        "speedup":        round(text_us / atlas_us, 2),
+        "atlas_build_ms": round(build_ms, 3),
+    }
+
+
+def run(frames: int, rounds: int) -> dict:
+    app = headless.make_app()                # noqa: F841 — живёт до конца прогона
+    labels = _labels(frames)
+    cases = {}
+    for orientation, theme, size in itertools.product(ORIENTATIONS, THEMES, FONT_SIZES):
+        key = f"{orientation}/{theme}/{size}pt"
+        cases[key] = bench_case(orientation, theme, size, labels, rounds)
+        print(f"{key:22} drawText {cases[key]['drawtext_us']:8.1f} us  "
+              f"atlas {cases[key]['atlas_us']:7.1f} us  x{cases[key]['speedup']}", file=sys.stderr)
+    return {"frames": frames, "rounds": rounds, "cases": cases}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=2000, help="надписей на случай (по умолчанию 2000)")
+    parser.add_argument("--rounds", type=int, default=3, help="проходов, берётся лучший (по умолчанию 3)")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    report = run(args.frames, args.rounds)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"{'case':22}{'drawText us':>14}{'atlas us':>12}{'speedup':>10}{'build ms':>11}")
+    for key, r in report["cases"].items():
+        print(f"{key:22}{r['drawtext_us']:>14}{r['atlas_us']:>12}{r['speedup']:>10}{r['atlas_build_ms']:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# benchmarks/bench_guard.py
+"""
+Цена защиты от исключений на кадровом пути: TaskbarTimer._tick с
+декоратором @log_exceptions (как было) и без него, под одним
+install_exception_guard() на процесс (как сейчас).
+
+Окно видно и ведёт часовой отсчёт на виртуальных часах (clock.VirtualClock),
+поэтому _tick вызывается напрямую --calls раз без ожидания кадров: ядро,
+грязные области и планирование следующего кадра — как на экране.
+
+    tick-guarded — _tick как есть;
+    tick-wrapped — _tick, обёрнутый log_exceptions на экземпляре окна;
+    noop-*       — то же для пустой функции: цена самой обёртки.
+
+Отчёт: вызовов в секунду и нс на вызов (лучший из --rounds; случаи
+чередуются, порядок от раунда к раунду меняется на обратный).
+
+    python benchmarks/bench_guard.py [--calls 200000] [--rounds 6] [--out guard.json]
+"""
+import sys
+import json
+import time
+import argparse
+
+import headless
+from clock import VirtualClock, set_clock
+
+NS = 1_000_000_000
+
+
+def _best(cases: dict, calls: int, rounds: int, between) -> dict:
+    """
+    Лучшее время каждого случая. Первый случай раунда заметно медленнее
+    остальных, поэтому порядок в каждом следующем раунде обратный.
+    """
+    best  = {}
+    order = list(cases.items())
+    for _ in range(rounds):
+        for name, func in order:
+            t0 = time.perf_counter_ns()
+            for _ in range(calls):
+                func()
+            elapsed = time.perf_counter_ns() - t0
+            best[name] = min(best.get(name, elapsed), elapsed)
+            between()
+        order.reverse()
+    return best
+
+
+def run(calls: int, rounds: int) -> dict:
+    set_clock(VirtualClock(start_ns=1_000 * NS))     # до FrameClock и окна
+    app = headless.make_app()
+    from logging_config import log_exceptions, install_exception_guard
+    from timer import TaskbarTimer
+
+    install_exception_guard()
+    timer = TaskbarTimer()
+    timer.show()
+    timer._set_duration(3600)
+    if not timer.running:
+        timer._toggle_start_pause()
+    app.processEvents()
+
+    def noop():
+        pass
+
+    cases = {
+        "tick-guarded": timer._tick,
+        "tick-wrapped": log_exceptions(TaskbarTimer._tick).__get__(timer),
+        "noop-guarded": noop,
+        "noop-wrapped": log_exceptions(noop),
+    }
+    report = {}
+    # между замерами — отложенные перерисовки
+    for name, ns in _best(cases, calls, rounds, app.processEvents).items():
+        report[name] = {
+            "calls_per_s": round(calls / ns * NS),
+            "ns_per_call": round(ns / calls, 1),
+        }
+    for kind in ("tick", "noop"):
+        guarded, wrapped = report[f"{kind}-guarded"], report[f"{kind}-wrapped"]
+        report[f"{kind}-overhead_ns"] = round(wrapped["ns_per_call"] - guarded["ns_per_call"], 1)
+    timer.close()
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000, help="вызовов за раунд (по умолчанию 200000)")
+    parser.add_argument("--rounds", type=int, default=6, help="раундов, берётся лучший (по умолчанию 6)")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    report = run(args.calls, args.rounds)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    for name, value in report.items():
+        if isinstance(value, dict):
+            print(f"{name:16} {value['calls_per_s']:>12,} calls/s {value['ns_per_call']:>10} ns/call")
+        else:
+            print(f"{name:16} {value:>+12} ns/call")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
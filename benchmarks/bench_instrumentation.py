@@ -0,0 +1,88 @@
+# benchmarks/bench_instrumentation.py
+"""
+Цена мест замера (instrumentation) на отрисовке: кадр TaskbarTimer
+(paintEvent через render в QImage) со сбором выключенным, включённым и
+в окне без места замера вовсе (paintEvent = _paint).
+
+    bare     — без места замера;
+    disabled — instrumentation.enabled = False (как по умолчанию);
+    enabled  — сбор включён: два perf_counter_ns и запись в гистограмму.
+
+Окна разные, но одного класса и размера; разница между ними в пределах
+пары процентов — шум раскладки памяти, а не флаг. Отчёт: нс на кадр и
+доля сверх bare (лучшая пачка из --rounds; случаи чередуются, порядок
+от раунда к раунду меняется на обратный).
+
+    python benchmarks/bench_instrumentation.py [--frames 200] [--rounds 30] [--out instr.json]
+"""
+import sys
+import json
+import time
+import argparse
+
+import headless
+
+
+def run(frames: int, rounds: int) -> dict:
+    app = headless.make_app()
+    from PyQt5 import QtGui
+    from timer import TaskbarTimer
+    import instrumentation
+
+    class Bare(TaskbarTimer):
+        """Окно без места замера в paintEvent."""
+        paintEvent = TaskbarTimer._paint
+
+    timer, bare = TaskbarTimer(), Bare()
+    for window in (timer, bare):
+        window.show()
+    app.processEvents()
+    image = QtGui.QImage(timer.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+
+    def case(window, enabled: bool):
+        def frames_ns() -> int:
+            instrumentation.set_enabled(enabled)
+            t0 = time.perf_counter_ns()
+            for _ in range(frames):
+                window.render(image)
+            return time.perf_counter_ns() - t0
+        return frames_ns
+
+    cases = {"bare": case(bare, False), "disabled": case(timer, False), "enabled": case(timer, True)}
+    best  = {}
+    order = list(cases.items())
+    for _ in range(rounds):
+        for name, frames_ns in order:
+            ns = frames_ns()
+            best[name] = min(best.get(name, ns), ns)
+        order.reverse()
+    instrumentation.set_enabled(False)
+    instrumentation.reset()
+    for window in (timer, bare):
+        window.close()
+
+    report = {name: {"ns_per_frame": round(ns / frames)} for name, ns in best.items()}
+    for name in ("disabled", "enabled"):
+        report[name]["overhead_pct"] = round((best[name] / best["bare"] - 1) * 100, 2)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200, help="кадров в пачке (по умолчанию 200)")
+    parser.add_argument("--rounds", type=int, default=30, help="раундов, берётся лучший (по умолчанию 30)")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    report = run(args.frames, args.rounds)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    for name, r in report.items():
+        extra = f" {r['overhead_pct']:>+8} %" if "overhead_pct" in r else ""
+        print(f"{name:10} {r['ns_per_frame']:>10} ns/frame{extra}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# benchmarks/bench_logging.py
+"""
+Время вызывающего (GUI-) потока на один вызов логгера — без Qt: сколько
+стоит logger.debug/info/warning до и после переноса записи в фоновый поток.
+
+    before — прежний setup_logging: FileHandler (от DEBUG) и консоль
+             (от WARNING) пишут прямо в вызывающем потоке;
+    after  — logging_config.setup_logging: вызов только кладёт запись
+             в очередь, файл (с ротацией и кольцевым буфером DEBUG)
+             и консоль пишет QueueListener.
+
+Каждый из --calls вызовов замеряется отдельно: медиана, p99 и максимум
+в мкс и суммарное время потока на тысячу вызовов. --disk-delay-ms
+добавляет задержку к каждому flush файла — так выглядит медленный диск
+(антивирус, сетевая папка): в before её платит вызывающий поток.
+Консоль при замере направлена в os.devnull.
+
+    python benchmarks/bench_logging.py [--calls 20000] [--disk-delay-ms 0] [--out logging.json]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging_config   # noqa: E402
+
+LEVELS = ("debug", "info", "warning")
+FMT     = "%(asctime)s %(levelname)-8s [%(name)s] %(message)s"
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+def setup_before(log_path: str) -> logging.Handler:
+    """Прежняя настройка логирования; возвращает файловый хэндлер."""
+    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(FMT, DATEFMT))
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.WARNING)
+    console_handler.setFormatter(logging.Formatter(FMT, DATEFMT))
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    root.addHandler(file_handler)
+    root.addHandler(console_handler)
+    return file_handler
+
+
+def setup_after(log_path: str) -> logging.Handler:
+    logging_config.setup_logging(log_path)
+    return logging_config._listener.handlers[0].target
+
+
+def teardown() -> None:
+    logging_config.stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def _slow_flush(handler: logging.Handler, delay_s: float) -> None:
+    flush = handler.flush
+
+    def slow():
+        time.sleep(delay_s)
+        flush()
+    handler.flush = slow
+
+
+def bench(mode: str, level: str, calls: int, delay_ms: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = (setup_before if mode == "before" else setup_after)(os.path.join(tmp, "xtimer.log"))
+        if delay_ms:
+            _slow_flush(handler, delay_ms / 1000)
+        log = getattr(logging.getLogger("bench"), level)
+        times = []
+        for i in range(calls):
+            t0 = time.perf_counter_ns()
+            log("кадр %d: осталось %d мс", i, calls - i)
+            times.append(time.perf_counter_ns() - t0)
+        drain0 = time.perf_counter_ns()
+        teardown()                              # after: дописать очередь
+        drain_ms = (time.perf_counter_ns() - drain0) / 1e6
+    times.sort()
+    return {
+        "median_us":     round(statistics.median(times) / 1000, 2),
+        "p99_us":        round(times[int(len(times) * 0.99)] / 1000, 2),
+        "max_us":        round(times[-1] / 1000, 1),
+        "ms_per_1000":   round(sum(times) / len(times) / 1000, 2),
+        "drain_ms":      round(drain_ms, 1),
+    }
+
+
+def run(calls: int, delay_ms: float) -> dict:
+    stderr, sys.stderr = sys.stderr, open(os.devnull, "w", encoding="utf-8")
+    try:
+        return {level: {mode: bench(mode, level, calls, delay_ms) for mode in ("before", "after")}
+                for level in LEVELS}
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000, help="вызовов на случай (по умолчанию 20000)")
+    parser.add_argument("--disk-delay-ms", type=float, default=0.0, help="задержка каждого flush файла, мс")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+    calls = args.calls if not args.disk_delay_ms else min(args.calls, 2_000)
+
+    report = run(calls, args.disk_delay_ms)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    cols = ("median_us", "p99_us", "max_us", "ms_per_1000", "drain_ms")
+    print(f"{'case':18}" + "".join(f"{c:>13}" for c in cols))
+    for level, modes in report.items():
+        for mode, r in modes.items():
+            print(f"{level + ' ' + mode:18}" + "".join(f"{r[c]:>13}" for c in cols))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# benchmarks/bench_render.py
+"""
+Бенчмарк отрисовки TaskbarTimer без экрана (offscreen, заглушка winapi).
+
+Для каждой комбинации ориентации, темы, направления отсчёта, мигания
+и размера шрифта окно рисуется целиком (paintEvent через render) в QImage,
+на каждом кадре — новая надпись, как при ходе отсчёта. Отчёт по случаю:
+
+    fps                                   — по суммарному времени прохода;
+    ms_per_frame, p95_ms_per_frame        — медиана и 95-й перцентиль кадра;
+    alloc_kib_per_frame                   — пик Python-кучи внутри кадра
+                                            (tracemalloc, отдельный проход);
+    alloc_blocks_per_frame                — прирост живых блоков за кадр
+                                            (≈0 — кадр ничего не копит).
+
+Все случаи проходятся --rounds раз по кругу, для времени берётся лучший
+круг: медленные периоды машины (соседи, планировщик) попадают в разные
+случаи и отсеиваются, а не записываются в регрессии.
+
+    python benchmarks/bench_render.py [--frames N] [--rounds R] [--out result.json]
+    python benchmarks/bench_render.py --compare base.json new.json [--threshold 10]
+
+Сравнение отмечает случаи, где ms_per_frame или alloc_kib_per_frame выросли
+больше чем на threshold %, и завершается с кодом 1, если такие есть.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+import itertools
+import tracemalloc
+
+import headless
+
+ORIENTATIONS = ("horizontal", "vertical")
+THEMES       = ("dark", "light")
+DIRECTIONS   = ("up", "down")
+BLINK        = (False, True)
+FONT_SIZES   = tuple(range(6, 23))         # допустимый диапазон font_size в SettingsStore
+
+COMPARED = ("ms_per_frame", "alloc_kib_per_frame")
+
+
+def case_key(orientation, theme, direction, blink, font_size) -> str:
+    return f"{orientation}/{theme}/{direction}/{'blink' if blink else 'steady'}/{font_size}pt"
+
+
+def _setup(timer, orientation, theme, direction, blink, font_size) -> None:
+    from settings_store import SettingsStore
+    SettingsStore.instance().update(
+        theme=theme, count_direction=direction, blink_enabled=blink, font_size=font_size,
+    )
+    if orientation == "vertical":
+        timer._snap("left", True)
+    else:
+        timer._snap("bottom", False)
+
+    core = timer.core
+    core.set(3600)
+    if blink:
+        # финиш прошёл, рамка пульсирует
+        core.elapsed_ns, core.running = core.duration_ns, False
+        timer.blink_start_ns = core.now()
+    else:
+        core.elapsed_ns, core.running = core.duration_ns // 3, False
+        timer.blink_start_ns = None
+
+
+def _frames(timer, image, frames: int):
+    """Генератор кадров: сдвигает отсчёт на секунду и рисует окно."""
+    core = timer.core
+    step = 1_000_000_000
+    for _ in range(frames):
+        if timer.blink_start_ns is None:
+            core.elapsed_ns = (core.elapsed_ns + step) % core.duration_ns
+        timer.render(image)
+        yield
+
+
+def bench_case(timer, frames: int, allocations: bool = True) -> dict:
+    from PyQt5 import QtGui
+    image = QtGui.QImage(timer.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+    for _ in _frames(timer, image, 10):         # прогрев: атлас глифов, кэши Qt
+        pass
+
+    gc.collect()
+    gc.disable()
+    times = []
+    t_prev = time.perf_counter_ns()
+    for _ in _frames(timer, image, frames):
+        t = time.perf_counter_ns()
+        times.append(t - t_prev)
+        t_prev = t
+    gc.enable()
+    total = sum(times)
+    times.sort()
+    result = {
+        "size":             [timer.width(), timer.height()],
+        "frames":           frames,
+        "fps":              round(frames / (total / 1e9), 1),
+        "ms_per_frame":     round(times[len(times) // 2] / 1e6, 4),
+        "p95_ms_per_frame": round(times[int(len(times) * 0.95)] / 1e6, 4),
+    }
+    if not allocations:
+        return result
+
+    tracemalloc.start()
+    gc.collect()
+    blocks0 = sys.getallocatedblocks()
+    peak = 0
+    for _ in range(frames):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        next(_frames(timer, image, 1))
+        peak += tracemalloc.get_traced_memory()[1] - before
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks0
+    tracemalloc.stop()
+
+    result["alloc_kib_per_frame"]    = round(peak / frames / 1024, 2)
+    result["alloc_blocks_per_frame"] = round(blocks / frames, 2)
+    return result
+
+
+def run(frames: int, rounds: int) -> dict:
+    app = headless.make_app()
+    from PyQt5 import QtCore
+    from timer import TaskbarTimer
+
+    timer = TaskbarTimer()
+    headless.spin(50)
+
+    cases = {}
+    combos = list(itertools.product(ORIENTATIONS, THEMES, DIRECTIONS, BLINK, FONT_SIZES))
+    for r in range(1, rounds + 1):
+        for i, combo in enumerate(combos, 1):
+            _setup(timer, *combo)
+            app.processEvents()
+            key = case_key(*combo)
+            res = bench_case(timer, frames, allocations=(r == 1))
+            best = cases.setdefault(key, res)
+            if res["ms_per_frame"] < best["ms_per_frame"]:
+                best.update(ms_per_frame=res["ms_per_frame"], p95_ms_per_frame=res["p95_ms_per_frame"])
+            best["fps"] = max(best["fps"], res["fps"])
+            print(f"[{r}/{rounds} {i}/{len(combos)}] {key:36} {res['fps']:9.1f} fps "
+                  f"{res['ms_per_frame']:8.3f} ms", file=sys.stderr)
+    timer.close()
+
+    return {
+        "meta": {
+            "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python":   platform.python_version(),
+            "qt":       QtCore.QT_VERSION_STR,
+            "pyqt":     QtCore.PYQT_VERSION_STR,
+            "platform": f"{platform.system()} {platform.machine()} / {os.environ['QT_QPA_PLATFORM']}",
+            "frames":   frames,
+            "rounds":   rounds,
+        },
+        "cases": cases,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float) -> list:
+    """Строки отчёта о регрессиях: (случай, метрика, было, стало, %)."""
+    regressions = []
+    for key, old in base["cases"].items():
+        cur = new["cases"].get(key)
+        if cur is None:
+            continue
+        for metric in COMPARED:
+            a, b = old.get(metric), cur.get(metric)
+            if not a or b is None:
+                continue
+            pct = (b - a) / a * 100
+            if pct > threshold:
+                regressions.append((key, metric, a, b, pct))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200, help="кадров на случай (по умолчанию 200)")
+    parser.add_argument("--rounds", type=int, default=3, help="кругов по всем случаям (по умолчанию 3)")
+    parser.add_argument("--out", help="куда записать JSON (по умолчанию stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="сравнить два результата")
+    parser.add_argument("--threshold", type=float, default=10.0, help="допустимый рост, %% (по умолчанию 10)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold)
+        for key, metric, a, b, pct in regressions:
+            print(f"REGRESSION {key:36} {metric:22} {a:10.4f} → {b:10.4f} (+{pct:.1f}%)")
+        shared = len(base["cases"].keys() & new["cases"].keys())
+        print(f"{len(regressions)} регрессий больше {args.threshold:g}% в {shared} общих случаях")
+        return 1 if regressions else 0
+
+    result = json.dumps(run(args.frames, args.rounds), ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(result + "\n")
+    else:
+        print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# benchmarks/bench_repaint.py
+"""
+Сколько пикселей окно таймера перерисовывает в секунду (offscreen, на
+виртуальных часах clock.VirtualClock — --seconds проходятся мгновенно).
+
+Окно проходит кадр за кадром, как под циклом событий: часы переводятся
+на ближайший дедлайн FrameClock, затем обрабатываются события — в том
+числе QEvent.Paint; площадь его region() и есть перерисованные пиксели.
+Состояния:
+
+    short     — идёт минутный отсчёт (прогресс-бар движется быстро);
+    long      — идёт часовой отсчёт;
+    blinking  — отсчёт закончился, рамка мигает.
+
+Для сравнения — сколько было бы при перерисовке всего окна:
+    full_px_per_s    — всё окно на каждом пробуждении;
+    legacy_px_per_s  — всё окно каждые 33 мс (старый _ui_timer).
+
+    python benchmarks/bench_repaint.py [--seconds 60] [--out repaint.json]
+"""
+import sys
+import json
+import argparse
+
+import headless
+from clock import VirtualClock, set_clock
+
+NS = 1_000_000_000
+STATES = ("short", "long", "blinking")
+LEGACY_FPS = 1000 / 33
+
+
+def _make_counter():
+    from PyQt5 import QtCore
+
+    class PaintCounter(QtCore.QObject):
+        """Фильтр событий окна: число Paint и сумма площадей их регионов."""
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.paints = 0
+            self.pixels = 0
+
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Paint:
+                self.paints += 1
+                self.pixels += sum(r.width() * r.height() for r in event.region().rects())
+            return False
+
+    return PaintCounter
+
+
+def enter_state(timer, state: str) -> None:
+    from settings_store import SettingsStore
+    SettingsStore.instance().update(blink_enabled=(state == "blinking"))
+    timer._reset_timer()
+    timer._set_duration({"short": 60, "long": 3600, "blinking": 1}[state])
+    timer._toggle_start_pause()
+
+
+def run_state(app, clock, timer, counter, state: str, seconds: float) -> dict:
+    enter_state(timer, state)
+    if state == "blinking":
+        clock.advance(2 * NS)                # дойти до финиша
+    app.processEvents()
+
+    counter.paints = counter.pixels = 0
+    fired0 = clock.fired
+    end = clock() + int(seconds * NS)
+    while True:
+        deadline = clock.next_deadline()
+        if deadline is None or deadline > end:
+            break
+        clock.advance_to(deadline)
+        app.processEvents()
+    clock.advance_to(end)
+
+    area = timer.width() * timer.height()
+    wakeups = clock.fired - fired0
+    return {
+        "size":            [timer.width(), timer.height()],
+        "wakeups_per_s":   round(wakeups / seconds, 2),
+        "paints_per_s":    round(counter.paints / seconds, 2),
+        "px_per_s":        round(counter.pixels / seconds),
+        "full_px_per_s":   round(area * wakeups / seconds),
+        "legacy_px_per_s": round(area * LEGACY_FPS),
+    }
+
+
+def run(seconds: float, states) -> dict:
+    clock = VirtualClock(start_ns=1_000 * NS)
+    set_clock(clock)                         # до FrameClock и окна
+    app = headless.make_app()
+    from timer import TaskbarTimer
+
+    timer = TaskbarTimer()
+    timer.show()
+    app.processEvents()
+    counter = _make_counter()(app)
+    timer.installEventFilter(counter)
+
+    report = {state: run_state(app, clock, timer, counter, state, seconds) for state in states}
+    timer.removeEventFilter(counter)
+    timer.close()
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60, help="виртуальных секунд на состояние (по умолчанию 60)")
+    parser.add_argument("--states", default=",".join(STATES), help="состояния через запятую")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    states = [s for s in args.states.split(",") if s]
+    unknown = set(states) - set(STATES)
+    if unknown:
+        parser.error(f"неизвестные состояния: {', '.join(sorted(unknown))}")
+
+    report = run(args.seconds, states)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    cols = ("wakeups_per_s", "paints_per_s", "px_per_s", "full_px_per_s", "legacy_px_per_s")
+    print(f"{'state':10}" + "".join(f"{c:>17}" for c in cols))
+    for state, r in report.items():
+        print(f"{state:10}" + "".join(f"{r[c]:>17}" for c in cols))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# benchmarks/bench_settings.py
+"""
+Время открытия окна настроек без экрана (offscreen, заглушка winapi):
+от клика по пункту «Настройки» в меню трея до первого кадра окна.
+
+Кадр считается готовым, когда окно (или его дочерний виджет) получило
+первый QEvent.Paint и цикл событий закончил эту отрисовку — следующее
+событие из очереди. Замеры:
+
+    open_cold_ms  — первое открытие в процессе (окно ещё не создано);
+    open_warm_ms  — повторные открытия (медиана из --warm);
+    tabs_cold_ms  — первый переход на каждую вкладку;
+    tabs_warm_ms  — переход на вкладку, которую уже показывали.
+
+Холодное открытие бывает раз на процесс, поэтому каждый из --runs прогонов
+идёт в отдельном процессе; в отчёт — медианы по прогонам.
+
+    python benchmarks/bench_settings.py [--runs 5] [--warm 20] [--out settings.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+TIMEOUT_MS = 5000
+
+
+def _make_watch():
+    from PyQt5 import QtCore, QtWidgets
+    from dialogs import SettingsDialog
+
+    class PaintWatch(QtCore.QObject):
+        """Фильтр событий приложения: ждёт первый кадр окна настроек."""
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self._loop    = None
+            self._painted = False
+            self._done_at = None
+
+        def eventFilter(self, obj, event):
+            if (event.type() == QtCore.QEvent.Paint and not self._painted
+                    and isinstance(obj, QtWidgets.QWidget)
+                    and isinstance(obj.window(), SettingsDialog)):
+                self._painted = True
+                # сработает после всей текущей отрисовки окна
+                QtCore.QTimer.singleShot(0, self._done)
+            return False
+
+        def _done(self):
+            self._done_at = time.perf_counter()
+            self._loop.quit()
+
+        def measure(self, action) -> float:
+            """Вызывает action() и ждёт кадр; → мс от вызова до конца кадра."""
+            self._loop    = QtCore.QEventLoop()
+            self._painted = False
+            self._done_at = None
+            QtCore.QTimer.singleShot(TIMEOUT_MS, self._loop.quit)
+            t0 = time.perf_counter()
+            action()
+            self._loop.exec_()
+            if self._done_at is None:
+                raise RuntimeError(f"окно настроек не отрисовалось за {TIMEOUT_MS} мс")
+            return (self._done_at - t0) * 1000
+
+    return PaintWatch
+
+
+def child(warm: int) -> dict:
+    """Один прогон в свежем процессе."""
+    import headless
+    app = headless.make_app()
+    from timer import TaskbarTimer
+
+    timer = TaskbarTimer()
+    headless.spin(300)                       # меню и окно таймера дорисованы
+    settings_action = next(a for a in timer.tray.contextMenu().actions() if a.text() == "Настройки")
+
+    watch = _make_watch()(app)
+    app.installEventFilter(watch)
+
+    result = {"open_cold_ms": watch.measure(settings_action.trigger)}
+    dialog = timer.settings_dialog
+    tabs = dialog.tabs
+    names = [tabs.tabText(i) for i in range(tabs.count())]
+    result["tabs_cold_ms"] = {
+        names[i]: watch.measure(lambda i=i: tabs.setCurrentIndex(i)) for i in range(1, tabs.count())
+    }
+    result["tabs_warm_ms"] = {}
+    for i in range(tabs.count()):
+        j = (i + 1) % tabs.count()
+        result["tabs_warm_ms"][names[j]] = watch.measure(lambda j=j: tabs.setCurrentIndex(j))
+
+    opens = []
+    for _ in range(warm):
+        dialog.close()
+        tabs.setCurrentIndex(0)
+        app.processEvents()
+        opens.append(watch.measure(settings_action.trigger))
+    result["open_warm_ms"] = statistics.median(opens)
+
+    app.removeEventFilter(watch)
+    dialog.close()
+    timer.close()
+    return result
+
+
+def run(runs: int, warm: int) -> dict:
+    samples = []
+    for r in range(1, runs + 1):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "--warm", str(warm)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+        print(f"[{r}/{runs}] cold {samples[-1]['open_cold_ms']:7.1f} ms  "
+              f"warm {samples[-1]['open_warm_ms']:6.1f} ms", file=sys.stderr)
+
+    def med(key):
+        return round(statistics.median(s[key] for s in samples), 2)
+
+    def med_tabs(key):
+        return {name: round(statistics.median(s[key][name] for s in samples), 2) for name in samples[0][key]}
+
+    from PyQt5 import QtCore
+    return {
+        "meta": {
+            "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python":   platform.python_version(),
+            "qt":       QtCore.QT_VERSION_STR,
+            "platform": f"{platform.system()} {platform.machine()} / {os.environ.get('QT_QPA_PLATFORM', 'offscreen')}",
+            "runs":     runs,
+            "warm":     warm,
+        },
+        "open_cold_ms": med("open_cold_ms"),
+        "open_warm_ms": med("open_warm_ms"),
+        "tabs_cold_ms": med_tabs("tabs_cold_ms"),
+        "tabs_warm_ms": med_tabs("tabs_warm_ms"),
+        "samples":      samples,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="прогонов в отдельных процессах (по умолчанию 5)")
+    parser.add_argument("--warm", type=int, default=20, help="повторных открытий на прогон (по умолчанию 20)")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(child(args.warm), ensure_ascii=False))
+        return 0
+
+    report = run(args.runs, args.warm)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"{'open_cold_ms':14} {report['open_cold_ms']}")
+    print(f"{'open_warm_ms':14} {report['open_warm_ms']}")
+    for key in ("tabs_cold_ms", "tabs_warm_ms"):
+        print(f"{key:14} " + "  ".join(f"{k} {v}" for k, v in report[key].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
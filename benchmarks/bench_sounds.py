@@ -0,0 +1,208 @@
+# benchmarks/bench_sounds.py
+"""
+Декодирование звуков окончания (sound_cache): время декодирования и
+попадания в кэш PCM. Нужен рабочий QtMultimedia с декодерами форматов
+(в Windows — Media Foundation, в Linux — GStreamer с плагинами).
+
+Декодер работает так же, как в AlarmPlayer: DecodeWorker в своём QThread,
+запрос — сигналом из GUI-потока. Пока файл декодируется, GUI-поток
+крутит QTimer на 1 мс — наибольший промежуток между его срабатываниями
+показывает, не блокируется ли GUI-поток (gui_max_gap_ms).
+
+    decode    — каждый файл декодируется --rounds раз с пустым кэшем:
+                медианы времени декодирования (в потоке) и от запроса до
+                готового WAV (wall), объём PCM и длительность звука;
+    switches  — --switches раз выбирается случайный другой файл (как при
+                смене звука в настройках) через PcmCache на --cache-mb МБ:
+                попадания, промахи, hit rate, время поиска при попадании.
+
+    python benchmarks/bench_sounds.py [файлы ...] [--rounds 5] [--switches 200]
+                                      [--cache-mb 32] [--seed 1] [--out sounds.json]
+
+Без файлов берётся sounds/xtimer.wav (декодер читает и WAV); для сжатых
+форматов передайте свои MP3/OGG/FLAC.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+import headless
+
+TIMEOUT_MS = 30_000
+
+
+def _make_decoder():
+    from PyQt5 import QtCore
+    from sound_cache import DecodeWorker
+
+    class Requester(QtCore.QObject):
+        request = QtCore.pyqtSignal(str, "qint64")
+
+    thread    = QtCore.QThread()
+    worker    = DecodeWorker()
+    requester = Requester()
+    worker.moveToThread(thread)
+    requester.request.connect(worker.decode)
+    thread.start()
+    return thread, worker, requester
+
+
+def decode(worker, requester, path: str, mtime: int) -> dict:
+    """Один запрос декодирования; ждёт ответа, замеряя паузы GUI-потока."""
+    from PyQt5 import QtCore
+    loop   = QtCore.QEventLoop()
+    result = {"sound": None, "error": None, "max_gap_ns": 0}
+    last   = [time.perf_counter_ns()]
+
+    def on_decoded(sound):
+        result["sound"] = sound
+        loop.quit()
+
+    def on_failed(_path, _mtime, reason):
+        result["error"] = reason
+        loop.quit()
+
+    def on_pulse():
+        now = time.perf_counter_ns()
+        result["max_gap_ns"] = max(result["max_gap_ns"], now - last[0])
+        last[0] = now
+
+    pulse = QtCore.QTimer(interval=1, timeout=on_pulse)
+    pulse.setTimerType(QtCore.Qt.PreciseTimer)
+    worker.decoded.connect(on_decoded)
+    worker.failed.connect(on_failed)
+    QtCore.QTimer.singleShot(TIMEOUT_MS, loop.quit)
+
+    t0 = time.perf_counter_ns()
+    pulse.start()
+    requester.request.emit(path, mtime)
+    loop.exec_()
+    result["wall_ns"] = time.perf_counter_ns() - t0
+    pulse.stop()
+    worker.decoded.disconnect(on_decoded)
+    worker.failed.disconnect(on_failed)
+    if result["sound"] is None and result["error"] is None:
+        result["error"] = f"нет ответа за {TIMEOUT_MS} мс"
+    return result
+
+
+def _remove(sound) -> None:
+    try:
+        os.remove(sound.wav_path)
+    except OSError:
+        pass
+
+
+def bench_decode(worker, requester, path: str, rounds: int) -> dict:
+    mtime = os.stat(path).st_mtime_ns
+    decode_ms, wall_ms, gaps, sound = [], [], [], None
+    for r in range(rounds):
+        res = decode(worker, requester, path, mtime + r)    # свой ключ — свой WAV
+        if res["error"]:
+            return {"error": res["error"]}
+        sound = res["sound"]
+        decode_ms.append(sound.decode_ns / 1e6)
+        wall_ms.append(res["wall_ns"] / 1e6)
+        gaps.append(res["max_gap_ns"] / 1e6)
+        _remove(sound)
+    frame_bytes = 2 * sound.channels
+    return {
+        "decode_ms":      round(statistics.median(decode_ms), 2),
+        "wall_ms":        round(statistics.median(wall_ms), 2),
+        "gui_max_gap_ms": round(max(gaps), 2),
+        "pcm_mb":         round(sound.pcm_bytes / 2**20, 2),
+        "audio_s":        round(sound.pcm_bytes / frame_bytes / sound.sample_rate, 2),
+    }
+
+
+def bench_switches(worker, requester, paths, switches: int, cache_mb: float, seed: int) -> dict:
+    from sound_cache import PcmCache
+    cache   = PcmCache(max_bytes=int(cache_mb * 2**20))
+    mtimes  = {p: os.stat(p).st_mtime_ns for p in paths}
+    rnd     = random.Random(seed)
+    current = None
+    hit_us, decode_ms = [], []
+    for _ in range(switches):
+        path = rnd.choice([p for p in paths if p != current] or paths)
+        current = path
+        t0 = time.perf_counter_ns()
+        cached = cache.get(path, mtimes[path])
+        if cached is not None:
+            hit_us.append((time.perf_counter_ns() - t0) / 1000)
+            continue
+        res = decode(worker, requester, path, mtimes[path])
+        if res["error"]:
+            return {"error": f"{path}: {res['error']}"}
+        decode_ms.append(res["sound"].decode_ns / 1e6)
+        cache.put(res["sound"])
+    for sound in list(cache._items.values()):
+        _remove(sound)
+    return {
+        "files":        len(paths),
+        "switches":     switches,
+        "cache_mb":     cache_mb,
+        "hits":         cache.hits,
+        "misses":       cache.misses,
+        "hit_rate":     round(cache.hit_rate, 3),
+        "hit_lookup_us": round(statistics.median(hit_us), 2) if hit_us else None,
+        "decode_ms_total": round(sum(decode_ms), 1),
+        "cache_used_mb": round(cache.size_bytes / 2**20, 2),
+    }
+
+
+def run(paths, rounds: int, switches: int, cache_mb: float, seed: int) -> dict:
+    app = headless.make_app()                # noqa: F841 — живёт до конца прогона
+    thread, worker, requester = _make_decoder()
+    try:
+        report = {"decode": {p: bench_decode(worker, requester, p, rounds) for p in paths}}
+        ok = [p for p, r in report["decode"].items() if "error" not in r]
+        report["switches"] = (bench_switches(worker, requester, ok, switches, cache_mb, seed)
+                              if ok else {"error": "ни один файл не декодировался"})
+    finally:
+        thread.quit()
+        thread.wait()
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="звуковые файлы (по умолчанию sounds/xtimer.wav)")
+    parser.add_argument("--rounds", type=int, default=5, help="декодирований на файл (по умолчанию 5)")
+    parser.add_argument("--switches", type=int, default=200, help="смен звука (по умолчанию 200)")
+    parser.add_argument("--cache-mb", type=float, default=32, help="объём кэша PCM, МБ (по умолчанию 32, как в AlarmPlayer)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    try:
+        import sound_cache   # noqa: F401
+    except ImportError as exc:
+        print(f"QtMultimedia недоступен: {exc}", file=sys.stderr)
+        return 2
+
+    paths = [os.path.abspath(p) for p in args.files] or [os.path.join(headless.ROOT, "sounds", "xtimer.wav")]
+    report = run(paths, args.rounds, args.switches, args.cache_mb, args.seed)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    cols = ("decode_ms", "wall_ms", "gui_max_gap_ms", "pcm_mb", "audio_s")
+    print(f"{'file':30}" + "".join(f"{c:>16}" for c in cols))
+    for path, r in report["decode"].items():
+        name = os.path.basename(path)
+        if "error" in r:
+            print(f"{name:30} ошибка: {r['error']}")
+        else:
+            print(f"{name:30}" + "".join(f"{r[c]:>16}" for c in cols))
+    print()
+    for key, value in report["switches"].items():
+        print(f"{key:16} {value}")
+    return 1 if any("error" in r for r in report["decode"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# benchmarks/bench_store.py
+"""
+Сколько раз приложение обращается к бэкенду настроек (QSettings — реестр
+в Windows) при запуске, открытии окна настроек, правом клике и каждом
+Apply (offscreen, заглушка winapi, QSettings во временной папке).
+
+Счёт ведётся не по счётчикам SettingsStore, а по самому QSettings: класс
+подменяется наследником, который считает созданные объекты, value(),
+setValue() и sync() — так видны и обращения в обход хранилища.
+
+Apply-сценарии: в окне настроек (все вкладки построены) меняется одно
+поле и нажимается Apply; затем выжидается отложенный flush хранилища.
+
+    unchanged      — Apply без изменений;
+    blink_freq     — частота мигания;
+    theme          — тема;
+    always_on_top  — «Всегда поверх окон»;
+    presets        — минуты первого пресета.
+
+    python benchmarks/bench_store.py [--out store.json]
+"""
+import sys
+import json
+import argparse
+
+import headless
+from PyQt5 import QtCore
+
+COUNTERS = ("created", "reads", "writes", "syncs")
+
+
+class CountingSettings(QtCore.QSettings):
+    """QSettings, считающий обращения (общие счётчики на класс)."""
+    counts = dict.fromkeys(COUNTERS, 0)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingSettings.counts["created"] += 1
+
+    def value(self, *args, **kwargs):
+        CountingSettings.counts["reads"] += 1
+        return super().value(*args, **kwargs)
+
+    def setValue(self, *args, **kwargs):
+        CountingSettings.counts["writes"] += 1
+        return super().setValue(*args, **kwargs)
+
+    def sync(self):
+        CountingSettings.counts["syncs"] += 1
+        return super().sync()
+
+
+def _measure(action) -> dict:
+    before = dict(CountingSettings.counts)
+    action()
+    return {k: CountingSettings.counts[k] - before[k] for k in COUNTERS}
+
+
+def _settled(action, app):
+    """action(), затем ждём отложенный flush хранилища."""
+    from settings_store import SettingsStore
+
+    def run():
+        action()
+        app.processEvents()
+        headless.spin(SettingsStore.FLUSH_DELAY_MS + 50)
+    return run
+
+
+def _apply_scenarios(dialog):
+    def blink_freq():
+        dialog.spin_blink_freq.setValue(dialog.spin_blink_freq.value() % 5 + 1)
+
+    def theme():
+        dialog.combo_theme.setCurrentIndex(1 - dialog.combo_theme.currentIndex())
+
+    def always_on_top():
+        dialog.chk_always_on_top.setChecked(not dialog.chk_always_on_top.isChecked())
+
+    def presets():
+        item = dialog.table_presets.item(0, 1)
+        item.setText(str(int(item.text()) + 1))
+
+    return {
+        "unchanged":     lambda: None,
+        "blink_freq":    blink_freq,
+        "theme":         theme,
+        "always_on_top": always_on_top,
+        "presets":       presets,
+    }
+
+
+def run() -> dict:
+    QtCore.QSettings = CountingSettings          # до импорта модулей приложения
+    app = headless.make_app()
+    report = {}
+
+    holder = {}
+
+    def startup():
+        from timer import TaskbarTimer
+        holder["timer"] = TaskbarTimer()
+        holder["timer"].show()
+        app.processEvents()                      # меню строится фоном после старта
+    report["startup"] = _measure(_settled(startup, app))
+    timer = holder["timer"]
+
+    report["right_click"] = _measure(_settled(timer._open_menu, app))
+    timer.menu.hide()
+
+    def open_settings():
+        timer._open_settings()
+        app.processEvents()
+    report["open_settings"] = _measure(_settled(open_settings, app))
+    dialog = timer.settings_dialog
+
+    def build_tabs():
+        for i in range(dialog.tabs.count()):
+            dialog.tabs.setCurrentIndex(i)
+        app.processEvents()
+    report["build_tabs"] = _measure(_settled(build_tabs, app))
+
+    for name, change in _apply_scenarios(dialog).items():
+        def apply(change=change):
+            change()
+            dialog._on_apply_clicked()
+        report[f"apply:{name}"] = _measure(_settled(apply, app))
+
+    dialog.hide()
+    timer.close()
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    report = run()
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"{'step':22}" + "".join(f"{c:>9}" for c in COUNTERS))
+    for step, r in report.items():
+        print(f"{step:22}" + "".join(f"{r[c]:>9}" for c in COUNTERS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# benchmarks/bench_widgets.py
+"""
+Общие FrameClock при 1, 10 и 50 окнах таймера (offscreen, на виртуальных
+часах clock.VirtualClock).
+
+Все окна видимы и запущены с разными длительностями (кадры надписи и
+прогресс-бара у них не совпадают), затем --seconds виртуальных секунд
+проходятся кадр за кадром, как под циклом событий: часы переводятся на
+ближайший дедлайн, затем обрабатываются события (в том числе Paint).
+Состояния:
+
+    running   — идёт отсчёт;
+    blinking  — отсчёт закончился, рамки мигают (кадр каждого окна — каждый слот).
+
+Отчёт на каждое число окон:
+    wakeups_per_s   — пробуждений часов процесса (FrameClock + движок таймеров);
+    ticks_per_s     — вызовов _tick всех окон;
+    cpu_ms_per_s    — процессорного времени на секунду виртуальных
+                      (тики + отрисовка), всего и на окно;
+    legacy_wakeups_per_s — у каждого окна свои _ui_timer (33 мс) и
+                      _logic_timer (26 мс), как было до FrameClock.
+
+    python benchmarks/bench_widgets.py [--counts 1,10,50] [--seconds 20] [--out widgets.json]
+"""
+import sys
+import json
+import time
+import argparse
+
+import headless
+from clock import VirtualClock, set_clock
+
+NS = 1_000_000_000
+COUNTS = (1, 10, 50)
+STATES = ("running", "blinking")
+LEGACY_WAKEUPS = 1000 / 33 + 1000 / 26
+
+
+def _count_ticks(timer, counter: list) -> None:
+    tick = timer._tick
+
+    def counted():
+        counter[0] += 1
+        tick()
+    timer._tick = counted
+
+
+def run_count(app, clock, count: int, state: str, seconds: float) -> dict:
+    from settings_store import SettingsStore
+    from timer import TaskbarTimer
+
+    SettingsStore.instance().update(blink_enabled=(state == "blinking"))
+    ticks = [0]
+    timers = []
+    for i in range(count):
+        timer = TaskbarTimer()
+        _count_ticks(timer, ticks)
+        timer.show()
+        timer._set_duration(1 if state == "blinking" else 600 + 7 * i)
+        timer._toggle_start_pause()
+        timers.append(timer)
+    app.processEvents()
+    if state == "blinking":
+        clock.advance(2 * NS)                # все дошли до финиша
+        app.processEvents()
+
+    ticks[0] = 0
+    fired0 = clock.fired
+    end = clock() + int(seconds * NS)
+    t0 = time.process_time_ns()
+    while True:
+        deadline = clock.next_deadline()
+        if deadline is None or deadline > end:
+            break
+        clock.advance_to(deadline)
+        app.processEvents()
+    cpu_ns = time.process_time_ns() - t0
+    clock.advance_to(end)
+
+    for timer in timers:
+        timer.close()
+        timer.deleteLater()
+    app.processEvents()
+
+    cpu_ms = cpu_ns / 1e6 / seconds
+    return {
+        "wakeups_per_s":        round((clock.fired - fired0) / seconds, 2),
+        "ticks_per_s":          round(ticks[0] / seconds, 2),
+        "cpu_ms_per_s":         round(cpu_ms, 2),
+        "cpu_ms_per_s_per_win": round(cpu_ms / count, 3),
+        "legacy_wakeups_per_s": round(LEGACY_WAKEUPS * count, 2),
+    }
+
+
+def run(counts, states, seconds: float) -> dict:
+    clock = VirtualClock(start_ns=1_000 * NS)
+    set_clock(clock)                         # до FrameClock и окон
+    app = headless.make_app()
+    return {state: {str(n): run_count(app, clock, n, state, seconds) for n in counts}
+            for state in states}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default=",".join(map(str, COUNTS)), help="числа окон через запятую")
+    parser.add_argument("--states", default=",".join(STATES), help="состояния через запятую")
+    parser.add_argument("--seconds", type=float, default=20, help="виртуальных секунд на прогон (по умолчанию 20)")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    counts = [int(n) for n in args.counts.split(",") if n]
+    states = [s for s in args.states.split(",") if s]
+    unknown = set(states) - set(STATES)
+    if unknown:
+        parser.error(f"неизвестные состояния: {', '.join(sorted(unknown))}")
+
+    report = run(counts, states, args.seconds)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    cols = ("wakeups_per_s", "ticks_per_s", "cpu_ms_per_s", "cpu_ms_per_s_per_win", "legacy_wakeups_per_s")
+    print(f"{'state':10}{'windows':>8}" + "".join(f"{c:>22}" for c in cols))
+    for state, by_count in report.items():
+        for n, r in by_count.items():
+            print(f"{state:10}{n:>8}" + "".join(f"{r[c]:>22}" for c in cols))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# benchmarks/churn.py
+"""
+Прогон «открыть–закрыть» без экрана: меню быстрого добавления и окно
+настроек открываются и закрываются --cycles раз (по умолчанию 10 000),
+как при долгой работе с приложением.
+
+Раз в --every циклов записываются RSS, число Python-объектов (gc), число
+окон верхнего уровня и число получателей у сигналов, к которым подключаются
+меню и окно настроек (UpdateChecker, SettingsStore, QApplication, меню).
+После разгона (первые --warmup циклов) ничего из этого расти не должно:
+окна переиспользуются, а соединения делаются один раз.
+
+    python benchmarks/churn.py [--cycles 10000] [--out churn.json]
+
+Код выхода 1 — рост RSS больше --rss-kib, объектов больше --objects или
+любое изменение числа получателей / окон.
+"""
+import sys
+import gc
+import json
+import time
+import argparse
+
+import headless
+from soak import rss_kib
+
+
+def _receivers(timer, app) -> dict:
+    """Число подключённых слотов у сигналов, к которым подключаются окна."""
+    from settings_store import SettingsStore
+    store, checker, menu = SettingsStore.instance(), timer._update_checker, timer.menu
+    counts = {
+        "app.applicationStateChanged":    app.receivers(app.applicationStateChanged),
+        "store.changed":                  store.receivers(store.changed),
+        "store.batch_changed":            store.receivers(store.batch_changed),
+        "checker.update_available":       checker.receivers(checker.update_available),
+        "checker.update_downloaded":      checker.receivers(checker.update_downloaded),
+        "checker.update_failed":          checker.receivers(checker.update_failed),
+    }
+    if menu is not None:
+        counts.update({
+            "menu.add_time":     menu.receivers(menu.add_time),
+            "menu.custom_time":  menu.receivers(menu.custom_time),
+            "menu.fade.finished": menu._fade.receivers(menu._fade.finished),
+        })
+    return counts
+
+
+def _finish(animation) -> None:
+    """Доводит анимацию прозрачности до конца, не дожидаясь её 200 мс."""
+    if animation.state() == animation.Running:
+        animation.setCurrentTime(animation.totalDuration())
+
+
+def cycle(timer, app) -> None:
+    timer._open_menu()
+    _finish(timer.menu._fade)
+    app.processEvents()
+    timer._close_menu()
+    _finish(timer.menu._fade)
+    app.processEvents()
+
+    timer._open_settings()
+    app.processEvents()
+    timer.settings_dialog.close()
+    app.processEvents()
+
+
+def sample(i: int, timer, app) -> dict:
+    gc.collect()
+    return {
+        "cycle":     i,
+        "rss_kib":   rss_kib(),
+        "objects":   len(gc.get_objects()),
+        "windows":   len(app.topLevelWidgets()),
+        "receivers": _receivers(timer, app),
+    }
+
+
+def run(cycles: int, every: int, warmup: int) -> dict:
+    app = headless.make_app()
+    from timer import TaskbarTimer
+
+    timer = TaskbarTimer()
+    headless.spin(300)                       # меню строится фоном после старта
+
+    t0 = time.perf_counter()
+    samples = []
+    for i in range(1, cycles + 1):
+        cycle(timer, app)
+        if i == warmup or (i > warmup and (i - warmup) % every == 0) or i == cycles:
+            samples.append(sample(i, timer, app))
+            print(f"{i:6d}  rss {samples[-1]['rss_kib']:7d} KiB  objects {samples[-1]['objects']:7d}",
+                  file=sys.stderr)
+    wall = time.perf_counter() - t0
+    timer.close()
+
+    first, last = samples[0], samples[-1]
+    return {
+        "cycles":          cycles,
+        "warmup":          warmup,
+        "ms_per_cycle":    round(wall / cycles * 1000, 3),
+        "rss_growth_kib":  last["rss_kib"] - first["rss_kib"],
+        # минус записи самих замеров: по одному отслеживаемому gc словарю на замер
+        "objects_growth":  last["objects"] - first["objects"] - (len(samples) - 1),
+        "windows":         [first["windows"], last["windows"]],
+        "receivers_changed": {
+            k: [first["receivers"][k], v] for k, v in last["receivers"].items()
+            if first["receivers"].get(k) != v
+        },
+        "samples":         samples,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=10_000, help="циклов открыть–закрыть (по умолчанию 10000)")
+    parser.add_argument("--every", type=int, default=500, help="замер раз в столько циклов (по умолчанию 500)")
+    parser.add_argument("--warmup", type=int, default=100, help="циклов разгона до первого замера (по умолчанию 100)")
+    parser.add_argument("--rss-kib", type=int, default=2048, help="допустимый рост RSS, КиБ (по умолчанию 2048)")
+    parser.add_argument("--objects", type=int, default=100, help="допустимый рост числа объектов (по умолчанию 100)")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    report = run(args.cycles, args.every, min(args.warmup, args.cycles))
+    failed = []
+    if report["rss_growth_kib"] > args.rss_kib:
+        failed.append("rss")
+    if report["objects_growth"] > args.objects:
+        failed.append("objects")
+    if report["windows"][0] != report["windows"][1]:
+        failed.append("windows")
+    if report["receivers_changed"]:
+        failed.append("receivers")
+    report["failed"] = failed
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    for key in ("cycles", "ms_per_cycle", "rss_growth_kib", "objects_growth", "windows", "receivers_changed"):
+        print(f"{key:18} {report[key]}")
+    print("FAIL " + ",".join(failed) if failed else "PASS")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# benchmarks/headless.py
+"""
+Запуск XTimer без Windows и без экрана — для бенчмарков и прогонов.
+
+Импортировать раньше PyQt5 и модулей приложения:
+  • QT_QPA_PLATFORM=offscreen (если платформа не задана явно);
+  • вместо winapi (ctypes.windll есть только в Windows) — заглушка:
+    экран 1920×1080, панель задач снизу высотой 40 px;
+  • QSettings пишутся во временную папку — настройки пользователя
+    не читаются и не портятся;
+  • предупреждения offscreen «This plugin does not support …» не выводятся.
+"""
+import os
+import sys
+import types
+import ctypes
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SCREEN_W, SCREEN_H = 1920, 1080
+TASKBAR_H          = 40
+
+
+def _winapi_stub() -> types.ModuleType:
+    m = types.ModuleType("winapi")
+
+    class RECT(ctypes.Structure):
+        _fields_ = [("left", ctypes.c_long), ("top", ctypes.c_long),
+                    ("right", ctypes.c_long), ("bottom", ctypes.c_long)]
+
+    m.RECT = RECT
+    m.HWND_TOPMOST, m.HWND_NOTOPMOST = -1, -2
+    m.SWP_NOMOVE, m.SWP_NOSIZE, m.SWP_NOACTIVATE = 0x0002, 0x0001, 0x0010
+    m.SM_CXSCREEN, m.SM_CYSCREEN = 0, 1
+    m.SetWindowPos = lambda *args: 1
+    m.GetSM = m.GetSystemMetrics = lambda i: SCREEN_W if i == m.SM_CXSCREEN else SCREEN_H
+    m.GetFG = lambda: 0
+    m.GetRect = lambda hwnd, rect: 1
+    # edge 3 — панель задач снизу
+    m.taskbar_rect_edge = lambda: (RECT(0, SCREEN_H - TASKBAR_H, SCREEN_W, SCREEN_H), 3)
+    return m
+
+
+sys.modules["winapi"] = _winapi_stub()
+
+from PyQt5 import QtCore, QtWidgets   # noqa: E402 — после выбора платформы
+
+
+def _qt_message(mode, context, message):
+    # offscreen не умеет raise(), прозрачность окна и т.п. — на каждый
+    # вызов Qt пишет предупреждение; в прогонах это только шум
+    if message.startswith("This plugin does not support"):
+        return
+    sys.stderr.write(message + "\n")
+
+
+QtCore.qInstallMessageHandler(_qt_message)
+
+SETTINGS_DIR = tempfile.mkdtemp(prefix="xtimer-bench-")
+for _fmt in (QtCore.QSettings.NativeFormat, QtCore.QSettings.IniFormat):
+    QtCore.QSettings.setPath(_fmt, QtCore.QSettings.UserScope, SETTINGS_DIR)
+
+
+def make_app() -> QtWidgets.QApplication:
+    """QApplication (одна на процесс), как в main.py."""
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication(sys.argv[:1])
+        app.setQuitOnLastWindowClosed(False)
+    return app
+
+
+def spin(ms: int) -> None:
+    """Крутит цикл событий ms миллисекунд."""
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(ms, loop.quit)
+    loop.exec_()
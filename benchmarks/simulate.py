@@ -0,0 +1,153 @@
+# benchmarks/simulate.py
+"""
+Ускоренная симуляция XTimer на виртуальных часах (clock.VirtualClock).
+
+Настоящее окно TaskbarTimer (offscreen, заглушка winapi) проходит --hours
+виртуальных часов циклов «добавить пресет → (пауза → продолжить)* →
+(добавить ещё) → финиш → мигание → сброс». Часы процесса подменены до
+создания окна, поэтому ядро, общие FrameClock, мигание рамки и будильники
+живут в виртуальном времени: advance() сразу вызывает все тики, которые
+за это время разбудил бы цикл событий Qt. Сутки проходятся за доли секунды.
+
+Сценарий сверяется с независимым расчётом:
+  • прошедшее время на паузе — ровно сумма отрезков хода (до наносекунды);
+  • финиш — ровно один раз на цикл, не раньше дедлайна и не позже 1 мс
+    (QTimer взводится с точностью до миллисекунды);
+  • на паузе окно не будит ни одного тика.
+
+    python benchmarks/simulate.py [--hours 24] [--seed 1] [--visible] [--out sim.json]
+
+--visible — окно видно: кроме финишей идут кадры надписи, прогресс-бара
+и мигания (как на экране); без него — только логика отсчёта.
+Код выхода 1 — нарушено хотя бы одно условие.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+
+import headless
+from clock import VirtualClock, set_clock
+
+NS = 1_000_000_000
+MS = 1_000_000
+
+
+class Mismatch(AssertionError):
+    pass
+
+
+def _expect(ok: bool, what: str) -> None:
+    if not ok:
+        raise Mismatch(what)
+
+
+def simulate(hours: float, seed: int, visible: bool) -> dict:
+    clock = VirtualClock(start_ns=1_000 * NS)
+    set_clock(clock)                         # до FrameClock и окна
+    app = headless.make_app()
+    from settings_store import SettingsStore
+    from timer import TaskbarTimer
+
+    SettingsStore.instance().update(auto_start=True, blink_enabled=True, sound_enabled=False)
+    timer = TaskbarTimer()
+    timer.show() if visible else timer.hide()
+    app.processEvents()
+    presets = [p["minutes"] for p in SettingsStore.instance().presets]
+
+    rnd   = random.Random(seed)
+    end   = clock() + int(hours * 3600 * NS)
+    stats = {"cycles": 0, "pauses": 0, "adds": 0, "finishes": 0,
+             "max_finish_delay_us": 0.0, "running_s": 0.0, "paused_s": 0.0}
+    wall0, fired0 = time.perf_counter(), clock.fired
+
+    while clock() < end:
+        stats["cycles"] += 1
+        secs = rnd.choice(presets)
+        timer._add_duration(secs)                       # auto_start → сразу идёт
+        _expect(timer.running, "пресет не запустил отсчёт")
+        duration = secs * NS
+        run_from, ran = clock(), 0                      # независимый учёт хода
+
+        # несколько пауз посреди отсчёта
+        for _ in range(rnd.choice((0, 0, 1, 2, 3))):
+            left = duration - ran - (clock() - run_from)
+            if left <= 2 * MS:
+                break
+            clock.advance(rnd.randrange(MS, left - MS))
+            timer._toggle_start_pause()
+            ran += clock() - run_from
+            _expect(not timer.running, "пауза не остановила отсчёт")
+            _expect(timer.core.elapsed_ns == ran,
+                    f"на паузе {timer.core.elapsed_ns} нс вместо {ran}")
+            fired = clock.fired
+            pause = rnd.randrange(NS, 600 * NS)
+            clock.advance(pause)
+            _expect(clock.fired == fired, "тики во время паузы")
+            stats["pauses"]   += 1
+            stats["paused_s"] += pause / NS
+            timer._toggle_start_pause()
+            run_from = clock()
+
+        # иногда — ещё время к идущему отсчёту
+        if rnd.random() < 0.2:
+            extra = rnd.choice(presets)
+            timer._add_duration(extra)
+            duration += extra * NS
+            stats["adds"] += 1
+
+        deadline = run_from + duration - ran
+        clock.advance_to(deadline - 1)
+        _expect(timer.running and timer.blink_start_ns is None, "финиш раньше дедлайна")
+        clock.advance(MS)
+        _expect(not timer.running and timer.blink_start_ns is not None, "финиш не наступил за 1 мс")
+        delay = timer.blink_start_ns - deadline
+        _expect(0 <= delay <= MS, f"финиш через {delay} нс после дедлайна")
+        stats["finishes"] += 1
+        stats["running_s"] += (deadline - run_from + ran) / NS
+        stats["max_finish_delay_us"] = max(stats["max_finish_delay_us"], delay / 1000)
+
+        clock.advance(rnd.randrange(NS, 10 * NS))       # мигание
+        timer._reset_timer()
+        app.processEvents()                             # отложенные события окна
+
+    wall = time.perf_counter() - wall0
+    simulated = hours * 3600
+    stats.update(
+        visible            = visible,
+        simulated_h        = hours,
+        wall_s             = round(wall, 3),
+        speedup            = round(simulated / wall),
+        wakeups            = clock.fired - fired0,
+        running_s          = round(stats["running_s"], 1),
+        paused_s           = round(stats["paused_s"], 1),
+        max_finish_delay_us= round(stats["max_finish_delay_us"], 1),
+    )
+    timer.close()
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=24, help="виртуальных часов (по умолчанию 24)")
+    parser.add_argument("--seed", type=int, default=1, help="зерно сценария (по умолчанию 1)")
+    parser.add_argument("--visible", action="store_true", help="окно видно — с кадрами надписи и мигания")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = simulate(args.hours, args.seed, args.visible)
+    except Mismatch as exc:
+        print(f"FAIL: {exc}")
+        return 1
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+    for key, value in stats.items():
+        print(f"{key:22} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# benchmarks/soak.py
+"""
+Длительный прогон XTimer без экрана: расход в каждом состоянии окна.
+
+Состояния (по очереди, в одном процессе, с одним окном таймера):
+
+    idle      — отсчёт не задан
+    running   — идёт многочасовой отсчёт, окно видно
+    paused    — отсчёт на паузе
+    hidden    — отсчёт идёт, окно скрыто (кадры не нужны — только финиш)
+    blinking  — отсчёт закончился, рамка мигает
+    menu      — открыто меню быстрого добавления
+
+В каждом состоянии раз в --sample секунд записываются: процессорное
+время, число пробуждений по таймерам (QEvent.Timer во всём приложении)
+и всех событий, RSS и число Python-объектов (gc). Сами замеры (gc.collect,
+подсчёт объектов) из процессорного времени исключаются. Первые --warmup
+секунд каждого состояния — разгон, рост памяти считается после него.
+
+По итогам — таблица, JSON-отчёт (--out) и проверка бюджетов (BUDGETS,
+перекрываются --budgets file.json вида {"idle": {"wakeups_per_s": 1}}).
+Код выхода 1 — бюджет превышен.
+
+    python benchmarks/soak.py [--seconds 60] [--states idle,hidden] [--out soak.json]
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+
+import headless
+
+STATES = ("idle", "running", "paused", "hidden", "blinking", "menu")
+
+# потолки на состояние: доля CPU, пробуждения таймеров в секунду,
+# рост RSS (КиБ) и числа Python-объектов после разгона; running —
+# ~1 кадр в секунду на надпись и пиксели полосы, blinking — ~30 FPS
+BUDGETS = {
+    "idle":     {"cpu_pct": 1.0, "wakeups_per_s": 1.0,  "rss_growth_kib": 1024, "objects_growth": 500},
+    "running":  {"cpu_pct": 2.0, "wakeups_per_s": 5.0,  "rss_growth_kib": 1024, "objects_growth": 500},
+    "paused":   {"cpu_pct": 1.0, "wakeups_per_s": 1.0,  "rss_growth_kib": 1024, "objects_growth": 500},
+    "hidden":   {"cpu_pct": 1.0, "wakeups_per_s": 1.0,  "rss_growth_kib": 1024, "objects_growth": 500},
+    "blinking": {"cpu_pct": 5.0, "wakeups_per_s": 32.0, "rss_growth_kib": 1024, "objects_growth": 500},
+    "menu":     {"cpu_pct": 1.0, "wakeups_per_s": 1.0,  "rss_growth_kib": 1024, "objects_growth": 500},
+}
+
+
+def rss_kib() -> int:
+    """Текущий RSS процесса, КиБ (/proc; иначе — пиковый из getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _make_counter():
+    from PyQt5 import QtCore
+
+    class EventCounter(QtCore.QObject):
+        """
+        Фильтр событий приложения: считает пробуждения таймеров и все
+        события, кроме таймера самого прогона (spin).
+        """
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.timers = 0
+            self.events = 0
+            self._loop  = None
+            self._timer = QtCore.QTimer(self, singleShot=True, timeout=self._quit)
+
+        def _quit(self):
+            if self._loop is not None:
+                self._loop.quit()
+
+        def spin(self, ms: int) -> None:
+            self._loop = QtCore.QEventLoop()
+            self._timer.start(ms)
+            self._loop.exec_()
+            self._loop = None
+
+        def eventFilter(self, obj, event):
+            if obj is self._timer:
+                return False
+            self.events += 1
+            if event.type() == QtCore.QEvent.Timer:
+                self.timers += 1
+            return False
+
+    return EventCounter
+
+
+# ──────────────────────────────────────────────────────────────
+#  состояния
+# ──────────────────────────────────────────────────────────────
+def _start(timer, secs: int) -> None:
+    timer._reset_timer()
+    timer._set_duration(secs)
+    if not timer.running:
+        timer._toggle_start_pause()
+
+
+def enter_state(timer, state: str) -> None:
+    from settings_store import SettingsStore
+    timer._close_menu()
+    timer.show()
+    SettingsStore.instance().update(blink_enabled=(state == "blinking"))
+    if state in ("idle", "menu"):
+        timer._reset_timer()
+        if state == "menu":
+            timer._open_menu()
+    elif state in ("running", "hidden"):
+        _start(timer, 6 * 3600)
+        if state == "hidden":
+            timer.hide()
+    elif state == "paused":
+        _start(timer, 6 * 3600)
+        headless.spin(200)
+        timer._toggle_start_pause()
+    elif state == "blinking":
+        _start(timer, 1)
+        headless.spin(1200)                 # дойти до финиша
+    else:
+        raise ValueError(f"Неизвестное состояние: {state}")
+
+
+# ──────────────────────────────────────────────────────────────
+#  прогон
+# ──────────────────────────────────────────────────────────────
+def soak_state(timer, counter, state: str, seconds: float, sample: float, warmup: float) -> dict:
+    enter_state(timer, state)
+    counter.spin(int(warmup * 1000))
+
+    samples = []
+    overhead = 0.0                          # процессорное время самих замеров
+
+    def take(t0):
+        nonlocal overhead
+        cpu = time.process_time() - overhead
+        row = [round(time.monotonic() - t0, 3), round(cpu, 4), counter.timers, counter.events]
+        m0 = time.process_time()
+        gc.collect()
+        row += [rss_kib(), len(gc.get_objects())]
+        overhead += time.process_time() - m0
+        samples.append(tuple(row))          # кортеж чисел gc не отслеживает — не растит objects
+
+    t0 = time.monotonic()
+    take(t0)
+    samples.clear()                         # первый замер сам выделяет память — не в счёт
+    take(t0)
+    while time.monotonic() - t0 < seconds:
+        counter.spin(int(min(sample, seconds - (time.monotonic() - t0)) * 1000) or 1)
+        take(t0)
+
+    first, last = samples[0], samples[-1]
+    elapsed = last[0] - first[0] or 1e-9
+    return {
+        "seconds":        round(elapsed, 2),
+        "cpu_pct":        round((last[1] - first[1]) / elapsed * 100, 3),
+        "wakeups_per_s":  round((last[2] - first[2]) / elapsed, 2),
+        "events_per_s":   round((last[3] - first[3]) / elapsed, 2),
+        "rss_kib_start":  first[4],
+        "rss_kib_end":    last[4],
+        "rss_growth_kib": last[4] - first[4],
+        "objects_start":  first[5],
+        "objects_end":    last[5],
+        "objects_growth": last[5] - first[5],
+        "samples":        samples,          # [t, cpu_s, timers, events, rss_kib, objects]
+    }
+
+
+def check(result: dict, budget: dict) -> list:
+    """Метрики, превысившие бюджет: [(метрика, значение, потолок)]."""
+    return [(k, result[k], limit) for k, limit in budget.items() if result.get(k, 0) > limit]
+
+
+def run(states, seconds: float, sample: float, warmup: float, budgets: dict) -> dict:
+    app = headless.make_app()
+    from PyQt5 import QtCore
+    from timer import TaskbarTimer
+
+    counter = _make_counter()(app)
+    app.installEventFilter(counter)
+    timer = TaskbarTimer()
+    headless.spin(500)
+
+    report = {}
+    for state in states:
+        print(f"{state}: {seconds:g} s …", file=sys.stderr)
+        res = soak_state(timer, counter, state, seconds, sample, warmup)
+        res["budget"] = budgets.get(state, {})
+        res["failed"] = [k for k, _, _ in check(res, res["budget"])]
+        report[state] = res
+    app.removeEventFilter(counter)
+    timer.close()
+
+    return {
+        "meta": {
+            "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python":   platform.python_version(),
+            "qt":       QtCore.QT_VERSION_STR,
+            "platform": f"{platform.system()} {platform.machine()} / {os.environ['QT_QPA_PLATFORM']}",
+            "seconds":  seconds,
+            "sample":   sample,
+            "warmup":   warmup,
+        },
+        "states": report,
+        "passed": not any(r["failed"] for r in report.values()),
+    }
+
+
+def print_table(report: dict) -> None:
+    cols = ("cpu_pct", "wakeups_per_s", "events_per_s", "rss_growth_kib", "objects_growth")
+    print(f"{'state':10}" + "".join(f"{c:>16}" for c in cols) + "  result")
+    for state, r in report["states"].items():
+        cells = "".join(
+            f"{r[c]:>15}{'!' if c in r['failed'] else ' '}" for c in cols
+        )
+        print(f"{state:10}{cells}  {'FAIL ' + ','.join(r['failed']) if r['failed'] else 'ok'}")
+    print("PASS" if report["passed"] else "FAIL")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60, help="длительность каждого состояния, с (по умолчанию 60)")
+    parser.add_argument("--sample", type=float, default=1.0, help="период замеров, с (по умолчанию 1)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="разгон перед замерами, с (по умолчанию 2)")
+    parser.add_argument("--states", default=",".join(STATES), help="состояния через запятую")
+    parser.add_argument("--budgets", help="JSON с бюджетами, перекрывает встроенные")
+    parser.add_argument("--out", help="куда записать JSON-отчёт")
+    args = parser.parse_args(argv)
+
+    states = [s for s in args.states.split(",") if s]
+    unknown = set(states) - set(STATES)
+    if unknown:
+        parser.error(f"неизвестные состояния: {', '.join(sorted(unknown))}")
+
+    budgets = {s: dict(b) for s, b in BUDGETS.items()}
+    if args.budgets:
+        with open(args.budgets, encoding="utf-8") as f:
+            for state, limits in json.load(f).items():
+                budgets.setdefault(state, {}).update(limits)
+
+    report = run(states, args.seconds, args.sample, args.warmup, budgets)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print_table(report)
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
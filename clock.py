@@ -0,0 +1,128 @@
+# clock.py
+"""
+Часы приложения: откуда логика таймера берёт «сейчас» и кто её будит.
+
+Часы — вызываемый объект: clock() → целые наносекунды (как time.monotonic_ns,
+поэтому их можно передавать в TimerCore / TimerEngine вместо функции).
+clock.timer(parent, callback) создаёт однократный будильник с интерфейсом
+QTimer, которым пользуется код: start(ms), stop(), isActive().
+
+    MonotonicClock — реальное время и настоящий QTimer (по умолчанию);
+    VirtualClock   — время стоит, пока его не сдвинут advance(); будильники
+                     срабатывают по порядку дедлайнов прямо внутри advance —
+                     сутки работы таймера проигрываются за миллисекунды.
+
+Часы на процесс — get_clock(); set_clock() подменяет их и должен вызываться
+до создания FrameClock и окон таймеров (они запоминают часы при создании).
+Модуль не импортирует Qt, пока не нужен настоящий QTimer.
+"""
+import time
+import heapq
+import weakref
+import itertools
+
+
+class MonotonicClock:
+    """Реальные часы: time.monotonic_ns и однократный точный QTimer."""
+
+    def __call__(self) -> int:
+        return time.monotonic_ns()
+
+    def timer(self, parent, callback):
+        from PyQt5 import QtCore
+        timer = QtCore.QTimer(parent, timeout=callback)
+        timer.setSingleShot(True)
+        timer.setTimerType(QtCore.Qt.PreciseTimer)
+        return timer
+
+
+class VirtualTimer:
+    """Однократный будильник VirtualClock (подмножество QTimer)."""
+    __slots__ = ("_clock", "_callback", "_seq", "__weakref__")
+
+    def __init__(self, clock: "VirtualClock", callback):
+        self._clock    = clock
+        self._callback = callback
+        self._seq      = None          # номер актуальной записи в куче часов
+
+    def start(self, ms: int) -> None:
+        self._seq = self._clock._schedule(self, self._clock() + max(int(ms), 0) * 1_000_000)
+
+    def stop(self) -> None:
+        self._seq = None               # запись в куче станет устаревшей
+
+    def isActive(self) -> bool:
+        return self._seq is not None
+
+
+class VirtualClock:
+    """
+    Ручные часы для тестов и симуляций. Время меняется только в advance()
+    / advance_to(); будильники, чей дедлайн наступил, срабатывают там же,
+    по одному, и «сейчас» в момент срабатывания равно их дедлайну — как
+    если бы цикл событий разбудил их вовремя.
+    """
+
+    def __init__(self, start_ns: int = 0):
+        self._now  = start_ns
+        self._heap: list[tuple[int, int, weakref.ref]] = []   # (дедлайн, номер, будильник)
+        self._seq  = itertools.count()
+        self.fired = 0                 # сработавших будильников за всё время
+
+    def __call__(self) -> int:
+        return self._now
+
+    def timer(self, parent, callback) -> VirtualTimer:
+        # parent не нужен: будильник живёт, пока на него ссылается владелец
+        return VirtualTimer(self, callback)
+
+    def _schedule(self, timer: VirtualTimer, deadline_ns: int) -> int:
+        seq = next(self._seq)
+        heapq.heappush(self._heap, (deadline_ns, seq, weakref.ref(timer)))
+        return seq
+
+    def next_deadline(self) -> int | None:
+        """Ближайший дедлайн взведённого будильника (устаревшие записи снимаются)."""
+        heap = self._heap
+        while heap:
+            _, seq, ref = heap[0]
+            timer = ref()
+            if timer is not None and timer._seq == seq:
+                return heap[0][0]
+            heapq.heappop(heap)
+        return None
+
+    def advance_to(self, t_ns: int) -> int:
+        """Переводит часы на t_ns, срабатывая будильники по пути; → их число."""
+        fired = 0
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > t_ns:
+                break
+            _, _, ref = heapq.heappop(self._heap)
+            timer = ref()
+            self._now  = max(self._now, deadline)
+            timer._seq = None
+            fired += 1
+            timer._callback()           # может снова взвести будильники
+        self._now = max(self._now, t_ns)
+        self.fired += fired
+        return fired
+
+    def advance(self, ns: int) -> int:
+        """Сдвигает часы на ns наносекунд; → число сработавших будильников."""
+        return self.advance_to(self._now + ns)
+
+
+_clock = MonotonicClock()
+
+
+def get_clock():
+    """Часы процесса (по умолчанию реальные)."""
+    return _clock
+
+
+def set_clock(clock) -> None:
+    """Подменяет часы процесса; вызывать до создания FrameClock и окон."""
+    global _clock
+    _clock = clock
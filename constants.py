@@ -1,7 +1,8 @@
 import os, sys
 
 __version__ = "1.0.0"
-SERVER_UPDATE_URL = "http://127.0.0.1:5000/uploads/xtimer_update.zip"
+SERVER_UPDATE_URL   = "http://127.0.0.1:5000/uploads/xtimer_update.zip"
+SERVER_MANIFEST_URL = "http://127.0.0.1:5000/uploads/xtimer_manifest.json"
 
 if getattr(sys, "frozen", False):
     BASE_DIR = os.path.dirname(sys.modules['__main__'].__file__)
@@ -14,3 +15,6 @@ PLUGINS_DIR = os.path.join(BASE_DIR, "platforms")
 
 TRAY_ICON     = os.path.join(ICONS_DIR, "tray_icon.ico")
 SETTINGS_ICON = os.path.join(ICONS_DIR, "settings_icon.png")
+ARROW_LEFT_ICON  = os.path.join(ICONS_DIR, "arrow_left.png")
+ARROW_RIGHT_ICON = os.path.join(ICONS_DIR, "arrow_right.png")
+ARROW_DOWN_ICON  = os.path.join(ICONS_DIR, "arrow_down.png")
@@ -1,19 +1,188 @@
 # dialogs.py
 import os
 from PyQt5 import QtCore, QtWidgets, QtGui
-from utils import load_raw_presets, save_presets
-from constants import SETTINGS_ICON
+from settings_store import SettingsStore
+from constants import SETTINGS_ICON, ARROW_LEFT_ICON, ARROW_RIGHT_ICON, ARROW_DOWN_ICON
 from logging_config import log_exceptions
+import instrumentation
+
+# Светлая тема окна настроек — константа модуля; окно одно на процесс
+# (см. SettingsDialog), так что Qt разбирает таблицу стилей один раз.
+_STYLE_SHEET = """
+    /* ─────────────────────  Глобально  ───────────────────── */
+    QWidget {
+        background-color: #FFFFFF;
+        color: #2B2B2B;
+    }
+
+    /* ─────────── QTabWidget / QTabBar ─────────── */
+    QTabWidget::pane {
+        border: 1px solid #4B8BBE;
+        padding: 5px;
+        background: #FFFFFF;
+    }
+    QTabBar::tab {
+        background: #F0F0F0;
+        color: #2B2B2B;
+        padding: 8px 16px;
+        border: 1px solid #4B8BBE;
+        border-bottom: none;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+        margin-right: 2px;
+        min-width: 80px;
+    }
+    QTabBar::tab:selected { background: #FFFFFF; }
+    QTabBar::tab:hover    { background: #D0E4F7; }
+
+    /* ─────────── Текст / чекбоксы ─────────── */
+    QLabel, QCheckBox, QRadioButton {
+        font-size: 10pt;
+        color: #2B2B2B;
+    }
+    QCheckBox::indicator:unchecked {
+        width: 14px; height: 14px;
+        border: 1px solid #2B2B2B;
+        border-radius: 2px;
+        background: transparent;
+    }
+    QCheckBox::indicator:checked {
+        width: 14px; height: 14px;
+        border-radius: 2px;
+        background: #4B8BBE;
+        border: 1px solid #4B8BBE;
+    }
+
+    /* ─────────── LineEdit / ComboBox ─────────── */
+    QLineEdit, QComboBox {
+        background: #FFFFFF;
+        color: #2B2B2B;
+        border: 1px solid #4B8BBE;
+        border-radius: 4px;
+        padding: 4px;
+    }
+    QComboBox QAbstractItemView {
+        background: #FFFFFF;
+        color: #2B2B2B;
+        selection-background-color: #D3D8DE;
+    }
+
+    /* ─────────────────── QSpinBox ─────────────────── */
+    QSpinBox {
+        background: #FFFFFF;
+        color: #2B2B2B;
+        border: 1px solid #4B8BBE;
+        border-radius: 4px;
+        padding: 2px 4px 2px 4px;        /* немного места слева от текста */
+    }
+
+    /* ─────────── Кнопки Apply / OK / Cancel ─────────── */
+    QPushButton {
+        background: #4B8BBE;
+        color: #FFFFFF;
+        border: none;
+        padding: 6px 35px;
+        border-radius: 4px;
+        min-height: 28px;
+    }
+    QPushButton:hover   { background: #6EA9D1; }
+    QPushButton:pressed { background: #346E8A; }
+    QPushButton#btn_apply,
+    QPushButton#btn_ok,
+    QPushButton#btn_cancel { min-width: 75px; }
+
+    /* ─────────── QTableWidget (Пресеты) ─────────── */
+    QTableWidget {
+        background: #FFFFFF;
+        color: #2B2B2B;
+        border: 1px solid #4B8BBE;
+        border-radius: 4px;
+        gridline-color: #4B8BBE;
+    }
+    QHeaderView::section {
+        background: #4B8BBE;
+        color: #FFFFFF;
+        padding: 4px;
+        border: 1px solid #4B8BBE;
+    }
+    QTableWidget::item:selected {
+        background: #D0E4F7;
+        color: #2B2B2B;
+    }
+    QPushButton#btn_pick_color {
+        padding: 0px;             /* убираем отступы */
+        border: 1px solid #D0E4F7;/* хотите ещё тоньше – поставьте 0.5px */
+        border-radius: 4px;       /* можно чуть скруглить края */
+        min-width: 64px;          /* чтобы по высоте/ширине не схлопнулась */
+    }
+"""
+
+
+def _url(path: str) -> str:
+    return "url(" + path.replace(os.sep, "/") + ")"
+
+
+# Кнопки прокрутки вкладок (все вкладки в окно не помещаются) и стрелка
+# комбобокса — рамкой и картинками из таблицы стилей. Без этих правил
+# QStyleSheetStyle отдаёт их Fusion с временной копией палитры, а Fusion
+# кэширует отрисованное в QPixmapCache по ключу палитры — каждая
+# отрисовка окна добавляла новые записи.
+_STYLE_SHEET += f"""
+    /* ─────────── Стрелки ─────────── */
+    QTabBar QToolButton {{
+        background: #F0F0F0;
+        border: 1px solid #4B8BBE;
+        border-radius: 2px;
+    }}
+    QTabBar QToolButton::left-arrow  {{ image: {_url(ARROW_LEFT_ICON)}; }}
+    QTabBar QToolButton::right-arrow {{ image: {_url(ARROW_RIGHT_ICON)}; }}
+    QComboBox::drop-down {{
+        border: none;
+        width: 20px;
+    }}
+    QComboBox::down-arrow {{ image: {_url(ARROW_DOWN_ICON)}; }}
+"""
+
+# QIcon по пути файла — один на процесс: иконка настроек — PNG 1024×1024,
+# разбор занимает десятки мс, а нужна она окну таймера и обоим окнам ниже
+_ICONS: dict[str, QtGui.QIcon] = {}
+
+
+def cached_icon(path: str) -> QtGui.QIcon:
+    icon = _ICONS.get(path)
+    if icon is None:
+        icon = _ICONS[path] = QtGui.QIcon(path)
+    return icon
+
 
 class SettingsDialog(QtWidgets.QWidget):
     """
     Окно настроек для XTimer.
     Содержит вкладки: Общие, Внешний вид, Поведение, Оповещения и Пресеты.
-    При нажатии Apply/OK эмитит сигнал settings_changed().
+    Apply/OK передают поля в SettingsStore; окно таймера узнаёт об
+    изменениях из его сигнала batch_changed.
+
+    Окно одно на всё время работы: закрытие только прячет его, а reload()
+    перед каждым показом заново заполняет поля из SettingsStore — виджеты
+    и соединения не создаются повторно.
+
+    Вкладка строится при первом показе (_ensure_tab): до этого на её месте
+    пустая страница, а шрифты для QFontComboBox, таблица пресетов и т. п.
+    не создаются. Apply/OK сохраняют только построенные вкладки — поля
+    остальных никто не менял.
     """
-    settings_changed = QtCore.pyqtSignal()
     check_updates    = QtCore.pyqtSignal()
-    
+
+    # вкладки по порядку: (ключ, заголовок); строит _create_<ключ>_tab(page),
+    # заполняет из хранилища _load_<ключ>_tab()
+    TABS = (
+        ("general",    "Общие"),
+        ("appearance", "Внешний вид"),
+        ("behavior",   "Обновление"),
+        ("alerts",     "Оповещения"),
+        ("presets",    "Пресеты"),
+    )
+
     def __init__(self):
         super().__init__(
             None,
@@ -22,157 +191,35 @@ class SettingsDialog(QtWidgets.QWidget):
             | QtCore.Qt.WindowCloseButtonHint     # кнопка “×”
         )
         self.setWindowTitle("Настройки XTimer")
-        self.setWindowTitle("Настройки XTimer")
-        icon_path = SETTINGS_ICON
-        self.setWindowIcon(QtGui.QIcon(icon_path))
+        self.setWindowIcon(cached_icon(SETTINGS_ICON))
         self.setMinimumSize(500, 450)
         self.setMaximumSize(700, 600)
 
         # — GLOBAL STYLE SHEET (Light Theme) —
-        # ... внутри __init__(...)
-        self.setStyleSheet("""
-            /* ─────────────────────  Глобально  ───────────────────── */
-            QWidget {
-                background-color: #FFFFFF;
-                color: #2B2B2B;
-            }
-
-            /* ─────────── QTabWidget / QTabBar ─────────── */
-            QTabWidget::pane {
-                border: 1px solid #4B8BBE;
-                padding: 5px;
-                background: #FFFFFF;
-            }
-            QTabBar::tab {
-                background: #F0F0F0;
-                color: #2B2B2B;
-                padding: 8px 16px;
-                border: 1px solid #4B8BBE;
-                border-bottom: none;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-                margin-right: 2px;
-                min-width: 80px;
-            }
-            QTabBar::tab:selected { background: #FFFFFF; }
-            QTabBar::tab:hover    { background: #D0E4F7; }
-
-            /* ─────────── Текст / чекбоксы ─────────── */
-            QLabel, QCheckBox, QRadioButton {
-                font-size: 10pt;
-                color: #2B2B2B;
-            }
-            QCheckBox::indicator:unchecked {
-                width: 14px; height: 14px;
-                border: 1px solid #2B2B2B;
-                border-radius: 2px;
-                background: transparent;
-            }
-            QCheckBox::indicator:checked {
-                width: 14px; height: 14px;
-                border-radius: 2px;
-                background: #4B8BBE;
-                border: 1px solid #4B8BBE;
-            }
-
-            /* ─────────── LineEdit / ComboBox ─────────── */
-            QLineEdit, QComboBox {
-                background: #FFFFFF;
-                color: #2B2B2B;
-                border: 1px solid #4B8BBE;
-                border-radius: 4px;
-                padding: 4px;
-            }
-            QComboBox QAbstractItemView {
-                background: #FFFFFF;
-                color: #2B2B2B;
-                selection-background-color: #D3D8DE;
-            }
-
-            /* ─────────────────── QSpinBox ─────────────────── */
-            QSpinBox {
-                background: #FFFFFF;
-                color: #2B2B2B;
-                border: 1px solid #4B8BBE;
-                border-radius: 4px;
-                padding: 2px 4px 2px 4px;        /* немного места слева от текста */
-            }
-
-            /* ─────────── Кнопки Apply / OK / Cancel ─────────── */
-            QPushButton {
-                background: #4B8BBE;
-                color: #FFFFFF;
-                border: none;
-                padding: 6px 35px;
-                border-radius: 4px;
-                min-height: 28px;
-            }
-            QPushButton:hover   { background: #6EA9D1; }
-            QPushButton:pressed { background: #346E8A; }
-            QPushButton#btn_apply,
-            QPushButton#btn_ok,
-            QPushButton#btn_cancel { min-width: 75px; }
-
-            /* ─────────── QTableWidget (Пресеты) ─────────── */
-            QTableWidget {
-                background: #FFFFFF;
-                color: #2B2B2B;
-                border: 1px solid #4B8BBE;
-                border-radius: 4px;
-                gridline-color: #4B8BBE;
-            }
-            QHeaderView::section {
-                background: #4B8BBE;
-                color: #FFFFFF;
-                padding: 4px;
-                border: 1px solid #4B8BBE;
-            }
-            QTableWidget::item:selected {
-                background: #D0E4F7;
-                color: #2B2B2B;
-            }
-            QPushButton#btn_pick_color {
-                padding: 0px;             /* убираем отступы */
-                border: 1px solid #D0E4F7;/* хотите ещё тоньше – поставьте 0.5px */
-                border-radius: 4px;       /* можно чуть скруглить края */
-                min-width: 64px;          /* чтобы по высоте/ширине не схлопнулась */
-            }
-        """)
+        self.setStyleSheet(_STYLE_SHEET)
 
         # Единый шрифт для окна настроек
         font = QtGui.QFont("Segoe UI", 10)
         self.setFont(font)
 
-        # Загрузка текущих настроек
-        settings = QtCore.QSettings("MyCompany", "TaskbarTimer")
-        self._theme = settings.value("appearance/theme", "dark", type=str) or "dark"
-        color_name = settings.value("appearance/progress_color", "#55FF55", type=str)
-        self._progress_color = QtGui.QColor(color_name)
+        # Текущие настройки — из общего хранилища, без чтения реестра
+        # (поля заполняет reload())
+        self._settings = SettingsStore.instance()
+        self._built: set[str] = set()      # ключи построенных вкладок
+        self._update_status = ""           # текст статуса проверки обновлений
+        self._shown_color: QtGui.QColor | None = None   # цвет на кнопке выбора цвета
 
         # Основной лэйаут
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setContentsMargins(10, 10, 10, 10)
         main_layout.setSpacing(8)
 
-        # Вкладки
+        # Вкладки — пока пустые страницы, содержимое строит _ensure_tab
         self.tabs = QtWidgets.QTabWidget(self)
         main_layout.addWidget(self.tabs)
-
-        # === Вкладка “Общие” ===
-        self._create_general_tab()
-
-        # === Вкладка “Внешний вид” ===
-        self._create_appearance_tab()
-
-        # === Вкладка “Поведение” ===
-        self._create_behavior_tab()
-        
-        self.btn_check_updates.clicked.connect(self._on_check_updates)
-        # === Вкладка “Оповещения” ===
-        self._create_alerts_tab()
-        
-        # === Вкладка “Пресеты” ===
-        self._create_presets_tab()
+        for _key, title in self.TABS:
+            self.tabs.addTab(QtWidgets.QWidget(), title)
+        self.tabs.currentChanged.connect(self._ensure_tab)
 
         # Кнопки Apply, OK, Cancel
         btn_layout = QtWidgets.QHBoxLayout()
@@ -193,54 +240,77 @@ class SettingsDialog(QtWidgets.QWidget):
         self.btn_ok.clicked.connect(self._on_ok_clicked)
         self.btn_cancel.clicked.connect(self._on_cancel_clicked)
 
-    def _create_general_tab(self):
+        self._ensure_tab(self.tabs.currentIndex())
+
+    def reload(self) -> None:
+        """
+        Заполняет поля построенных вкладок текущими значениями из хранилища —
+        несохранённые правки прошлого открытия (Cancel / ×) отбрасываются.
+        Остальные вкладки заполнятся при построении.
+        """
+        self._update_status = ""
+        for key, _title in self.TABS:
+            if key in self._built:
+                getattr(self, f"_load_{key}_tab")()
+
+    def _ensure_tab(self, index: int) -> None:
+        """Строит и заполняет вкладку index, если она ещё не построена."""
+        if index < 0:
+            return
+        key = self.TABS[index][0]
+        if key in self._built:
+            return
+        page = self.tabs.widget(index)
+        # на видимой странице новые виджеты показались бы только отложенно,
+        # после кадра с пустой страницей; на скрытой — вместе с ней в show()
+        visible = page.isVisible()
+        if visible:
+            page.hide()
+        getattr(self, f"_create_{key}_tab")(page)
+        self._built.add(key)
+        getattr(self, f"_load_{key}_tab")()
+        if visible:
+            page.show()
+
+    def _create_general_tab(self, page: QtWidgets.QWidget):
         """
         Вкладка “Общие”: флаги «Всегда поверх», «Сворачивать в трей при старте», «Автостарт при добавлении времени»
         """
-        general_tab = QtWidgets.QWidget()
-        layout = QtWidgets.QFormLayout(general_tab)
+        layout = QtWidgets.QFormLayout(page)
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(6)
 
-        settings = QtCore.QSettings("MyCompany", "TaskbarTimer")
-
         # Чекбокс «Всегда поверх окон»
         self.chk_always_on_top = QtWidgets.QCheckBox("Всегда поверх окон")
-        always_on_top = settings.value("timer/always_on_top", False, type=bool)
-        self.chk_always_on_top.setChecked(always_on_top)
         layout.addRow(self.chk_always_on_top)
 
         # Чекбокс «Сворачивать в трей при старте»
         self.chk_minimize_to_tray = QtWidgets.QCheckBox("Сворачивать в трей при старте")
-        minimize_to_tray = settings.value("timer/minimize_to_tray", False, type=bool)
-        self.chk_minimize_to_tray.setChecked(minimize_to_tray)
         layout.addRow(self.chk_minimize_to_tray)
 
         # Чекбокс «Автостарт при добавлении времени»
         self.chk_auto_start = QtWidgets.QCheckBox("Автостарт при добавлении времени")
-        auto_start = settings.value("timer/auto_start", False, type=bool)
-        self.chk_auto_start.setChecked(auto_start)
         layout.addRow(self.chk_auto_start)
 
                 # Комбо «Логика таймера»
         lbl_logic = QtWidgets.QLabel("Логика таймера:")
         self.combo_count_dir = QtWidgets.QComboBox()
         self.combo_count_dir.addItems(["По возрастанию", "По убыванию"])
-
-        # читаем сохранённое значение ("up" | "down"), по умолчанию — up
-        saved_dir = settings.value("timer/count_direction", "up", type=str)
-        self.combo_count_dir.setCurrentIndex(0 if saved_dir == "up" else 1)
-
         layout.addRow(lbl_logic, self.combo_count_dir)
-        
-        self.tabs.addTab(general_tab, "Общие")
 
-    def _create_appearance_tab(self):
+    def _load_general_tab(self):
+        settings = self._settings
+        self.chk_always_on_top.setChecked(settings.always_on_top)
+        self.chk_minimize_to_tray.setChecked(settings.minimize_to_tray)
+        self.chk_auto_start.setChecked(settings.auto_start)
+        # сохранённое значение ("up" | "down"), по умолчанию — up
+        self.combo_count_dir.setCurrentIndex(0 if settings.count_direction == "up" else 1)
+
+    def _create_appearance_tab(self, page: QtWidgets.QWidget):
         """
         Вкладка “Внешний вид”: выбор темы (для фона таймера) и цвет прогресс-бара
         """
-        appearance_tab = QtWidgets.QWidget()
-        layout = QtWidgets.QFormLayout(appearance_tab)
+        layout = QtWidgets.QFormLayout(page)
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(6)
 
@@ -248,39 +318,19 @@ class SettingsDialog(QtWidgets.QWidget):
         lbl_theme = QtWidgets.QLabel("Тема:")
         self.combo_theme = QtWidgets.QComboBox()
         self.combo_theme.addItems(["Тёмная", "Светлая"])
-        if self._theme == "dark":
-            self.combo_theme.setCurrentIndex(0)
-        else:
-            self.combo_theme.setCurrentIndex(1)
         self.combo_theme.currentIndexChanged.connect(self._on_theme_changed)
         layout.addRow(lbl_theme, self.combo_theme)
         
 
-       # Читаем сохранённый шрифт или устанавливаем дефолт из TaskbarTimer
-        settings = QtCore.QSettings("MyCompany", "TaskbarTimer")
-       # Вместо self.time_font_family ставим вполне конкретный дефолт, например "Arial"
-        saved_font = settings.value("appearance/font", "Arial", type=str)
-
         lbl_font = QtWidgets.QLabel("Шрифт:")
         self.font_combo = QtWidgets.QFontComboBox()
-        # Устанавливаем текущий шрифт в комбобоксе
-        if saved_font:
-            # Поиск индекса сохранённого шрифта и установка
-            idx = self.font_combo.findText(saved_font)
-            if idx >= 0:
-                self.font_combo.setCurrentIndex(idx)
-        # Сохраняем свойство в экземпляр (чтобы позже при сохранении знать текущее значение)
-        self._font = saved_font
         # При изменении выбора обновляем локальную переменную
         self.font_combo.currentFontChanged.connect(lambda f: setattr(self, "_font", f.family()))
         layout.addRow(lbl_font, self.font_combo)
         
-        saved_size = settings.value("appearance/font_size", 12, type=int)
         lbl_size = QtWidgets.QLabel("Размер шрифта:")
         self.spin_font_size = QtWidgets.QSpinBox()
         self.spin_font_size.setRange(6, 22)  # допустимый диапазон: от 6 до 100 пунктов
-        self.spin_font_size.setValue(saved_size)
-        self._font_size = saved_size
         self.spin_font_size.valueChanged.connect(lambda v: setattr(self, "_font_size", v))
         layout.addRow(lbl_size, self.spin_font_size)
         
@@ -290,39 +340,46 @@ class SettingsDialog(QtWidgets.QWidget):
         self.btn_pick_color = QtWidgets.QPushButton()
         self.btn_pick_color.setObjectName("btn_pick_color")
         self.btn_pick_color.setFixedWidth(80)
-        self._update_color_button(self._progress_color)
         self.btn_pick_color.clicked.connect(self._on_pick_color)
         layout.addRow(lbl_prog, self.btn_pick_color)
 
-        self.tabs.addTab(appearance_tab, "Внешний вид")
+    def _load_appearance_tab(self):
+        settings = self._settings
+        self.combo_theme.setCurrentIndex(0 if settings.theme == "dark" else 1)
+        self._theme = settings.theme
 
-    def _create_behavior_tab(self):
+        # Сохранённый шрифт (по умолчанию "Arial" — см. settings_store)
+        saved_font = settings.font
+        if saved_font:
+            # Поиск индекса сохранённого шрифта и установка
+            idx = self.font_combo.findText(saved_font)
+            if idx >= 0:
+                self.font_combo.setCurrentIndex(idx)
+        # Сохраняем свойство в экземпляр (чтобы позже при сохранении знать текущее значение)
+        self._font = saved_font
+
+        self.spin_font_size.setValue(settings.font_size)
+        self._font_size = settings.font_size
+
+        self._progress_color = QtGui.QColor(settings.progress_color)
+        self._update_color_button(self._progress_color)
+
+    def _create_behavior_tab(self, page: QtWidgets.QWidget):
         """
         Вкладка “Поведение”: настройки автопроверки, интервал обновлений
         """
-        behavior_tab = QtWidgets.QWidget()
-        layout = QtWidgets.QFormLayout(behavior_tab)
+        layout = QtWidgets.QFormLayout(page)
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(6)
 
-        settings = QtCore.QSettings("MyCompany", "TaskbarTimer")
-
         # Чекбокс «Автообновление»
         self.chk_auto_update = QtWidgets.QCheckBox("Включить автообновление")
-        auto_update = settings.value("general/auto_update_enabled", False, type=bool)
-        self.chk_auto_update.setChecked(auto_update)
         layout.addRow(self.chk_auto_update)
 
         # Поле «Интервал обновлений (мин)»
         lbl_interval = QtWidgets.QLabel("Интервал обновлений (мин):")
         self.spin_update_interval = QtWidgets.QSpinBox()
         self.spin_update_interval.setRange(1, 10080)  # от 1 минуты до дня
-        raw_interval = settings.value("general/update_interval", None)
-        try:
-            interval = int(raw_interval) if raw_interval is not None else 60
-        except (ValueError, TypeError):
-            interval = 60
-        self.spin_update_interval.setValue(interval)
         layout.addRow(lbl_interval, self.spin_update_interval)
 
         self.btn_check_updates = QtWidgets.QPushButton("Проверить обновления…")
@@ -330,49 +387,39 @@ class SettingsDialog(QtWidgets.QWidget):
         # статус проверки
         self.lbl_update_status = QtWidgets.QLabel("")
         layout.addRow(self.lbl_update_status)
-        
-        self.tabs.addTab(behavior_tab, "Обновление")
+        self.btn_check_updates.clicked.connect(self._on_check_updates)
+
+    def _load_behavior_tab(self):
+        settings = self._settings
+        self.chk_auto_update.setChecked(settings.auto_update)
+        self.spin_update_interval.setValue(settings.update_interval)
+        self.lbl_update_status.setText(self._update_status)
 
-    def _create_alerts_tab(self):
+    def _create_alerts_tab(self, page: QtWidgets.QWidget):
         """
         Вкладка “Оповещения”: настройки мигания и звукового сигнала
         """
-        alerts_tab = QtWidgets.QWidget()
-        layout = QtWidgets.QFormLayout(alerts_tab)
+        layout = QtWidgets.QFormLayout(page)
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(6)
 
-        settings = QtCore.QSettings("MyCompany", "TaskbarTimer")
-
         # Чекбокс «Включить мигание при окончании»
         self.chk_blink_enabled = QtWidgets.QCheckBox("Мигание при окончании")
-        blink_enabled = settings.value("alerts/blink_enabled", False, type=bool)
-        self.chk_blink_enabled.setChecked(blink_enabled)
         layout.addRow(self.chk_blink_enabled)
 
         # Поле «Частота мигания (Гц)»
         lbl_blink_freq = QtWidgets.QLabel("Частота мигания (Гц):")
         self.spin_blink_freq = QtWidgets.QSpinBox()
         self.spin_blink_freq.setRange(1, 10)
-        raw_blink = settings.value("alerts/blink_freq", None)
-        try:
-            blink_freq = int(raw_blink) if raw_blink is not None else 2
-        except (ValueError, TypeError):
-            blink_freq = 2
-        self.spin_blink_freq.setValue(blink_freq)
         layout.addRow(lbl_blink_freq, self.spin_blink_freq)
 
         # Чекбокс «Звуковой сигнал при окончании»
         self.chk_sound_enabled = QtWidgets.QCheckBox("Звуковой сигнал при окончании")
-        sound_enabled = settings.value("alerts/sound_enabled", False, type=bool)
-        self.chk_sound_enabled.setChecked(sound_enabled)
         layout.addRow(self.chk_sound_enabled)
 
         # Поле для пути к файлу звука
         lbl_sound = QtWidgets.QLabel("Звуковой файл:")
         self.edit_sound_path = QtWidgets.QLineEdit()
-        saved_sound = settings.value("alerts/sound_file", "", type=str)
-        self.edit_sound_path.setText(saved_sound)
         self.btn_browse = QtWidgets.QPushButton("Обзор...")
         self.btn_browse.clicked.connect(self._on_browse_sound)
         hl = QtWidgets.QHBoxLayout()
@@ -380,14 +427,18 @@ class SettingsDialog(QtWidgets.QWidget):
         hl.addWidget(self.btn_browse)
         layout.addRow(lbl_sound, hl)
 
-        self.tabs.addTab(alerts_tab, "Оповещения")
+    def _load_alerts_tab(self):
+        settings = self._settings
+        self.chk_blink_enabled.setChecked(settings.blink_enabled)
+        self.spin_blink_freq.setValue(int(settings.blink_freq))
+        self.chk_sound_enabled.setChecked(settings.sound_enabled)
+        self.edit_sound_path.setText(settings.sound_file)
 
-    def _create_presets_tab(self):
+    def _create_presets_tab(self, page: QtWidgets.QWidget):
         """
         Вкладка “Пресеты”: управление пресетами (таблица с сохранёнными значениями)
         """
-        presets_tab = QtWidgets.QWidget()
-        v_layout = QtWidgets.QVBoxLayout(presets_tab)
+        v_layout = QtWidgets.QVBoxLayout(page)
         v_layout.setContentsMargins(10, 10, 10, 10)
         v_layout.setSpacing(6)
 
@@ -410,11 +461,6 @@ class SettingsDialog(QtWidgets.QWidget):
         self.btn_add_preset.clicked.connect(self._on_add_preset)
         self.btn_remove_preset.clicked.connect(self._on_remove_preset)
 
-        # Загрузка существующих пресетов
-        self._load_presets()
-
-        self.tabs.addTab(presets_tab, "Пресеты")
-
     def _on_theme_changed(self, idx: int) -> None:
         """
         Переключаем внутренний флаг темы (используется в TaskbarTimer).
@@ -433,7 +479,12 @@ class SettingsDialog(QtWidgets.QWidget):
     def _update_color_button(self, color: QtGui.QColor):
         """
         Обновить фон кнопки выбора цвета, чтобы показывать текущий выбор.
+        Тот же цвет — та же иконка: новая QIcon при каждой перезагрузке
+        вкладки оставляла бы в QPixmapCache ещё одну копию образца.
         """
+        if color == self._shown_color:
+            return
+        self._shown_color = QtGui.QColor(color)
         pixmap = QtGui.QPixmap(64, 24)
         pixmap.fill(color)
         icon = QtGui.QIcon(pixmap)
@@ -445,18 +496,19 @@ class SettingsDialog(QtWidgets.QWidget):
         Открыть файловый диалог для выбора звукового файла.
         """
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Выберите звуковой файл", "", "WAV Files (*.wav)"
+            self, "Выберите звуковой файл", "",
+            "Звуковые файлы (*.wav *.mp3 *.ogg *.oga *.flac *.m4a *.aac *.wma);;WAV Files (*.wav)"
         )
         if path:
             self.edit_sound_path.setText(path)
             
     @log_exceptions
-    def _load_presets(self):
+    def _load_presets_tab(self):
         """
-        Загрузить пресеты из QSettings (или другого хранилища).
+        Загрузить пресеты из хранилища настроек.
         """
         self.table_presets.setRowCount(0)
-        for item in load_raw_presets():
+        for item in self._settings.presets:
             row = self.table_presets.rowCount()
             self.table_presets.insertRow(row)
             self.table_presets.setItem(row, 0, QtWidgets.QTableWidgetItem(item["name"]))
@@ -490,15 +542,15 @@ class SettingsDialog(QtWidgets.QWidget):
 
     def _on_apply_clicked(self):
         """
-        Нажата кнопка Apply: сохраняем настройки, эмитим сигнал, но окно не закрываем.
+        Нажата кнопка Apply: сохраняем настройки, но окно не закрываем.
         """
-        self._save_and_emit()
+        self._save()
 
     def _on_ok_clicked(self):
         """
-        Нажата кнопка OK: сохраняем настройки, эмитим сигнал и закрываем окно.
+        Нажата кнопка OK: сохраняем настройки и закрываем окно.
         """
-        self._save_and_emit()
+        self._save()
         self.close()
 
     def _on_cancel_clicked(self):
@@ -508,54 +560,62 @@ class SettingsDialog(QtWidgets.QWidget):
         self.close()
 
     @log_exceptions
-    def _save_and_emit(self):
+    def _save(self):
         """
-        Сохранить все настройки из полей в QSettings и эмитить settings_changed().
+        Передать настройки из полей построенных вкладок в хранилище одним
+        пакетом: в QSettings оно их запишет само, отложенно, а подписчикам
+        (TaskbarTimer) сообщит batch_changed. Непостроенные вкладки не
+        открывали — в хранилище для них уже всё как есть.
         """
-        settings = QtCore.QSettings("MyCompany", "TaskbarTimer")
-
+        built = self._built
+        values = {}
         # 1) Общие
-        settings.setValue("timer/always_on_top", self.chk_always_on_top.isChecked())
-        settings.setValue("timer/minimize_to_tray", self.chk_minimize_to_tray.isChecked())
-        settings.setValue("timer/auto_start", self.chk_auto_start.isChecked())
-
-        # новая настройка: направление отсчёта
-        count_dir = "up" if self.combo_count_dir.currentIndex() == 0 else "down"
-        settings.setValue("timer/count_direction", count_dir)
-
-        # 2) Тема и цвет прогресс-бара
-        theme = "dark" if self.combo_theme.currentIndex() == 0 else "light"
-        settings.setValue("appearance/theme", theme)
-        settings.setValue("appearance/progress_color", self._progress_color.name())
-        settings.setValue("appearance/font", getattr(self, "_font", "Arial"))
-        settings.setValue("appearance/font_size", getattr(self, "_font_size", 12))
-        
+        if "general" in built:
+            values.update(
+                always_on_top    = self.chk_always_on_top.isChecked(),
+                minimize_to_tray = self.chk_minimize_to_tray.isChecked(),
+                auto_start       = self.chk_auto_start.isChecked(),
+                # направление отсчёта
+                count_direction  = "up" if self.combo_count_dir.currentIndex() == 0 else "down",
+            )
+        # 2) Тема, цвет прогресс-бара, шрифт
+        if "appearance" in built:
+            values.update(
+                theme            = "dark" if self.combo_theme.currentIndex() == 0 else "light",
+                progress_color   = self._progress_color.name(),
+                font             = self._font,
+                font_size        = self._font_size,
+            )
         # 3) Поведение (автообновление)
-        settings.setValue("general/auto_update_enabled", self.chk_auto_update.isChecked())
-        settings.setValue("general/update_interval", self.spin_update_interval.value())
-
+        if "behavior" in built:
+            values.update(
+                auto_update      = self.chk_auto_update.isChecked(),
+                update_interval  = self.spin_update_interval.value(),
+            )
         # 4) Оповещения (мигание и звук)
-        settings.setValue("alerts/blink_enabled", self.chk_blink_enabled.isChecked())
-        settings.setValue("alerts/blink_freq", self.spin_blink_freq.value())
-        settings.setValue("alerts/sound_enabled", self.chk_sound_enabled.isChecked())
-        settings.setValue("alerts/sound_file", self.edit_sound_path.text())
-
-        # 5) Пресеты
-        presets = []
-        for row in range(self.table_presets.rowCount()):
-            name_item = self.table_presets.item(row, 0)
-            time_item = self.table_presets.item(row, 1)
-            if name_item and time_item:
-                name = name_item.text()
-                try:
-                    minutes = int(time_item.text())
-                except ValueError:
-                    minutes = 0
-                presets.append((name, minutes))
-        save_presets(presets)
-
-        # Эмитируем сигнал, чтобы TaskbarTimer обновил настройки
-        self.settings_changed.emit()
+        if "alerts" in built:
+            values.update(
+                blink_enabled    = self.chk_blink_enabled.isChecked(),
+                blink_freq       = self.spin_blink_freq.value(),
+                sound_enabled    = self.chk_sound_enabled.isChecked(),
+                sound_file       = self.edit_sound_path.text(),
+            )
+        # 5) Пресеты — из таблицы
+        if "presets" in built:
+            presets = []
+            for row in range(self.table_presets.rowCount()):
+                name_item = self.table_presets.item(row, 0)
+                time_item = self.table_presets.item(row, 1)
+                if name_item and time_item:
+                    name = name_item.text()
+                    try:
+                        minutes = int(time_item.text())
+                    except ValueError:
+                        minutes = 0
+                    presets.append({"name": name, "minutes": minutes})
+            values["presets"] = presets
+
+        self._settings.update(values)
         
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         """
@@ -563,9 +623,27 @@ class SettingsDialog(QtWidgets.QWidget):
         • скрываем окно;
         • отменяем штатное закрытие (ignore),
           чтобы приложение не завершалось.
+        Окно переиспользуется при следующем открытии (см. reload).
         """
         self.hide()
         event.ignore()
+
+    # статус проверки обновлений (соединяются с UpdateChecker один раз);
+    # вкладка «Обновление» может быть ещё не построена — тогда текст
+    # покажет _load_behavior_tab
+    def _set_update_status(self, text: str) -> None:
+        self._update_status = text
+        if "behavior" in self._built:
+            self.lbl_update_status.setText(text)
+
+    def on_update_available(self, tag: str, url: str):
+        self._set_update_status(f"Найдена версия {tag}")
+
+    def on_update_downloaded(self, _app_dir: str):
+        self._set_update_status("Обновление установлено")
+
+    def on_update_failed(self, stage: str):
+        self._set_update_status(f"Ошибка: {stage} и сервер проекта недоступен")
         
     @log_exceptions 
     def _on_check_updates(self, checked=False):
@@ -573,5 +651,109 @@ class SettingsDialog(QtWidgets.QWidget):
         Запускается при клике «Проверить обновления…»
         Эмитит сигнал и меняет текст статуса.
         """
-        self.lbl_update_status.setText("Идёт проверка…")
-        self.check_updates.emit()
\ No newline at end of file
+        self._set_update_status("Идёт проверка…")
+        self.check_updates.emit()
+
+class StatsOverlay(QtWidgets.QWidget):
+    """
+    Небольшое окно поверх остальных с гистограммами таймингов
+    (instrumentation): для каждой — число замеров, p50/p95/p99/максимум и
+    полоска распределения по корзинам. Пока окно видно, обновляется раз
+    в секунду. Флажок включает/выключает сбор, кнопки — сброс и экспорт
+    в JSON.
+    """
+    REFRESH_MS = 1000
+    BARS = " ▁▂▃▄▅▆▇█"
+
+    def __init__(self):
+        super().__init__(None, QtCore.Qt.Tool | QtCore.Qt.WindowStaysOnTopHint)
+        self.setWindowTitle("Статистика XTimer")
+        self.setWindowIcon(cached_icon(SETTINGS_ICON))
+        self.setStyleSheet("""
+            QWidget     { background-color: #333333; color: white; }
+            QPushButton { background-color: #555555; border: 1px solid #4B8BBE;
+                          padding: 3px 10px; }
+            QPushButton:hover { background-color: #4B8BBE; }
+            QLabel#stats { font-family: Consolas, "DejaVu Sans Mono", "Courier New", monospace; }
+        """)
+
+        self.chk_enabled = QtWidgets.QCheckBox("Собирать замеры")
+        self.chk_enabled.setChecked(instrumentation.enabled)
+        self.chk_enabled.toggled.connect(self._on_toggled)
+
+        self.lbl_stats = QtWidgets.QLabel(objectName="stats")
+        self.lbl_stats.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+
+        btn_reset  = QtWidgets.QPushButton("Сбросить")
+        btn_export = QtWidgets.QPushButton("Экспорт JSON…")
+        btn_reset.clicked.connect(self._on_reset)
+        btn_export.clicked.connect(self._on_export)
+
+        buttons = QtWidgets.QHBoxLayout()
+        buttons.addWidget(self.chk_enabled)
+        buttons.addStretch()
+        buttons.addWidget(btn_reset)
+        buttons.addWidget(btn_export)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.lbl_stats)
+        layout.addLayout(buttons)
+
+        self._timer = QtCore.QTimer(self, timeout=self._refresh)
+        self._timer.setInterval(self.REFRESH_MS)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+
+    @staticmethod
+    def _fmt_us(us) -> str:
+        if us is None:
+            return "—"
+        return f"{us:.0f} мкс" if us < 1000 else f"{us / 1000:.1f} мс"
+
+    def _bar(self, counts: list) -> str:
+        top = max(counts)
+        if not top:
+            return ""
+        levels = len(self.BARS) - 1
+        return "".join(self.BARS[-(-n * levels // top)] for n in counts)
+
+    def _refresh(self):
+        lines = []
+        for h in instrumentation.HISTOGRAMS.values():
+            d = h.to_dict()
+            lines.append(h.title)
+            lines.append(
+                f"  n={d['count']}  p50≤{self._fmt_us(d['p50_us'])}  p95≤{self._fmt_us(d['p95_us'])}"
+                f"  p99≤{self._fmt_us(d['p99_us'])}  max {self._fmt_us(d['max_us'] if d['count'] else None)}"
+            )
+            lines.append(f"  50мкс |{self._bar(d['counts']):{len(d['counts'])}}| >1с")
+        if not instrumentation.enabled:
+            lines.append("\nСбор выключен.")
+        self.lbl_stats.setText("\n".join(lines))
+
+    def _on_toggled(self, on: bool):
+        instrumentation.set_enabled(on)
+        self._refresh()
+
+    def _on_reset(self):
+        instrumentation.reset()
+        self._refresh()
+
+    @log_exceptions
+    def _on_export(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Экспорт статистики", "xtimer_stats.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            instrumentation.export_json(path)
+        except OSError as exc:
+            QtWidgets.QMessageBox.warning(self, "Статистика XTimer", f"Не удалось сохранить {path}:\n{exc}")
@@ -0,0 +1,107 @@
+# frame_clock.py
+import math
+
+from PyQt5 import QtCore
+from clock import get_clock
+import instrumentation
+
+
+class FrameClock(QtCore.QObject):
+    """
+    Общие на всё приложение «кадровые» часы для окон таймеров.
+
+    Каждое окно сообщает, когда ему нужен следующий кадр (request), или
+    отписывается (deadline=None) — когда скрыто, свёрнуто или ему нечего
+    анимировать. Часы держат один single-shot QTimer на ближайший дедлайн.
+    Неточные (кадровые) дедлайны округляются вверх до сетки FRAME_NS, поэтому
+    все окна, которым нужен кадр в одном и том же слоте, обслуживаются за один
+    проход — число пробуждений не растёт с числом окон. Точные дедлайны
+    (финиш отсчёта) не округляются.
+
+    Время и будильник берутся из часов процесса (clock.get_clock()) —
+    под VirtualClock кадры идут по виртуальному времени.
+    """
+    FRAME_NS = 33_000_000      # ~30 FPS
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "FrameClock":
+        """Единственный экземпляр на приложение (создаётся при первом обращении)."""
+        if cls._instance is None:
+            cls._instance = cls(QtCore.QCoreApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None, clock=None):
+        super().__init__(parent)
+        self._clock = clock or get_clock()
+        self._due   = {}           # подписчик → (дедлайн, колбэк)
+        self._known = set()        # подписчики, на чей destroyed уже подписаны
+        self._armed = None
+        self._timer = self._clock.timer(self, self._on_timeout)
+
+    def now(self) -> int:
+        return self._clock()
+
+    def subscribers(self) -> int:
+        return len(self._due)
+
+    def align(self, deadline_ns: int) -> int:
+        """Кадровый дедлайн, округлённый вверх до сетки FRAME_NS, — когда он сработает."""
+        return -(-deadline_ns // self.FRAME_NS) * self.FRAME_NS
+
+    def request(self, subscriber, callback, deadline_ns: int | None, *, exact: bool = False) -> None:
+        """
+        Запланировать вызов callback() для subscriber в момент deadline_ns
+        (по часам этих часов); None — отписаться. Повторный request
+        заменяет прежний дедлайн подписчика.
+        """
+        if deadline_ns is None:
+            if self._due.pop(subscriber, None) is not None:
+                self._rearm()
+            return
+        if not exact:
+            deadline_ns = self.align(deadline_ns)
+        if subscriber not in self._known and isinstance(subscriber, QtCore.QObject):
+            self._known.add(subscriber)
+            subscriber.destroyed.connect(lambda _=None, s=subscriber: self._forget(s))
+        self._due[subscriber] = (deadline_ns, callback)
+        self._rearm()
+
+    def _forget(self, subscriber) -> None:
+        self._known.discard(subscriber)
+        self.request(subscriber, None, None)
+
+    def _rearm(self) -> None:
+        if not self._due:
+            self._armed = None
+            self._timer.stop()
+            return
+        deadline = min(d for d, _ in self._due.values())
+        if deadline == self._armed and self._timer.isActive():
+            return
+        self._armed = deadline
+        delay = max(deadline - self._clock(), 0)
+        self._timer.start(math.ceil(delay / 1_000_000))
+
+    def _on_timeout(self):
+        # один проход на кадр: все подписчики, чей дедлайн наступил.
+        # Исключение обработчика здесь не ловится — его логирует
+        # install_exception_guard; кадр подписчиков, до которых проход
+        # не дошёл, переносится на следующий, и часы взводятся снова
+        now = self._clock()
+        due = [(s, cb) for s, (d, cb) in self._due.items() if d <= now]
+        if instrumentation.enabled:
+            for s, _ in due:
+                instrumentation.record("tick_lateness", now - self._due[s][0])
+        for s, _ in due:
+            del self._due[s]
+        pending = iter(due)
+        try:
+            for _, cb in pending:
+                cb()               # подписчик сам запросит следующий кадр
+        finally:
+            for s, cb in pending:  # не пусто только после исключения
+                self._due.setdefault(s, (now, cb))
+            self._armed = None
+            self._rearm()
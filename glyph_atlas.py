@@ -0,0 +1,92 @@
+# glyph_atlas.py
+from PyQt5 import QtCore, QtGui
+from PyQt5.QtGui import QPainter, QPixmap, QColor
+
+
+class GlyphAtlas:
+    """
+    Заранее отрисованные пиксмапы символов «0-9» и «:» с обводкой по теме.
+    Одна карта на (шрифт, размер, тема, ориентация, devicePixelRatio):
+    надпись HH:MM:SS собирается из готовых блитов, без QFont/drawText
+    и save/rotate/restore на каждом кадре.
+    """
+    CHARS = "0123456789:"
+    PAD   = 2          # запас под 3px-обводку и сглаживание
+
+    def __init__(self, family: str, size: int, theme: str, vertical: bool, dpr: float):
+        self.key      = (family, size, theme, vertical, dpr)
+        self.vertical = vertical
+
+        font = QtGui.QFont(family, size, QtGui.QFont.Bold)
+        fm   = QtGui.QFontMetrics(font)
+        self.height   = fm.height()
+        self.advances = {}
+        self.pixmaps  = {}
+
+        # светлая тема — белая обводка и чёрная заливка, тёмная — наоборот
+        if theme == "light":
+            outline, fill = QColor(255, 255, 255), QColor(0, 0, 0)
+        else:
+            outline, fill = QColor(0, 0, 0), QColor(255, 255, 255)
+
+        pad = self.PAD
+        for ch in self.CHARS:
+            adv = fm.horizontalAdvance(ch)
+            pix = QPixmap(
+                int(round((adv + 2 * pad) * dpr)),
+                int(round((self.height + 2 * pad) * dpr)),
+            )
+            pix.setDevicePixelRatio(dpr)
+            pix.fill(QtCore.Qt.transparent)
+
+            p = QPainter(pix)
+            p.setRenderHint(QPainter.Antialiasing)
+            p.setFont(font)
+            origin = QtCore.QPointF(pad, pad + fm.ascent())
+            p.setPen(QtGui.QPen(outline, 3))
+            p.drawText(origin, ch)
+            p.setPen(QtGui.QPen(fill, 1))
+            p.drawText(origin, ch)
+            p.end()
+
+            if vertical:
+                # тот же поворот, что и rotate(-90) у painter’а: читается снизу вверх
+                pix = pix.transformed(QtGui.QTransform().rotate(-90))
+                pix.setDevicePixelRatio(dpr)
+
+            self.advances[ch] = adv
+            self.pixmaps[ch]  = pix
+
+    def _origin(self, label: str, rect: QtCore.QRect) -> tuple[int, int, int]:
+        """(x, y, длина строки) — начало надписи, отцентрованной в rect."""
+        total = sum(self.advances[ch] for ch in label)
+        if self.vertical:
+            x = rect.x() + (rect.width() - self.height) // 2
+            y = rect.y() + (rect.height() + total) // 2     # низ строки
+        else:
+            x = rect.x() + (rect.width() - total) // 2
+            y = rect.y() + (rect.height() - self.height) // 2
+        return x, y, total
+
+    def layout(self, label: str, rect: QtCore.QRect) -> list[tuple[QtCore.QPoint, QPixmap]]:
+        """Список (позиция, пиксмап) для блита надписи, отцентрованной в rect."""
+        x, y, _ = self._origin(label, rect)
+        pad     = self.PAD
+        blits   = []
+        for ch in label:
+            adv = self.advances[ch]
+            if self.vertical:
+                y -= adv
+                blits.append((QtCore.QPoint(x - pad, y - pad), self.pixmaps[ch]))
+            else:
+                blits.append((QtCore.QPoint(x - pad, y - pad), self.pixmaps[ch]))
+                x += adv
+        return blits
+
+    def bounds(self, label: str, rect: QtCore.QRect) -> QtCore.QRect:
+        """Прямоугольник, который займёт надпись вместе с обводкой."""
+        x, y, total = self._origin(label, rect)
+        pad = self.PAD
+        if self.vertical:
+            return QtCore.QRect(x - pad, y - total - pad, self.height + 2 * pad, total + 2 * pad)
+        return QtCore.QRect(x - pad, y - pad, total + 2 * pad, self.height + 2 * pad)
@@ -0,0 +1,119 @@
+# instrumentation.py
+"""
+Встроенные замеры таймингов: гистограммы фиксированного размера.
+
+    tick_lateness     — на сколько позже дедлайна FrameClock вызвал кадр
+    paint             — длительность TaskbarTimer.paintEvent
+    finish_delay      — от дедлайна отсчёта до обработки финиша (TaskbarTimer._finish)
+    sound_start_delay — от дедлайна до фактического старта звука
+
+Места замеров проверяют флаг `instrumentation.enabled` и, пока сбор
+выключен, больше ничего не делают — стоимость выключенного сбора — одна
+проверка атрибута модуля. Включается из окна статистики (меню трея) или
+переменной окружения XTIMER_STATS=1.
+"""
+import os
+import json
+import time
+import bisect
+
+# верхние границы корзин, мкс (шаг 1-2-5); последняя корзина — «больше»
+EDGES_US = (50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000,
+            20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000)
+
+enabled = os.environ.get("XTIMER_STATS", "") == "1"
+
+
+class Histogram:
+    """Счётчики по корзинам EDGES_US + число, сумма и максимум (нс)."""
+    __slots__ = ("name", "title", "counts", "count", "total_ns", "max_ns")
+
+    def __init__(self, name: str, title: str):
+        self.name  = name
+        self.title = title
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts   = [0] * (len(EDGES_US) + 1)
+        self.count    = 0
+        self.total_ns = 0
+        self.max_ns   = 0
+
+    def add(self, ns: int) -> None:
+        ns = max(ns, 0)                 # таймер может сработать чуть раньше — это «0»
+        self.counts[bisect.bisect_left(EDGES_US, ns / 1000)] += 1
+        self.count    += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Оценка сверху q-го перцентиля, мкс: граница корзины, где он лежит,
+        но не больше максимума (None — замеров нет).
+        """
+        if not self.count:
+            return None
+        rank   = q * self.count
+        seen   = 0
+        max_us = round(self.max_ns / 1000, 1)
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(EDGES_US[i], max_us) if i < len(EDGES_US) else max_us
+        return max_us
+
+    def to_dict(self) -> dict:
+        return {
+            "title":    self.title,
+            "count":    self.count,
+            "mean_us":  round(self.total_ns / self.count / 1000, 1) if self.count else None,
+            "p50_us":   self.percentile(0.50),
+            "p95_us":   self.percentile(0.95),
+            "p99_us":   self.percentile(0.99),
+            "max_us":   round(self.max_ns / 1000, 1),
+            "edges_us": list(EDGES_US),
+            "counts":   list(self.counts),
+        }
+
+
+HISTOGRAMS = {
+    h.name: h for h in (
+        Histogram("tick_lateness",     "Опоздание тика"),
+        Histogram("paint",             "Отрисовка (paintEvent)"),
+        Histogram("finish_delay",      "Дедлайн → обработка финиша"),
+        Histogram("sound_start_delay", "Дедлайн → старт звука"),
+    )
+}
+
+_started = time.time()
+
+
+def record(name: str, ns: int) -> None:
+    """Добавляет замер; вызывать только под `if instrumentation.enabled`."""
+    HISTOGRAMS[name].add(ns)
+
+
+def set_enabled(on: bool) -> None:
+    global enabled
+    enabled = bool(on)
+
+
+def reset() -> None:
+    global _started
+    for h in HISTOGRAMS.values():
+        h.reset()
+    _started = time.time()
+
+
+def snapshot() -> dict:
+    return {
+        "since":      time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(_started)),
+        "enabled":    enabled,
+        "histograms": {name: h.to_dict() for name, h in HISTOGRAMS.items()},
+    }
+
+
+def export_json(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, ensure_ascii=False, indent=2)
@@ -1,14 +1,80 @@
 # logging_config.py
 import logging
+import logging.handlers
 import os
+import sys
+import queue
+import atexit
+import threading
 import functools
+import collections
+
+LOG_MAX_BYTES = 1024 * 1024     # размер xtimer.log, после которого он ротируется
+LOG_BACKUPS   = 3               # xtimer.log.1 … .3
+RING_CAPACITY = 500             # сколько последних DEBUG-записей держать в памяти
+
+_listener = None
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Записи от file_level и выше сразу передаёт в target; более подробные
+    держит в кольцевом буфере последних capacity записей и сбрасывает
+    в target только перед записью уровня flush_level — отладочный контекст
+    ошибки попадает в файл, а в обычной работе DEBUG на диск не пишется.
+    """
+    def __init__(self, target: logging.Handler, capacity: int = RING_CAPACITY,
+                 file_level: int = logging.INFO, flush_level: int = logging.ERROR):
+        super().__init__(logging.DEBUG)
+        self.target      = target
+        self.file_level  = file_level
+        self.flush_level = flush_level
+        self.buffer      = collections.deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno < self.file_level:
+            self.buffer.append(record)
+            return
+        if record.levelno >= self.flush_level and self.buffer:
+            self.flush_buffer()
+        self.target.handle(record)
+
+    def flush_buffer(self) -> None:
+        records = list(self.buffer)
+        self.buffer.clear()
+        self.target.handle(logging.makeLogRecord({
+            "name": __name__, "levelno": logging.DEBUG, "levelname": "DEBUG",
+            "msg": "── %d предшествующих отладочных записей ──", "args": (len(records),),
+        }))
+        for record in records:
+            self.target.handle(record)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, который в вызывающем потоке только подставляет аргументы
+    в сообщение (объекты аргументов могут измениться, пока запись ждёт в
+    очереди). Строку записи и трассировку исключения форматируют хэндлеры
+    в потоке записи; стандартный prepare форматирует и копирует запись
+    в вызывающем потоке — это больше трети цены вызова логгера.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg, record.args = record.getMessage(), None
+        return record
+
 
 def setup_logging(log_path: str = None) -> None:
     """
     Настраивает корневой логгер:
-    – пишет в файл xtimer.log в папке проекта (если log_path не указан);
+    – вызов логгера только кладёт запись в очередь (LazyQueueHandler),
+      форматирует и пишет в файл и консоль отдельный поток (QueueListener) —
+      GUI-поток не ждёт диска;
+    – пишет в файл xtimer.log в папке проекта (если log_path не указан)
+      записи от INFO, с ротацией по LOG_MAX_BYTES;
+    – DEBUG держит в кольцевом буфере и пишет в файл только перед ошибкой;
     – дублирует важные сообщения в stdout.
     """
+    global _listener
     if log_path is None:
         base_dir = os.path.dirname(__file__)
         log_path = os.path.join(base_dir, "xtimer.log")
@@ -17,10 +83,11 @@ def setup_logging(log_path: str = None) -> None:
     fmt = "%(asctime)s %(levelname)-8s [%(name)s] %(message)s"
     datefmt = "%Y-%m-%d %H:%M:%S"
 
-    # Общий хэндлер для файла
-    file_handler = logging.FileHandler(log_path, encoding="utf-8")
-    file_handler.setLevel(logging.DEBUG)
+    # Файл с ротацией; DEBUG — через кольцевой буфер
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
     file_handler.setFormatter(logging.Formatter(fmt, datefmt))
+    ring_handler = RingBufferHandler(file_handler)
 
     # Хэндлер для консоли — только WARNING и выше
     console_handler = logging.StreamHandler()
@@ -28,20 +95,77 @@ def setup_logging(log_path: str = None) -> None:
     console_handler.setFormatter(logging.Formatter(fmt, datefmt))
 
     root = logging.getLogger()
+    stop_logging()
+    for handler in root.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
     root.setLevel(logging.DEBUG)
-    root.addHandler(file_handler)
-    root.addHandler(console_handler)
+    root.addHandler(LazyQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, ring_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    # atexit выполняется в обратном порядке: очередь дописывается раньше,
+    # чем logging.shutdown закроет файл
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Дописывает записи из очереди и останавливает поток записи."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def install_exception_guard() -> None:
+    """
+    Один обработчик необработанных исключений на процесс вместо обёртки на
+    каждой функции: исключение, вылетевшее из слота Qt (в т.ч. таймера или
+    кадра), из потока или из main, логируется с трассировкой и именем
+    функции, где оно возникло. PyQt5 с собственным sys.excepthook не
+    завершает приложение (qFatal), а продолжает цикл событий. На успешном
+    пути ничего не стоит — горячие функции (_tick, reflect_state) без
+    @log_exceptions, а FrameClock не ловит исключения обработчиков кадра.
+    """
+    def hook(exc_type, exc, tb):
+        if issubclass(exc_type, KeyboardInterrupt):
+            # Ctrl+C в консоли по-прежнему завершает приложение
+            sys.__excepthook__(exc_type, exc, tb)
+            from PyQt5.QtCore import QCoreApplication
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.quit()
+            return
+        if getattr(exc, "_xtimer_logged", False):      # уже залогировано @log_exceptions
+            return
+        frame = None
+        while tb is not None:                          # самый глубокий кадр — место ошибки
+            frame, tb = tb.tb_frame, tb.tb_next
+        name   = getattr(frame.f_code, "co_qualname", frame.f_code.co_name) if frame else "?"
+        module = frame.f_globals.get("__name__", "") if frame else ""
+        logging.getLogger(module).error(f"Ошибка в {name}", exc_info=(exc_type, exc, exc.__traceback__))
+
+    sys.excepthook = hook
+    threading.excepthook = lambda args: hook(args.exc_type, args.exc_value, args.exc_traceback)
+
 
 def log_exceptions(func):
     """
     Декоратор: оборачивает функцию, логирует любые Exception с трассировкой.
+    Исключение логируется один раз — во внутренней из вложенных обёрток;
+    install_exception_guard его повторно не пишет. Для функций, вызываемых
+    на каждом кадре, не нужен: их покрывает install_exception_guard.
     """
     logger = logging.getLogger(func.__module__)
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except Exception:
-            logger.exception(f"Ошибка в {func.__name__}")
+        except Exception as exc:
+            if not getattr(exc, "_xtimer_logged", False):
+                logger.exception(f"Ошибка в {func.__name__}")
+                exc._xtimer_logged = True
             raise
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -1,14 +1,33 @@
 # main.py
+import os
 import sys
-from PyQt5 import QtCore, QtWidgets
-from timer  import TaskbarTimer
-from logging_config import setup_logging
+import app_versions
 
 if __name__ == "__main__":
+    # установленное обновление (versions/<версия>) запускается вместо кода рядом
+    if app_versions.run_installed_version(__file__):
+        sys.exit()
+
+    from PyQt5 import QtCore, QtWidgets
+    from timer  import TaskbarTimer
+    from logging_config import setup_logging, install_exception_guard
+
     setup_logging()
+    install_exception_guard()
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
     app = QtWidgets.QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
+
+    # XTIMER_WATCHDOG_MS=50 — писать зависания цикла событий в xtimer_stalls.log
+    watchdog_ms = os.environ.get("XTIMER_WATCHDOG_MS", "")
+    if watchdog_ms.isdigit() and int(watchdog_ms) > 0:
+        from stall_watchdog import StallWatchdog, STALL_LOG_FILE
+        watchdog = StallWatchdog(os.path.join(os.path.dirname(__file__), STALL_LOG_FILE),
+                                 int(watchdog_ms), app)
+        # с запуском цикла событий: создание окон до него — не зависание
+        QtCore.QTimer.singleShot(0, watchdog.start)
+        app.aboutToQuit.connect(watchdog.stop)
+
     timer = TaskbarTimer()
     timer.show()
     sys.exit(app.exec_())
@@ -3,9 +3,20 @@ from PyQt5.QtGui     import QPixmap, QColor, QPainter, QIcon
 from PyQt5.QtWidgets import QStyle, QSizePolicy, QVBoxLayout
 from logging_config import log_exceptions
 
+DEFAULT_PRESETS = [
+    ("1S",   1),    ("5S",   5),    ("10S",  10),   ("30S",  30),
+    ("1M",  60),   ("5M",  300),   ("10M", 600),  ("30M", 1800),
+    ("1H", 3600),  ("2H", 7200),  ("3H",10800),  ("5H", 18000),
+]
+
+# перекрашенные иконки ▶/‖ — общие для всех экземпляров меню
+_RUN_ICONS = {}
+
 class TimerMenu(QtWidgets.QWidget):
     """
     Контекстное меню таймера: кнопки add-time, start/pause, reset, custom-time.
+    Создаётся один раз и переиспользуется: пресеты обновляются через
+    set_presets() (только изменившиеся кнопки), появление/скрытие — fade_in/fade_out.
     """
 
     add_time     = QtCore.pyqtSignal(int)  # +N секунд
@@ -47,14 +58,6 @@ class TimerMenu(QtWidgets.QWidget):
             "}"
         )
 
-        # Если пресеты не переданы или пусты, используем дефолтные:
-        if not presets:
-            presets = [
-                ("1S",   1),    ("5S",   5),    ("10S",  10),   ("30S",  30),
-                ("1M",  60),   ("5M",  300),   ("10M", 600),  ("30M", 1800),
-                ("1H", 3600),  ("2H", 7200),  ("3H",10800),  ("5H", 18000),
-            ]
-
         # ————————————————————————————————————————————————
         # Корневой лэйаут
         root = QVBoxLayout(self)
@@ -62,18 +65,14 @@ class TimerMenu(QtWidgets.QWidget):
         root.setSpacing(6)
 
         # ————————————————————————————————————————————————
-        # Сетка кнопок с пресетами
-        grid = QtWidgets.QGridLayout()
-        grid.setSpacing(4)
-        for idx, (txt, sec) in enumerate(presets):
-            btn = QtWidgets.QPushButton(txt)
-            # При клике шлём сигнал с количеством секунд
-            btn.clicked.connect(lambda _, s=sec: self.add_time.emit(s))
-            row = idx // 3
-            col = idx % 3
-            grid.addWidget(btn, row, col)
+        # Сетка кнопок с пресетами (заполняется в set_presets)
+        self._grid = QtWidgets.QGridLayout()
+        self._grid.setSpacing(4)
+        self._preset_buttons = []
+        self._presets        = []
+        self.set_presets(presets)
 
-        root.addLayout(grid)
+        root.addLayout(self._grid)
 
         # ————————————————————————————————————————————————
         # Блок управления (▶/‖ и ↻)
@@ -83,6 +82,7 @@ class TimerMenu(QtWidgets.QWidget):
 
         # Кнопка «Запустить/Пауза»
         self.btn_run = QtWidgets.QPushButton()
+        self._paused = None
         self._set_run_icon(paused=True)
         self.btn_run.clicked.connect(self.start_pause.emit)
         self.btn_run.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -103,29 +103,108 @@ class TimerMenu(QtWidgets.QWidget):
 
         root.addLayout(ctrl)
 
+        # ————————————————————————————————————————————————
+        # Одна анимация прозрачности на всё время жизни меню
+        self._fade = QtCore.QPropertyAnimation(self, b"windowOpacity", self)
+        self._fade.setDuration(200)
+        self._fade.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
+        self._fade.finished.connect(self._on_fade_finished)
+        self._closing = False
+
     @log_exceptions
-    # ————————————————————————————————————————————————
-    def _set_run_icon(self, paused: bool):
+    def set_presets(self, presets):
         """
-        Рисует белую иконку ▶ или ‖ в зависимости от состояния paused.
+        Обновляет кнопки пресетов по списку [(name, seconds), ...], сравнивая
+        его с текущим: меняются только отличающиеся кнопки, лишние удаляются,
+        недостающие добавляются. Тот же список — ничего не делает.
         """
-        std_icon = self.style().standardIcon(
-            QStyle.SP_MediaPlay if paused else QStyle.SP_MediaPause
-        )
-        pix = std_icon.pixmap(24, 24)
+        # Если пресеты не переданы или пусты, используем дефолтные:
+        presets = [tuple(p) for p in presets] if presets else list(DEFAULT_PRESETS)
+        if presets == self._presets:
+            return
 
-        # Перекрашиваем иконку в белый цвет
-        colored = QPixmap(pix.size())
-        colored.fill(QtCore.Qt.transparent)
-        p = QPainter(colored)
-        p.drawPixmap(0, 0, pix)
-        p.setCompositionMode(QPainter.CompositionMode_SourceIn)
-        p.fillRect(colored.rect(), QColor("white"))
-        p.end()
+        for idx, (txt, sec) in enumerate(presets):
+            if idx < len(self._preset_buttons):
+                btn = self._preset_buttons[idx]
+                if self._presets[idx] == (txt, sec):
+                    continue
+                btn.setText(txt)
+            else:
+                btn = QtWidgets.QPushButton(txt)
+                # При клике шлём сигнал с количеством секунд
+                btn.clicked.connect(self._on_preset_clicked)
+                self._grid.addWidget(btn, idx // 3, idx % 3)
+                self._preset_buttons.append(btn)
+            btn.setProperty("seconds", sec)
+
+        for btn in self._preset_buttons[len(presets):]:
+            self._grid.removeWidget(btn)
+            btn.deleteLater()
+        del self._preset_buttons[len(presets):]
+
+        self._presets = presets
+        self.adjustSize()
+
+    def _on_preset_clicked(self):
+        self.add_time.emit(int(self.sender().property("seconds")))
 
-        self.btn_run.setIcon(QIcon(colored))
+    # ————————————————————————————————————————————————
+    def fade_in(self):
+        """Показывает меню с плавным появлением (та же анимация, без пересоздания)."""
+        self._fade.stop()
+        self._closing = False
+        if not self.isVisible():
+            self.setWindowOpacity(0.0)
+            self.show()
+        self._fade.setStartValue(self.windowOpacity())
+        self._fade.setEndValue(1.0)
+        self._fade.start()
+
+    def fade_out(self):
+        """Плавно скрывает меню; по окончании анимации окно закрывается."""
+        if not self.isVisible():
+            return
+        self._fade.stop()
+        self._closing = True
+        self._fade.setStartValue(self.windowOpacity())
+        self._fade.setEndValue(0.0)
+        self._fade.start()
+
+    def _on_fade_finished(self):
+        if self._closing:
+            self._closing = False
+            self.close()
+
+    # ————————————————————————————————————————————————
+    def _set_run_icon(self, paused: bool):
+        """
+        Ставит белую иконку ▶ или ‖ в зависимости от состояния paused
+        (перекрашенные иконки рисуются один раз на процесс).
+        """
+        if paused == self._paused:
+            return
+        self._paused = paused
+
+        icon = _RUN_ICONS.get(paused)
+        if icon is None:
+            std_icon = self.style().standardIcon(
+                QStyle.SP_MediaPlay if paused else QStyle.SP_MediaPause
+            )
+            pix = std_icon.pixmap(24, 24)
+
+            # Перекрашиваем иконку в белый цвет
+            colored = QPixmap(pix.size())
+            colored.fill(QtCore.Qt.transparent)
+            p = QPainter(colored)
+            p.drawPixmap(0, 0, pix)
+            p.setCompositionMode(QPainter.CompositionMode_SourceIn)
+            p.fillRect(colored.rect(), QColor("white"))
+            p.end()
+
+            icon = _RUN_ICONS[paused] = QIcon(colored)
+
+        self.btn_run.setIcon(icon)
 
-    @log_exceptions
     def reflect_state(self, running: bool):
         """
         Вызывается извне, чтобы обновить иконку кнопки Run/Pause.
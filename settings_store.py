@@ -0,0 +1,180 @@
+# settings_store.py
+"""
+Единое хранилище настроек приложения в памяти.
+
+Все ключи QSettings читаются один раз (reload) в типизированный, проверенный
+снимок; дальше чтение — обычный доступ к атрибуту (`store.theme`). Запись —
+через update(): изменившиеся ключи сразу видны всем, по каждому эмитится
+changed(attr, value), а в реестр/ini они уходят одним отложенным flush().
+"""
+import logging
+from collections import namedtuple
+
+from PyQt5 import QtCore, QtGui
+from utils import get_settings, RAW_DEFAULT_PRESETS
+
+logger = logging.getLogger(__name__)
+
+# attr — имя атрибута в хранилище, key — ключ QSettings,
+# type — тип для QSettings.value(), check — нормализация/проверка (None = невалидно)
+Field = namedtuple("Field", "attr key type default check")
+
+
+def _choice(*allowed):
+    return lambda v: v if v in allowed else None
+
+
+def _int_range(lo, hi):
+    return lambda v: v if lo <= v <= hi else None
+
+
+def _color(v):
+    # в канонический вид QColor.name() (#rrggbb) — иначе "#55FF55" из
+    # реестра и "#55ff55" из окна настроек считались бы разными значениями
+    return QtGui.QColor(v).name() if QtGui.QColor.isValidColor(v) else None
+
+
+def _presets(raw):
+    cleaned = [
+        {"name": item["name"], "minutes": item["minutes"]}
+        for item in raw
+        if isinstance(item, dict) and "name" in item and "minutes" in item
+    ]
+    # пустой список — как и раньше, откат к пресетам по умолчанию
+    return cleaned or [dict(d) for d in RAW_DEFAULT_PRESETS]
+
+
+FIELDS = (
+    # — Общие —
+    Field("always_on_top",    "timer/always_on_top",          bool,  False,     None),
+    Field("minimize_to_tray", "timer/minimize_to_tray",       bool,  False,     None),
+    Field("auto_start",       "timer/auto_start",             bool,  False,     None),
+    Field("count_direction",  "timer/count_direction",        str,   "up",      _choice("up", "down")),
+    # — Внешний вид —
+    Field("theme",            "appearance/theme",             str,   "dark",    _choice("dark", "light")),
+    Field("progress_color",   "appearance/progress_color",    str,   "#55FF55", _color),
+    Field("font",             "appearance/font",              str,   "Arial",   lambda v: v or None),
+    Field("font_size",        "appearance/font_size",         int,   12,        _int_range(6, 22)),
+    # — Обновление —
+    Field("auto_update",      "general/auto_update_enabled",  bool,  False,     None),
+    Field("update_interval",  "general/update_interval",      int,   60,        _int_range(1, 10080)),
+    # — Оповещения —
+    Field("blink_enabled",    "alerts/blink_enabled",         bool,  False,     None),
+    Field("blink_freq",       "alerts/blink_freq",            float, 2.0,       lambda v: v if 1 <= v <= 10 else None),
+    Field("sound_enabled",    "alerts/sound_enabled",         bool,  False,     None),
+    Field("sound_file",       "alerts/sound_file",            str,   "",        None),
+    # — Пресеты —
+    Field("presets",          "presets/list",                 list,  RAW_DEFAULT_PRESETS, _presets),
+)
+
+FIELDS_BY_ATTR = {f.attr: f for f in FIELDS}
+
+
+class SettingsStore(QtCore.QObject):
+    """
+    Типизированный снимок всех настроек + уведомления + пакетная запись.
+    Один экземпляр на приложение: SettingsStore.instance().
+    """
+    changed       = QtCore.pyqtSignal(str, object)   # (attr, новое значение) — по ключу
+    batch_changed = QtCore.pyqtSignal(object)        # set attr, изменённых одним update()
+
+    FLUSH_DELAY_MS = 500
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "SettingsStore":
+        """Единственный экземпляр на приложение (создаётся при первом обращении)."""
+        if cls._instance is None:
+            cls._instance = cls(QtCore.QCoreApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None, backend=get_settings):
+        super().__init__(parent)
+        self._backend       = backend
+        self._dirty         = set()
+        self.backend_reads  = 0        # сколько значений прочитано из QSettings
+        self.backend_writes = 0        # сколько значений записано в QSettings
+
+        self._flush_timer = QtCore.QTimer(self, timeout=self.flush)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_DELAY_MS)
+
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+        self.reload()
+
+    # ──────────────────────────────────────────────────────────────
+    #  чтение
+    # ──────────────────────────────────────────────────────────────
+    def reload(self) -> None:
+        """Читает все ключи из QSettings (по одному разу) в атрибуты хранилища."""
+        settings = self._backend()
+        for f in FIELDS:
+            try:
+                raw = settings.value(f.key, f.default, type=f.type)
+            except (TypeError, ValueError):
+                raw = f.default
+            self.backend_reads += 1
+            value = f.check(raw) if f.check else raw
+            if value is None:
+                logger.warning("Некорректное значение %s=%r, используется %r", f.key, raw, f.default)
+                value = f.default
+            setattr(self, f.attr, value)
+
+    def snapshot(self) -> dict:
+        """Копия всех значений {attr: value}."""
+        return {f.attr: getattr(self, f.attr) for f in FIELDS}
+
+    # ──────────────────────────────────────────────────────────────
+    #  запись
+    # ──────────────────────────────────────────────────────────────
+    def update(self, values: dict | None = None, **kwargs) -> set:
+        """
+        Применяет новые значения {attr: value}. Невалидное значение — ValueError
+        (ничего не меняется). Возвращает set реально изменившихся attr;
+        по каждому эмитится changed(), по всем вместе — batch_changed().
+        """
+        values = dict(values or {}, **kwargs)
+        checked = {}
+        for attr, value in values.items():
+            f = FIELDS_BY_ATTR.get(attr)
+            if f is None:
+                raise ValueError(f"Неизвестная настройка: {attr}")
+            if f.type is not list and not isinstance(value, f.type):
+                try:
+                    value = f.type(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"{attr}: ожидался {f.type.__name__}, получено {value!r}")
+            norm = f.check(value) if f.check else value
+            if norm is None:
+                raise ValueError(f"{attr}: недопустимое значение {value!r}")
+            checked[attr] = norm
+
+        changed = set()
+        for attr, value in checked.items():
+            if getattr(self, attr) != value:
+                setattr(self, attr, value)
+                self._dirty.add(attr)
+                changed.add(attr)
+
+        for attr in changed:
+            self.changed.emit(attr, getattr(self, attr))
+        if changed:
+            self.batch_changed.emit(changed)
+            self._flush_timer.start()
+        return changed
+
+    def flush(self) -> None:
+        """Записывает все изменённые ключи одним проходом по QSettings."""
+        self._flush_timer.stop()
+        if not self._dirty:
+            return
+        settings = self._backend()
+        for attr in self._dirty:
+            settings.setValue(FIELDS_BY_ATTR[attr].key, getattr(self, attr))
+        settings.sync()
+        self.backend_writes += len(self._dirty)
+        self._dirty.clear()
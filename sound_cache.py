@@ -0,0 +1,200 @@
+# sound_cache.py
+"""
+Декодирование сжатых звуков (MP3, OGG, …) в PCM вне GUI-потока
+и ограниченный по размеру LRU-кэш результатов.
+
+Декодер (QAudioDecoder) работает в отдельном QThread и пишет PCM по мере
+декодирования прямо в WAV во временной папке — его QSoundEffect проигрывает
+так же быстро, как обычный выбранный WAV. В памяти PCM не держится: кэш
+помнит только файл и его размер. Декодер, который STALL_MS не отдаёт
+новых данных и не сообщает ни конца, ни ошибки (нет кодека, битый файл),
+считается зависшим — декодирование завершается ошибкой.
+"""
+import os
+import time
+import wave
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict, namedtuple
+
+from PyQt5 import QtCore
+from PyQt5.QtMultimedia import QAudioDecoder, QAudioFormat
+
+logger = logging.getLogger(__name__)
+
+SOUNDS_CACHE_DIR = os.path.join(tempfile.gettempdir(), "xtimer_sounds")
+
+# PCM в WAV всегда 16-битный signed little-endian (см. to_pcm16);
+# pcm_bytes — его объём, channels/sample_rate — параметры, wav_path — файл
+DecodedSound = namedtuple(
+    "DecodedSound", "path mtime pcm_bytes channels sample_rate wav_path decode_ns"
+)
+
+_FLIP_SIGN = bytes(b ^ 0x80 for b in range(256))
+
+
+def to_pcm16(data: bytes, width: int, signed: bool, little_endian: bool) -> bytes:
+    """
+    Целочисленный PCM шириной width байт (1, 2 или 4) → 16-битный signed
+    little-endian, как его ждёт WAV. От каждого сэмпла берутся два старших
+    байта (у 8-битного — один, младший — 0); беззнаковый сдвигается в
+    знаковый инверсией старшего бита. 8-битный WAV обязан быть беззнаковым,
+    поэтому и его, и 32-битный decoder приводим к 16 битам.
+    """
+    if width not in (1, 2, 4):
+        raise ValueError(f"неподдерживаемая ширина сэмпла: {width} байт")
+    if width == 2 and signed and little_endian:
+        return bytes(data)
+    n   = len(data) // width
+    msb = width - 1 if little_endian else 0
+    out = bytearray(2 * n)
+    hi  = data[msb:n * width:width]
+    out[1::2] = hi if signed else hi.translate(_FLIP_SIGN)
+    if width > 1:
+        nxt = msb - 1 if little_endian else 1
+        out[0::2] = data[nxt:n * width:width]
+    return bytes(out)
+
+
+class PcmCache:
+    """
+    LRU-кэш декодированных звуков по ключу (путь, mtime), ограниченный
+    суммарным объёмом PCM в их WAV-файлах (сам PCM в памяти не хранится).
+    Вытесненные записи удаляют и свой WAV.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items    = OrderedDict()
+        self._bytes    = 0
+        self.hits      = 0
+        self.misses    = 0
+        self.decode_ns = 0          # суммарное время декодирования
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, path: str, mtime: int) -> DecodedSound | None:
+        item = self._items.get((path, mtime))
+        if item is None or not os.path.isfile(item.wav_path):
+            self.misses += 1
+            return None
+        self._items.move_to_end((path, mtime))
+        self.hits += 1
+        return item
+
+    def put(self, sound: DecodedSound) -> None:
+        key = (sound.path, sound.mtime)
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= old.pcm_bytes
+        self._items[key] = sound
+        self._bytes     += sound.pcm_bytes
+        self.decode_ns  += sound.decode_ns
+        # самый свежий элемент не вытесняем, даже если он один больше лимита
+        while self._bytes > self.max_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self._bytes -= evicted.pcm_bytes
+            try:
+                os.remove(evicted.wav_path)
+            except OSError:
+                pass
+
+
+class DecodeWorker(QtCore.QObject):
+    """Живёт в отдельном QThread: декодирует файл и пишет 16-битный PCM в WAV."""
+    decoded = QtCore.pyqtSignal(object)          # DecodedSound
+    failed  = QtCore.pyqtSignal(str, "qint64", str)   # (путь, mtime, причина)
+
+    STALL_MS = 10_000   # столько без нового буфера, конца или ошибки — декодер завис
+
+    @QtCore.pyqtSlot(str, "qint64")
+    def decode(self, path: str, mtime: int):
+        try:
+            self._decode(path, mtime)
+        except Exception as exc:
+            logger.exception("Ошибка декодирования %s", path)
+            self.failed.emit(path, mtime, str(exc))
+
+    def _decode(self, path: str, mtime: int):
+        t0 = time.monotonic_ns()
+        fmt = QAudioFormat()
+        fmt.setCodec("audio/pcm")
+        fmt.setSampleType(QAudioFormat.SignedInt)
+        fmt.setSampleSize(16)
+        fmt.setByteOrder(QAudioFormat.LittleEndian)
+
+        os.makedirs(SOUNDS_CACHE_DIR, exist_ok=True)
+        name = hashlib.sha1(f"{path}|{mtime}".encode("utf-8")).hexdigest() + ".wav"
+        wav_path = os.path.join(SOUNDS_CACHE_DIR, name)
+
+        decoder = QAudioDecoder()
+        decoder.setAudioFormat(fmt)
+        # decoder может не выполнить просьбу о формате — тогда приводим сами
+        state = {"format": None, "wav": None, "bytes": 0, "error": ""}
+        loop  = QtCore.QEventLoop()
+        stall = QtCore.QTimer()                  # срок до следующего буфера
+        stall.setSingleShot(True)
+
+        def fail(reason):
+            state["error"] = reason
+            decoder.stop()
+            loop.quit()
+
+        def on_buffer():
+            stall.start(self.STALL_MS)
+            buf = decoder.read()
+            got = buf.format()
+            if state["wav"] is None:
+                if got.sampleSize() not in (8, 16, 32) \
+                        or got.sampleType() not in (QAudioFormat.SignedInt, QAudioFormat.UnSignedInt):
+                    fail("неподдерживаемый формат PCM")
+                    return
+                state["format"] = got
+                w = state["wav"] = wave.open(wav_path, "wb")
+                w.setnchannels(got.channelCount())
+                w.setsampwidth(2)
+                w.setframerate(got.sampleRate())
+            pcm = to_pcm16(
+                buf.constData().asstring(buf.byteCount()), got.sampleSize() // 8,
+                got.sampleType() == QAudioFormat.SignedInt,
+                got.byteOrder() == QAudioFormat.LittleEndian,
+            )
+            state["wav"].writeframes(pcm)
+            state["bytes"] += len(pcm)
+
+        decoder.bufferReady.connect(on_buffer)
+        decoder.finished.connect(loop.quit)
+        decoder.error.connect(lambda _code: fail(decoder.errorString() or "ошибка декодера"))
+        stall.timeout.connect(lambda: fail(f"декодер не отвечает {self.STALL_MS / 1000:g} с"))
+        decoder.setSourceFilename(path)
+        decoder.start()
+        stall.start(self.STALL_MS)
+        loop.exec_()
+        stall.stop()
+
+        if state["wav"] is not None:
+            state["wav"].close()
+        got = state["format"]
+        if state["error"] or got is None:
+            try:
+                os.remove(wav_path)
+            except OSError:
+                pass
+            self.failed.emit(path, mtime, state["error"] or "декодер не вернул ни одного буфера")
+            return
+
+        self.decoded.emit(DecodedSound(
+            path, mtime, state["bytes"], got.channelCount(), got.sampleRate(),
+            wav_path, time.monotonic_ns() - t0,
+        ))
@@ -0,0 +1,121 @@
+# stall_watchdog.py
+"""
+Сторож цикла событий: замечает, что GUI-поток дольше порога не обрабатывал
+события, и записывает, чем он был занят.
+
+GUI-поток раз в interval отмечает сердцебиение (QTimer). Отдельный поток
+проверяет, не опоздало ли очередное сердцебиение больше чем на порог; если
+опоздало — снимает Python-стек GUI-потока (sys._current_frames) прямо во
+время зависания, а когда цикл отвиснет — пишет событие с длительностью
+в отдельный файл диагностики (xtimer_stalls.log). Долгое зависание (HANG_S)
+пишется, не дожидаясь конца, — на случай, если процесс так и не отвиснет.
+
+Включается переменной окружения XTIMER_WATCHDOG_MS=<порог в мс> (см. main.py);
+выключенный сторож ничего не стоит.
+"""
+import os
+import sys
+import time
+import logging
+import threading
+import traceback
+
+from PyQt5 import QtCore
+from logging_config import LOG_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+STALL_LOG_FILE = "xtimer_stalls.log"
+
+
+class StallWatchdog(QtCore.QObject):
+    HANG_S = 5.0        # зависание дольше — записать сразу, не дожидаясь конца
+
+    def __init__(self, path: str, threshold_ms: int = 50, parent=None, clock=time.monotonic):
+        super().__init__(parent)
+        self.path      = path
+        self.threshold = threshold_ms / 1000
+        self.interval  = max(threshold_ms // 2, 1) / 1000
+        self.stalls    = 0                     # записанных событий
+        self._clock    = clock
+        self._beat     = clock()               # время последнего сердцебиения (пишет только GUI)
+        self._gui      = threading.get_ident()
+        self._stop     = threading.Event()
+        self._thread   = None
+        self._timer    = QtCore.QTimer(self, timeout=self._on_beat)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+
+    # ──────────────────────────────────────────────────────────────
+    #  GUI-поток
+    # ──────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Запускает сторож; вызывать из GUI-потока."""
+        if self._thread is not None:
+            return
+        self._gui  = threading.get_ident()
+        self._beat = self._clock()
+        self._stop.clear()
+        self._timer.start(round(self.interval * 1000))
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        logger.info("Сторож цикла событий включён: порог %d мс, файл %s",
+                    round(self.threshold * 1000), self.path)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._timer.stop()
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _on_beat(self):
+        self._beat = self._clock()
+
+    # ──────────────────────────────────────────────────────────────
+    #  поток сторожа
+    # ──────────────────────────────────────────────────────────────
+    def _gui_stack(self) -> list:
+        frame = sys._current_frames().get(self._gui)
+        return traceback.format_stack(frame) if frame is not None else []
+
+    def _watch(self) -> None:
+        poll  = self.threshold / 4
+        stall = None                           # (сердцебиение до зависания, срок следующего, стек)
+        hang_written = False
+        last  = self._clock()
+        while not self._stop.wait(poll):
+            now  = self._clock()
+            beat = self._beat
+            # опоздал и сам сторож — спал весь процесс (сон ОС, нехватка CPU),
+            # а не один цикл событий: такое зависанием не считаем
+            if now - last > poll + self.threshold:
+                stall, last = None, now
+                continue
+            last = now
+            due = beat + self.interval
+            if stall is None:
+                if now - due >= self.threshold:
+                    stall, hang_written = (beat, due, self._gui_stack()), False
+            elif beat != stall[0]:
+                self._write(beat - stall[1], stall[2])
+                stall = None
+            elif not hang_written and now - stall[1] >= self.HANG_S:
+                self._write(now - stall[1], stall[2], ongoing=True)
+                hang_written = True
+
+    def _write(self, duration: float, stack: list, ongoing: bool = False) -> None:
+        ms = round(duration * 1000)
+        where = stack[-1].strip().splitlines()[0] if stack else "?"
+        logger.warning("Цикл событий %s %d мс: %s",
+                       "завис (продолжается) уже" if ongoing else "стоял", ms, where)
+        head = time.strftime("%Y-%m-%d %H:%M:%S")
+        text = f"{head} stall {ms} ms{' (ongoing)' if ongoing else ''}\n" + "".join(stack) + "\n"
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > LOG_MAX_BYTES:
+                os.replace(self.path, self.path + ".1")
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(text)
+        except OSError:
+            logger.exception("Не удалось записать %s", self.path)
+        self.stalls += 1                       # после записи: кто видит счётчик, видит и файл
@@ -0,0 +1,88 @@
+# tests/conftest.py
+"""
+Общие фикстуры тестов. Запуск без Windows и без экрана — через
+benchmarks/headless.py (offscreen, заглушка winapi, QSettings во временной
+папке); импортируется раньше PyQt5 и модулей приложения.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import headless  # noqa: E402
+
+NS = 1_000_000_000
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return headless.make_app()
+
+
+@pytest.fixture
+def store(qapp):
+    """SettingsStore процесса; после теста значения возвращаются как были."""
+    from settings_store import SettingsStore
+    s = SettingsStore.instance()
+    saved = s.snapshot()
+    yield s
+    s.update(saved)
+
+
+@pytest.fixture
+def vclock(qapp):
+    """
+    Виртуальные часы процесса (clock.VirtualClock), свои FrameClock и
+    QtTimerEngine на них; окна, созданные в тесте, живут в виртуальном времени.
+    """
+    from clock import VirtualClock, get_clock, set_clock
+    from frame_clock import FrameClock
+    from timer_engine_qt import QtTimerEngine
+    saved = get_clock(), FrameClock._instance, QtTimerEngine._instance
+    clock = VirtualClock(start_ns=1_000 * NS)
+    set_clock(clock)
+    FrameClock._instance = QtTimerEngine._instance = None
+    yield clock
+    set_clock(saved[0])
+    FrameClock._instance, QtTimerEngine._instance = saved[1:]
+
+
+@pytest.fixture
+def timer_window(qapp, vclock, store):
+    """Видимое окно TaskbarTimer на виртуальных часах."""
+    pytest.importorskip("PyQt5.QtMultimedia", exc_type=ImportError)   # alarm.py — QSoundEffect
+    from timer import TaskbarTimer
+    timer = TaskbarTimer()
+    timer.show()
+    qapp.processEvents()
+    yield timer
+    timer.close()
+    timer.deleteLater()
+    qapp.processEvents()
+
+
+def spin_until(predicate, timeout_s: float = 10.0) -> bool:
+    """Крутит цикл событий, пока predicate() не станет истинным (или таймаут)."""
+    import time
+    from PyQt5 import QtCore
+    end = time.monotonic() + timeout_s
+    while not predicate():
+        if time.monotonic() > end:
+            return False
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 20)
+        QtCore.QThread.msleep(1)
+    return True
+
+
+@pytest.fixture
+def standin(qapp):
+    """Локальный HTTP-сервер (tests/standin.py) на время теста."""
+    from standin import StandInServer
+    server = StandInServer()
+    yield server
+    server.close()
@@ -0,0 +1,170 @@
+# tests/standin.py
+"""
+Локальный HTTP-сервер — «заместитель» сервера обновлений и GitHub API в
+тестах. Маршруты задаются телом (bytes) или файлом; сервер понимает
+If-None-Match / If-Modified-Since (→ 304) и Range с If-Range (→ 206), может
+отвечать с задержкой, ошибкой или оборвать соединение посреди тела.
+Считает запросы и отданные байты тел по маршрутам.
+"""
+import os
+import sys
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CHUNK = 64 * 1024
+
+
+class Route:
+    def __init__(self, body: bytes | None = None, file: str | None = None, *,
+                 etag: str = "", last_modified: str = "", status: int = 200,
+                 delay: float = 0.0, headers: dict | None = None, drop_after: int | None = None):
+        self.body          = body
+        self.file          = file
+        self.etag          = etag
+        self.last_modified = last_modified
+        self.status        = status
+        self.delay         = delay
+        self.headers       = headers or {}
+        self.drop_after    = drop_after      # оборвать соединение после N байт (один раз)
+        self.requests      = []              # заголовки каждого запроса
+        self.bytes_sent    = 0
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.file) if self.file else len(self.body or b"")
+
+    def read(self, start: int):
+        """Тело с позиции start кусками по CHUNK."""
+        if self.file is None:
+            body = self.body or b""
+            for i in range(start, len(body), CHUNK):
+                yield body[i:i + CHUNK]
+            return
+        with open(self.file, "rb") as f:
+            f.seek(start)
+            for chunk in iter(lambda: f.read(CHUNK), b""):
+                yield chunk
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server.standin
+        route  = server.routes.get(self.path.split("?")[0])
+        with server.lock:
+            server.requests.append(self.path)
+            if route is not None:
+                route.requests.append(dict(self.headers))
+        if route is None:
+            self._reply(404, b"not found")
+            return
+        if route.delay:
+            time.sleep(route.delay)
+        if route.status != 200:
+            self._reply(route.status, b"error")
+            return
+
+        inm = self.headers.get("If-None-Match")
+        ims = self.headers.get("If-Modified-Since")
+        if (route.etag and inm == route.etag) or (route.last_modified and not inm and ims == route.last_modified):
+            self._reply(304, b"", route)
+            return
+
+        size, start = route.size, 0
+        rng = self.headers.get("Range", "")
+        if_range = self.headers.get("If-Range")
+        if rng.startswith("bytes=") and (not if_range or if_range in (route.etag, route.last_modified)):
+            start = int(rng[6:].split("-")[0])
+            if start >= size:
+                self._reply(416, b"")
+                return
+
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self._validators(route)
+        for name, value in route.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(size - start))
+        self.end_headers()
+
+        sent, drop = 0, route.drop_after
+        for chunk in route.read(start):
+            if drop is not None and sent + len(chunk) >= drop:
+                chunk = chunk[:drop - sent]
+            self.wfile.write(chunk)
+            sent += len(chunk)
+            with server.lock:
+                route.bytes_sent  += len(chunk)
+                server.bytes_sent += len(chunk)
+            if drop is not None and sent >= drop:
+                route.drop_after = None
+                self.wfile.flush()
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+
+    def _validators(self, route):
+        if route.etag:
+            self.send_header("ETag", route.etag)
+        if route.last_modified:
+            self.send_header("Last-Modified", route.last_modified)
+
+    def _reply(self, status: int, body: bytes, route: Route | None = None):
+        self.send_response(status)
+        if route is not None:
+            self._validators(route)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+            with self.server.standin.lock:
+                self.server.standin.bytes_sent += len(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # клиент закрыл соединение сам (abort, обрыв) — для тестов не ошибка
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StandInServer:
+    """HTTP-сервер на 127.0.0.1 в фоновом потоке; url(path) — адрес маршрута."""
+
+    def __init__(self):
+        self.routes     = {}
+        self.requests   = []
+        self.bytes_sent = 0
+        self.lock       = threading.Lock()
+        self._httpd     = _Server(("127.0.0.1", 0), _Handler)
+        self._httpd.standin = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def add(self, path: str, *args, **kwargs) -> Route:
+        route = self.routes[path] = Route(*args, **kwargs)
+        return route
+
+    def url(self, path: str) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}{path}"
+
+    def reset_counts(self) -> None:
+        with self.lock:
+            self.requests.clear()
+            self.bytes_sent = 0
+            for route in self.routes.values():
+                route.requests.clear()
+                route.bytes_sent = 0
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,161 @@
+# tests/test_app_versions.py
+"""
+Установка версий (app_versions) в отдельных процессах: main.py запускает
+текущую версию с её собственными модулями, а процесс установки, убитый
+в любой точке, оставляет запускаемой прежнюю версию. prune без жёстких
+ссылок удаляет из store только объекты удалённых версий.
+
+Версия в тестах — настоящие app_versions.py и update_manifest.py с
+пометкой MARK и main.py, который печатает пометки импортированных модулей.
+"""
+import os
+import sys
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import ROOT
+
+MODULES = ("app_versions.py", "update_manifest.py")
+
+PROBE = """\
+import app_versions, update_manifest
+print(app_versions.MARK, update_manifest.MARK)
+"""
+
+# python -c INSTALL <корень> <версия> <папка с файлами> <точка остановки>
+INSTALL = """\
+import os, sys, time
+from app_versions import VersionStore
+from update_manifest import file_sha256
+
+root, version, src, stop = sys.argv[1:5]
+store = VersionStore(root)
+
+def pause(point):
+    if point == stop:
+        print(point, flush=True)
+        time.sleep(60)
+
+write_pointer, replace = store._write_pointer, os.replace
+
+def write_pointer_paused(data):
+    pause("renamed")                     # папка версии на месте, указатель прежний
+    write_pointer(data)
+
+def replace_paused(src, dst):
+    if dst == store.pointer:
+        pause("pointer")                 # новый указатель записан во временный файл
+    replace(src, dst)
+
+store._write_pointer, os.replace = write_pointer_paused, replace_paused
+staging = store.begin(version)
+for i, name in enumerate(sorted(os.listdir(src))):
+    path = os.path.join(src, name)
+    store.add_file(staging, name, path, file_sha256(path))
+    if i == 0:
+        pause("file")                    # собрана часть версии
+pause("staged")                          # собрана вся версия
+store.commit(version, staging)
+"""
+
+KILL_POINTS = ("file", "staged", "renamed", "pointer")
+
+
+@pytest.fixture
+def root(tmp_path):
+    """Корень установки: настоящие main.py и модули, без версий."""
+    path = tmp_path / "app"
+    path.mkdir()
+    for name in ("main.py",) + MODULES:
+        shutil.copy2(os.path.join(ROOT, name), path)
+    return str(path)
+
+
+def _version(tmp_path, mark: str) -> str:
+    src = tmp_path / f"src-{mark}"
+    src.mkdir()
+    for name in MODULES:
+        with open(os.path.join(ROOT, name), encoding="utf-8") as f:
+            (src / name).write_text(f.read() + f"\nMARK = {mark!r}\n", encoding="utf-8")
+    (src / "main.py").write_text(PROBE, encoding="utf-8")
+    return str(src)
+
+
+def _install(root: str, version: str, src: str, stop: str = "") -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", INSTALL, root, version, src, stop],
+                            cwd=root, stdout=subprocess.PIPE, text=True)
+
+
+def _start(root: str) -> str:
+    """Что напечатала версия, запущенная через main.py в корне."""
+    out = subprocess.run([sys.executable, os.path.join(root, "main.py")],
+                         capture_output=True, text=True, timeout=30)
+    assert out.returncode == 0, out.stderr
+    return out.stdout.strip()
+
+
+def test_main_runs_version_with_its_own_modules(root, tmp_path):
+    assert _install(root, "1.0.1", _version(tmp_path, "v1")).wait(30) == 0
+    assert _start(root) == "v1 v1"
+
+
+@pytest.mark.parametrize("point", KILL_POINTS)
+def test_killed_install_keeps_previous_version(root, tmp_path, point):
+    assert _install(root, "1.0.1", _version(tmp_path, "v1")).wait(30) == 0
+    v2 = _version(tmp_path, "v2")
+
+    proc = _install(root, "1.0.2", v2, stop=point)
+    try:
+        assert proc.stdout.readline().strip() == point
+    finally:
+        proc.kill()
+        proc.wait(30)
+        proc.stdout.close()
+    assert _start(root) == "v1 v1"
+
+    # следующая установка убирает остатки оборванной и проходит
+    assert _install(root, "1.0.2", v2).wait(30) == 0
+    assert _start(root) == "v2 v2"
+    versions = os.listdir(os.path.join(root, "versions"))
+    assert sorted(versions) == ["1.0.1", "1.0.2"]
+
+
+def test_prune_without_hardlinks_keeps_objects_of_kept_versions(tmp_path, monkeypatch):
+    from app_versions import VersionStore
+    from update_manifest import file_sha256
+
+    def no_link(src, dst):
+        raise OSError("жёсткие ссылки не поддерживаются")
+    monkeypatch.setattr(os, "link", no_link)
+
+    store = VersionStore(str(tmp_path / "app"))
+    for i in range(1, store.KEEP + 2):                 # одна версия лишняя
+        src = tmp_path / f"src-{i}"
+        src.mkdir()
+        (src / "common.txt").write_text("общий файл", encoding="utf-8")
+        (src / "own.txt").write_text(f"версия {i}", encoding="utf-8")
+        staging = store.begin(f"1.0.{i}")
+        for name in ("common.txt", "own.txt"):
+            path = str(src / name)
+            store.add_file(staging, name, path, file_sha256(path))
+        store.commit(f"1.0.{i}", staging)
+    assert store.linked == 0
+
+    def objects() -> set:
+        return {name for _d, _s, names in os.walk(store.objects_dir) for name in names}
+
+    def needed() -> set:
+        kept = [store.current()] + store.history()
+        assert len(kept) == store.KEEP and "1.0.1" not in kept
+        return {file_sha256(os.path.join(store.version_dir(v), name))
+                for v in kept for name in ("common.txt", "own.txt")}
+
+    assert objects() == needed()
+    assert not os.path.exists(store._manifest_path("1.0.1"))
+
+    # версия, поставленная до манифестов: её объекты — по её файлам
+    os.remove(store._manifest_path("1.0.2"))
+    store.prune()
+    assert objects() == needed()
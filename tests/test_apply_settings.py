@@ -0,0 +1,110 @@
+# tests/test_apply_settings.py
+"""
+Apply в окне настроек применяет только изменившееся: сколько раз окно
+таймера пересоздаёт нативное окно (setWindowFlags) и заново полирует
+стили (setStyleSheet) за одно Apply с одним изменённым полем.
+"""
+import pytest
+from PyQt5 import QtCore
+
+
+def _blink_freq(d):
+    d.spin_blink_freq.setValue(d.spin_blink_freq.value() % 5 + 1)
+
+
+def _count_direction(d):
+    d.combo_count_dir.setCurrentIndex(1 - d.combo_count_dir.currentIndex())
+
+
+def _presets(d):
+    item = d.table_presets.item(0, 1)
+    item.setText(str(int(item.text()) + 1))
+
+
+def _theme(d):
+    d.combo_theme.setCurrentIndex(1 - d.combo_theme.currentIndex())
+
+
+def _always_on_top(d):
+    d.chk_always_on_top.setChecked(not d.chk_always_on_top.isChecked())
+
+
+# изменение → (setWindowFlags, setStyleSheet) за одно Apply
+CASES = {
+    "unchanged":       (lambda d: None,  0, 0),
+    "blink_freq":      (_blink_freq,     0, 0),
+    "count_direction": (_count_direction, 0, 0),
+    "presets":         (_presets,        0, 0),
+    "theme":           (_theme,          0, 1),
+    "always_on_top":   (_always_on_top,  1, 0),
+}
+
+
+class Calls:
+    def __init__(self):
+        self.flags = self.styles = self.win_ids = 0
+
+
+@pytest.fixture
+def dialog(timer_window, qapp):
+    timer_window._open_settings()
+    d = timer_window.settings_dialog
+    for i in range(d.tabs.count()):                 # Apply сохраняет построенные вкладки
+        d.tabs.setCurrentIndex(i)
+    qapp.processEvents()
+    yield d
+    d.hide()
+
+
+@pytest.fixture
+def calls(timer_window, monkeypatch):
+    counted = Calls()
+    set_flags, set_style = timer_window.setWindowFlags, timer_window.setStyleSheet
+
+    def count_flags(flags):
+        counted.flags += 1
+        set_flags(flags)
+
+    def count_style(style):
+        counted.styles += 1
+        set_style(style)
+
+    class WinIdWatch(QtCore.QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.WinIdChange:
+                counted.win_ids += 1
+            return False
+
+    monkeypatch.setattr(timer_window, "setWindowFlags", count_flags, raising=False)
+    monkeypatch.setattr(timer_window, "setStyleSheet", count_style, raising=False)
+    watch = WinIdWatch()
+    timer_window.installEventFilter(watch)
+    yield counted
+    timer_window.removeEventFilter(watch)
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_apply_touches_only_what_changed(case, timer_window, dialog, calls, qapp):
+    change, flags, styles = CASES[case]
+    menu = timer_window.menu
+    change(dialog)
+    dialog._on_apply_clicked()
+    qapp.processEvents()
+
+    assert (calls.flags, calls.styles) == (flags, styles)
+    # пересоздание нативного окна — два WinIdChange: снято и создано заново
+    assert calls.win_ids == 2 * flags
+    assert timer_window.menu is menu                # меню не пересобирается
+
+
+def test_repeated_apply_does_nothing(timer_window, dialog, calls, qapp):
+    _theme(dialog)
+    _always_on_top(dialog)
+    dialog._on_apply_clicked()
+    qapp.processEvents()
+    calls.flags = calls.styles = calls.win_ids = 0
+
+    for _ in range(3):
+        dialog._on_apply_clicked()
+    qapp.processEvents()
+    assert (calls.flags, calls.styles, calls.win_ids) == (0, 0, 0)
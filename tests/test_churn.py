@@ -0,0 +1,32 @@
+# tests/test_churn.py
+"""
+Долгая работа с окнами: меню быстрого добавления и окно настроек
+открываются и закрываются 10 000 раз (циклы benchmarks/churn.py).
+После разгона RSS и число Python-объектов не растут, а число окон и
+получателей сигналов не меняется: окна переиспользуются, соединения
+делаются один раз.
+"""
+from conftest import spin_until
+
+CYCLES      = 10_000
+WARMUP      = 100
+RSS_KIB     = 2048        # шум аллокатора; утечка окна — мегабайты за прогон
+OBJECTS     = 100
+
+
+def test_open_close_churn_stays_flat(timer_window, qapp):
+    from churn import cycle, sample
+    assert spin_until(lambda: timer_window.menu is not None, timeout_s=5)   # меню строится фоном
+
+    for _ in range(WARMUP):
+        cycle(timer_window, qapp)
+    first = sample(WARMUP, timer_window, qapp)
+    for _ in range(CYCLES - WARMUP):
+        cycle(timer_window, qapp)
+    last = sample(CYCLES, timer_window, qapp)
+
+    assert last["rss_kib"] - first["rss_kib"] <= RSS_KIB, (first["rss_kib"], last["rss_kib"])
+    # минус словарь первого замера — он тоже отслеживается gc
+    assert last["objects"] - first["objects"] - 1 <= OBJECTS, (first["objects"], last["objects"])
+    assert last["windows"] == first["windows"]
+    assert last["receivers"] == first["receivers"]
@@ -0,0 +1,66 @@
+# tests/test_instrumentation.py
+"""
+Выключенный сбор замеров (instrumentation.enabled = False) ничего не
+записывает и почти ничего не стоит: кадр с выключенным сбором не читает
+часы — вся его цена в проверке флага. Время кадра с местом замера и без
+него сравнивает benchmarks/bench_instrumentation.py.
+"""
+import pytest
+from PyQt5 import QtGui
+
+NS = 1_000_000_000
+
+
+@pytest.fixture
+def instrumentation(monkeypatch):
+    import instrumentation
+    monkeypatch.setattr(instrumentation, "enabled", False)
+    instrumentation.reset()
+    calls = []
+    record = instrumentation.record
+    monkeypatch.setattr(instrumentation, "record", lambda name, ns: (calls.append(name), record(name, ns)))
+    instrumentation.calls = calls
+    yield instrumentation
+    instrumentation.reset()
+    del instrumentation.calls
+
+
+def _countdown(timer, vclock, qapp, secs: int) -> None:
+    """Отсчёт secs секунд до финиша и секунда мигания, кадр за кадром."""
+    timer._set_duration(secs)
+    if not timer.running:
+        timer._toggle_start_pause()
+    end = vclock() + (secs + 1) * NS
+    while vclock.next_deadline() is not None and vclock.next_deadline() <= end:
+        vclock.advance_to(vclock.next_deadline())
+        qapp.processEvents()                        # перерисовки
+
+
+def test_disabled_instrumentation_records_nothing(instrumentation, timer_window, vclock, qapp, store):
+    store.update(blink_enabled=True, sound_enabled=False)
+    _countdown(timer_window, vclock, qapp, 5)
+    assert not timer_window.running
+    assert instrumentation.calls == []
+    assert all(h.count == 0 for h in instrumentation.HISTOGRAMS.values())
+
+    instrumentation.set_enabled(True)               # те же места замера — уже пишут
+    timer_window._reset_timer()
+    _countdown(timer_window, vclock, qapp, 5)
+    assert {"tick_lateness", "paint", "finish_delay"} <= set(instrumentation.calls)
+
+
+def test_disabled_paint_does_not_read_the_clock(instrumentation, timer_window, monkeypatch):
+    import timer
+    reads = []
+    perf_counter_ns = timer.time.perf_counter_ns
+    monkeypatch.setattr(timer.time, "perf_counter_ns", lambda: (reads.append(1), perf_counter_ns())[1])
+    image = QtGui.QImage(timer_window.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+
+    for _ in range(10):
+        timer_window.render(image)
+    assert reads == [] and instrumentation.calls == []
+
+    instrumentation.set_enabled(True)
+    for _ in range(10):
+        timer_window.render(image)
+    assert len(reads) == 20 and instrumentation.calls == ["paint"] * 10
@@ -0,0 +1,86 @@
+# tests/test_logging.py
+"""
+Журнал (logging_config) во временной папке: размер xtimer.log и его копий
+не выходит за LOG_MAX_BYTES × (LOG_BACKUPS + 1) за длинный прогон окна на
+виртуальных часах, а запись, отформатированная в потоке записи, та же,
+что была в момент вызова.
+"""
+import logging
+
+import pytest
+
+NS = 1_000_000_000
+MAX_BYTES = 16 * 1024          # вместо 1 МБ — ротация за несколько сотен циклов
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """setup_logging в tmp_path; после теста — прежние хэндлеры корневого логгера."""
+    import logging_config
+    monkeypatch.setattr(logging_config, "LOG_MAX_BYTES", MAX_BYTES)
+    root  = logging.getLogger()
+    saved = root.handlers[:], root.level
+    logging_config.setup_logging(str(tmp_path / "xtimer.log"))
+    handlers = logging_config._listener.handlers
+    yield tmp_path
+    logging_config.stop_logging()
+    for handler in handlers:
+        getattr(handler, "target", handler).close()
+    root.handlers[:] = saved[0]
+    root.setLevel(saved[1])
+
+
+def _logs(log_dir) -> dict:
+    return {p.name: p for p in sorted(log_dir.iterdir()) if p.name.startswith("xtimer.log")}
+
+
+def test_log_files_stay_capped_during_soak(log_dir, timer_window, vclock, store):
+    from logging_config import LOG_BACKUPS, RING_CAPACITY, stop_logging
+    store.update(auto_start=True, sound_enabled=False)
+    log = logging.getLogger("soak")
+    ticks, cycles = 20, 290
+    errors_every  = RING_CAPACITY // ticks          # ошибка сбрасывает полный буфер DEBUG
+
+    for cycle in range(cycles):
+        timer_window._add_duration(60)
+        assert timer_window.running
+        for tick in range(ticks):
+            vclock.advance(3 * NS)
+            log.debug("цикл %d, тик %d: осталось %d с", cycle, tick, timer_window.core.remaining_ns // NS)
+        log.info("цикл %d закончен", cycle)
+        if cycle % errors_every == errors_every - 1:
+            log.error("ошибка в цикле %d", cycle)
+        vclock.advance(5 * NS)                      # мигание
+        timer_window._reset_timer()
+    stop_logging()                                  # дописать очередь
+
+    logs = _logs(log_dir)
+    assert list(logs) == ["xtimer.log"] + [f"xtimer.log.{i}" for i in range(1, LOG_BACKUPS + 1)]
+    sizes = {name: path.stat().st_size for name, path in logs.items()}
+    assert all(size <= MAX_BYTES for size in sizes.values()), sizes
+    assert sum(sizes.values()) <= (LOG_BACKUPS + 1) * MAX_BYTES
+
+    text = "".join(logs[name].read_text(encoding="utf-8") for name in reversed(list(logs)))
+    assert "цикл 0 закончен" not in text                 # ранние записи ушли с ротацией
+    assert f"цикл {cycles - 1} закончен" in logs["xtimer.log"].read_text(encoding="utf-8")
+    last_error = cycles - cycles % errors_every - 1
+    assert f"ошибка в цикле {last_error}" in text
+    # DEBUG после последней ошибки остался в памяти
+    assert f"цикл {cycles - 1}, тик" not in text
+
+
+def test_records_are_formatted_in_writer_thread(log_dir):
+    from logging_config import stop_logging
+    log   = logging.getLogger("writer")
+    items = [1, 2]
+    log.info("элементы %s", items)
+    items.append(3)                                  # запись ещё может ждать в очереди
+    try:
+        raise ValueError("проверка")
+    except ValueError:
+        log.exception("ошибка")
+    stop_logging()
+
+    text = _logs(log_dir)["xtimer.log"].read_text(encoding="utf-8")
+    assert "элементы [1, 2]\n" in text
+    assert "Traceback (most recent call last)" in text and "ValueError: проверка" in text
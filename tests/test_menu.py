@@ -0,0 +1,83 @@
+# tests/test_menu.py
+"""
+Меню таймера: строится один раз фоном после старта и переиспользуется;
+от правого клика до первого кадра меню — не дольше MENU_LATENCY_MS.
+"""
+import time
+import statistics
+
+MENU_LATENCY_MS = 50          # offscreen; на экране цель — один кадр (~16 мс)
+OPENS = 7
+
+
+def _wait_paint(qapp, widget, timeout_s: float = 2.0) -> bool:
+    """Крутит события, пока widget не получит QEvent.Paint."""
+    from PyQt5 import QtCore
+
+    class Watch(QtCore.QObject):
+        painted = False
+
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Paint:
+                Watch.painted = True
+            return False
+
+    watch = Watch()
+    widget.installEventFilter(watch)
+    end = time.perf_counter() + timeout_s
+    while not Watch.painted and time.perf_counter() < end:
+        qapp.processEvents()
+    widget.removeEventFilter(watch)
+    return Watch.painted
+
+
+def _right_click(timer) -> None:
+    from PyQt5 import QtCore
+    from PyQt5.QtTest import QTest
+    QTest.mousePress(timer, QtCore.Qt.RightButton, pos=timer.rect().center())
+    QTest.mouseRelease(timer, QtCore.Qt.RightButton, pos=timer.rect().center())
+
+
+def test_menu_is_prebuilt_after_startup(timer_window, qapp):
+    qapp.processEvents()
+    assert timer_window.menu is not None
+    assert not timer_window.menu.isVisible()
+
+
+def test_menu_is_reused_across_right_clicks(timer_window, qapp):
+    qapp.processEvents()
+    menu = timer_window.menu
+    for _ in range(3):
+        _right_click(timer_window)
+        assert timer_window.menu is menu and menu.isVisible()
+        menu.hide()
+        qapp.processEvents()
+
+
+def test_presets_patch_menu_in_place(timer_window, qapp, store):
+    qapp.processEvents()
+    menu = timer_window.menu
+    buttons = list(menu._preset_buttons)
+    presets = [dict(p) for p in store.presets]
+    presets[1]["minutes"] += 1
+    store.update(presets=presets)
+    qapp.processEvents()
+    assert timer_window.menu is menu
+    assert menu._preset_buttons == buttons                 # те же кнопки, не новые
+    assert menu._presets[1] == (presets[1]["name"], presets[1]["minutes"])
+
+
+def test_right_click_to_visible_latency(timer_window, qapp):
+    qapp.processEvents()
+    menu = timer_window.menu
+    samples = []
+    for _ in range(OPENS):
+        t0 = time.perf_counter()
+        _right_click(timer_window)
+        assert _wait_paint(qapp, menu)
+        samples.append((time.perf_counter() - t0) * 1000)
+        menu.hide()
+        qapp.processEvents()
+
+    median = statistics.median(samples)
+    assert median < MENU_LATENCY_MS, f"меню открывается за {median:.1f} мс: {samples}"
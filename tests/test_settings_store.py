@@ -0,0 +1,57 @@
+# tests/test_settings_store.py
+"""
+SettingsStore: бэкенд читается один раз, значения проверяются и приводятся
+к каноническому виду, запись — одним отложенным flush().
+"""
+import pytest
+
+
+@pytest.fixture
+def backend(qapp):
+    """QSettings во временной папке (headless) и счётчик его созданий."""
+    from utils import get_settings
+    created = []
+
+    def make():
+        created.append(1)
+        return get_settings()
+    make.created = created
+    return make
+
+
+def test_reload_reads_each_key_once(backend):
+    from settings_store import SettingsStore, FIELDS
+    store = SettingsStore(backend=backend)
+    assert store.backend_reads == len(FIELDS)
+    assert len(backend.created) == 1
+
+
+def test_invalid_value_is_rejected_without_changes(backend):
+    from settings_store import SettingsStore
+    store = SettingsStore(backend=backend)
+    before = store.snapshot()
+    with pytest.raises(ValueError):
+        store.update(theme="dark", font_size=-3)
+    assert store.snapshot() == before
+
+
+def test_color_is_canonical(backend):
+    from settings_store import SettingsStore
+    store = SettingsStore(backend=backend)
+    store.update(progress_color="#AABBCC")
+    assert store.progress_color == "#aabbcc"
+    assert store.update(progress_color="#aabbcc") == set()   # то же значение — не изменение
+
+
+def test_updates_are_flushed_once(backend):
+    from settings_store import SettingsStore
+    store = SettingsStore(backend=backend)
+    saved = store.snapshot()
+    store.update(blink_freq=saved["blink_freq"] % 5 + 1)
+    store.update(theme="light" if saved["theme"] == "dark" else "dark")
+    assert store.backend_writes == 0
+    store.flush()
+    assert store.backend_writes == 2
+    assert len(backend.created) == 2               # reload + один flush
+    store.update(saved)
+    store.flush()
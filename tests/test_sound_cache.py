@@ -0,0 +1,188 @@
+# tests/test_sound_cache.py
+"""
+sound_cache без настоящего декодера: приведение PCM к 16-битному WAV,
+LRU-кэш, который считает объём по WAV-файлам, не держа PCM в памяти, и
+DecodeWorker с подставным QAudioDecoder — зависший декодер не держит
+поток вечно, а медленный, но живой доводится до конца.
+"""
+import array
+import sys
+import time
+
+import pytest
+
+sound_cache = pytest.importorskip("sound_cache", exc_type=ImportError)   # QtMultimedia
+
+
+def _samples(pcm: bytes) -> list:
+    a = array.array("h", pcm)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tolist()
+
+
+@pytest.mark.parametrize("data, width, signed, little, expected", [
+    (bytes([0, 128, 255]),                1, False, True,  [-32768, 0, 32512]),
+    (bytes([0x80, 0x00, 0x7F]),           1, True,  True,  [-32768, 0, 32512]),
+    (bytes([0x34, 0x12, 0xFF, 0xFF]),     2, True,  True,  [0x1234, -1]),
+    (bytes([0x12, 0x34, 0xFF, 0xFF]),     2, True,  False, [0x1234, -1]),
+    (bytes([0x00, 0x80, 0xFF, 0xFF]),     2, False, True,  [0, 32767]),
+    (bytes([0x78, 0x56, 0x34, 0x12]),     4, True,  True,  [0x1234]),
+    (bytes([0x12, 0x34, 0x56, 0x78]),     4, True,  False, [0x1234]),
+    (bytes([0x00, 0x00, 0x00, 0x80]),     4, False, True,  [0]),
+])
+def test_to_pcm16(data, width, signed, little, expected):
+    assert _samples(sound_cache.to_pcm16(data, width, signed, little)) == expected
+
+
+def test_to_pcm16_rejects_other_widths():
+    with pytest.raises(ValueError):
+        sound_cache.to_pcm16(b"\0\0\0", 3, True, True)
+
+
+def _sound(tmp_path, name: str, size: int):
+    wav = tmp_path / f"{name}.wav"
+    wav.write_bytes(b"\0" * 44)
+    return sound_cache.DecodedSound(name, 1, size, 2, 44100, str(wav), 1_000_000)
+
+
+def test_cache_counts_hits_and_misses(tmp_path):
+    cache = sound_cache.PcmCache(max_bytes=1000)
+    assert cache.get("a", 1) is None
+    cache.put(_sound(tmp_path, "a", 400))
+    assert cache.get("a", 1).pcm_bytes == 400
+    assert cache.get("a", 2) is None                   # другой mtime — другой ключ
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate == pytest.approx(1 / 3)
+
+
+def test_cache_evicts_least_recent_and_its_wav(tmp_path):
+    cache = sound_cache.PcmCache(max_bytes=1000)
+    a, b, c = (_sound(tmp_path, n, 400) for n in "abc")
+    cache.put(a)
+    cache.put(b)
+    cache.get("a", 1)                                  # a свежее b
+    cache.put(c)
+    assert cache.size_bytes == 800
+    assert cache.get("b", 1) is None
+    assert not (tmp_path / "b.wav").exists()
+    assert cache.get("a", 1) is a and cache.get("c", 1) is c
+
+
+def test_cache_keeps_single_oversized_item(tmp_path):
+    cache = sound_cache.PcmCache(max_bytes=100)
+    cache.put(_sound(tmp_path, "big", 500))
+    assert len(cache) == 1 and cache.size_bytes == 500
+
+
+# ──────────────────────────────────────────────────────────────
+#  DecodeWorker и зависший декодер
+# ──────────────────────────────────────────────────────────────
+STALL_MS = 150
+
+
+class FakeBuffer:
+    """QAudioBuffer: 16-битный signed PCM, моно, 8 кГц."""
+
+    def __init__(self, pcm: bytes):
+        self._pcm = pcm
+
+    def format(self):
+        fmt = sound_cache.QAudioFormat()
+        fmt.setChannelCount(1)
+        fmt.setSampleRate(8000)
+        fmt.setSampleSize(16)
+        fmt.setSampleType(sound_cache.QAudioFormat.SignedInt)
+        fmt.setByteOrder(sound_cache.QAudioFormat.LittleEndian)
+        return fmt
+
+    def byteCount(self) -> int:
+        return len(self._pcm)
+
+    def constData(self):
+        pcm = self._pcm
+        return type("Ptr", (), {"asstring": lambda _self, n: pcm[:n]})()
+
+
+def _fake_decoder(buffers: int, every_ms: int):
+    """QAudioDecoder, который отдаёт buffers буферов раз в every_ms и затем finished; 0 — молчит."""
+    from PyQt5 import QtCore
+
+    class FakeDecoder(QtCore.QObject):
+        bufferReady = QtCore.pyqtSignal()
+        finished    = QtCore.pyqtSignal()
+        error       = QtCore.pyqtSignal(int)
+
+        def __init__(self):
+            super().__init__()
+            self.left, self.stopped = buffers, False
+            self._timer = QtCore.QTimer(self, interval=every_ms, timeout=self._next)
+
+        def setAudioFormat(self, fmt):
+            pass
+
+        def setSourceFilename(self, path):
+            pass
+
+        def start(self):
+            if buffers:
+                self._timer.start()
+
+        def stop(self):
+            self.stopped = True
+            self._timer.stop()
+
+        def errorString(self) -> str:
+            return ""
+
+        def read(self):
+            return FakeBuffer(b"\x01\x00" * 100)
+
+        def _next(self):
+            if self.left:
+                self.left -= 1
+                self.bufferReady.emit()
+            else:
+                self._timer.stop()
+                self.finished.emit()
+
+    made = []
+    return made, lambda: made.append(FakeDecoder()) or made[-1]
+
+
+@pytest.fixture
+def worker(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(sound_cache, "SOUNDS_CACHE_DIR", str(tmp_path / "sounds"))
+    monkeypatch.setattr(sound_cache.DecodeWorker, "STALL_MS", STALL_MS)
+    worker = sound_cache.DecodeWorker()
+    worker.result = []
+    worker.decoded.connect(lambda sound: worker.result.append(sound))
+    worker.failed.connect(lambda path, mtime, reason: worker.result.append(reason))
+    return worker
+
+
+def test_silent_decoder_fails_after_stall_deadline(worker, tmp_path, monkeypatch):
+    made, factory = _fake_decoder(buffers=0, every_ms=0)
+    monkeypatch.setattr(sound_cache, "QAudioDecoder", factory)
+    t0 = time.monotonic()
+    worker.decode(str(tmp_path / "alarm.mp3"), 1)
+    elapsed = time.monotonic() - t0
+
+    (reason,) = worker.result
+    assert isinstance(reason, str) and "не отвечает" in reason
+    assert STALL_MS / 1000 * 0.9 <= elapsed < 5
+    assert made[0].stopped
+    assert not any((tmp_path / "sounds").iterdir())
+
+
+def test_slow_but_progressing_decoder_is_not_cut_off(worker, tmp_path, monkeypatch):
+    made, factory = _fake_decoder(buffers=5, every_ms=STALL_MS // 2)
+    monkeypatch.setattr(sound_cache, "QAudioDecoder", factory)
+    t0 = time.monotonic()
+    worker.decode(str(tmp_path / "alarm.mp3"), 1)
+
+    assert time.monotonic() - t0 > STALL_MS / 1000           # дольше срока, но с буферами
+    (sound,) = worker.result
+    assert isinstance(sound, sound_cache.DecodedSound), sound
+    assert sound.pcm_bytes == 5 * 200 and (sound.channels, sound.sample_rate) == (1, 8000)
+    assert not made[0].stopped
@@ -0,0 +1,57 @@
+# tests/test_stall_watchdog.py
+"""
+StallWatchdog на настоящем цикле событий: sleep в слоте записывается
+в xtimer_stalls.log с длительностью и стеком, который указывает на этот
+слот, а долгое зависание — ещё и до того, как цикл отвиснет.
+"""
+import time
+
+import pytest
+from PyQt5 import QtCore
+
+from conftest import spin_until
+
+THRESHOLD_MS = 100
+SLEEP_S      = 0.5
+
+
+def _slow_slot():
+    time.sleep(SLEEP_S)                             # зависание, которое должен найти сторож
+
+
+@pytest.fixture
+def watchdog(qapp, tmp_path):
+    from stall_watchdog import StallWatchdog
+    dog = StallWatchdog(str(tmp_path / "xtimer_stalls.log"), THRESHOLD_MS)
+    dog.start()
+    yield dog
+    dog.stop()
+
+
+def _events(path) -> list:
+    return [e for e in path.read_text(encoding="utf-8").split("\n\n") if e.strip()]
+
+
+def test_sleep_in_slot_is_reported_with_its_stack(watchdog, tmp_path):
+    spin_until(lambda: False, timeout_s=0.3)       # без зависаний — без записей
+    assert watchdog.stalls == 0
+
+    QtCore.QTimer.singleShot(0, _slow_slot)
+    assert spin_until(lambda: watchdog.stalls == 1, timeout_s=5)
+    (event,) = _events(tmp_path / "xtimer_stalls.log")
+    head, *stack = event.splitlines()
+    ms = int(head.split("stall ")[1].split(" ms")[0])
+    # от срока сердцебиения до его прихода: не больше сна, не меньше сна без интервала и порога
+    assert SLEEP_S * 1000 - 2 * THRESHOLD_MS <= ms <= SLEEP_S * 1000 + THRESHOLD_MS, head
+    assert "(ongoing)" not in head
+    assert "in _slow_slot" in stack[-2] and "time.sleep(SLEEP_S)" in stack[-1]
+
+
+def test_long_hang_is_written_while_ongoing(watchdog, tmp_path, monkeypatch):
+    monkeypatch.setattr(watchdog, "HANG_S", SLEEP_S / 2)
+    QtCore.QTimer.singleShot(0, _slow_slot)
+    assert spin_until(lambda: watchdog.stalls == 2, timeout_s=5)
+    ongoing, finished = _events(tmp_path / "xtimer_stalls.log")
+    assert "(ongoing)" in ongoing.splitlines()[0] and "(ongoing)" not in finished.splitlines()[0]
+    for event in (ongoing, finished):
+        assert "in _slow_slot" in event
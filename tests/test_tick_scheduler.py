@@ -0,0 +1,91 @@
+# tests/test_tick_scheduler.py
+"""
+Пробуждения окна таймера за минуту (виртуальную — clock.VirtualClock) в
+каждом состоянии: тики планируются только к следующему видимому или
+логическому изменению, в простое и на паузе их нет совсем. Исключение
+в обработчике кадра не лишает кадра остальные окна.
+"""
+import pytest
+
+from conftest import NS
+
+
+def wakeups_per_minute(clock) -> int:
+    fired = clock.fired
+    clock.advance(60 * NS)
+    return clock.fired - fired
+
+
+def test_idle_timer_never_wakes(timer_window, vclock):
+    timer_window._reset_timer()
+    assert wakeups_per_minute(vclock) == 0
+
+
+def test_paused_timer_never_wakes(timer_window, vclock):
+    timer_window._set_duration(3600)
+    timer_window._toggle_start_pause()
+    vclock.advance(5 * NS)
+    timer_window._toggle_start_pause()
+    assert not timer_window.running
+    assert wakeups_per_minute(vclock) == 0
+
+
+def test_running_timer_wakes_once_per_visible_change(timer_window, vclock, store):
+    store.update(blink_enabled=False)
+    timer_window._set_duration(3600)
+    timer_window._toggle_start_pause()
+    vclock.advance(NS // 2)
+
+    wakeups = wakeups_per_minute(vclock)
+    # 60 смен секунды в надписи + шаги прогресс-бара (час на ~170 px —
+    # несколько пикселей в минуту); старый опрос давал ~4000 в минуту
+    assert 60 <= wakeups <= 70
+
+
+def test_hidden_running_timer_wakes_only_at_finish(timer_window, vclock):
+    timer_window._set_duration(90)
+    timer_window._toggle_start_pause()
+    timer_window.hide()
+    assert wakeups_per_minute(vclock) == 0
+    assert timer_window.running
+
+    assert wakeups_per_minute(vclock) == 1                # сам финиш
+    assert not timer_window.running
+
+
+def test_window_finish_is_scheduled_in_shared_engine(timer_window, vclock):
+    from timer_engine_qt import QtTimerEngine
+    engine = QtTimerEngine.instance().engine
+    assert timer_window.core is engine.get(timer_window._timer_id)
+
+    timer_window._set_duration(5)
+    timer_window._toggle_start_pause()
+    assert engine.next_deadline() == vclock() + 5 * NS
+    timer_window._toggle_start_pause()
+    assert engine.next_deadline() is None
+
+
+def test_frame_callback_exception_keeps_other_subscribers_scheduled(qapp):
+    from clock import VirtualClock
+    from frame_clock import FrameClock
+    clock  = VirtualClock(start_ns=1_000 * NS)
+    frames = FrameClock(clock=clock)
+    calls  = []
+
+    def broken():
+        calls.append("broken")
+        raise RuntimeError("кадр")
+
+    def healthy():
+        calls.append("healthy")
+        frames.request("healthy", healthy, clock() + NS, exact=True)
+
+    frames.request("broken", broken, clock() + NS, exact=True)
+    frames.request("healthy", healthy, clock() + NS, exact=True)
+    with pytest.raises(RuntimeError):          # в приложении — install_exception_guard
+        clock.advance(NS)
+    assert calls == ["broken"]
+    clock.advance(0)                           # кадр healthy — на следующем проходе
+    assert calls == ["broken", "healthy"]
+    clock.advance(NS)
+    assert calls == ["broken", "healthy", "healthy"] and frames.subscribers() == 1
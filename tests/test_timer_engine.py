@@ -0,0 +1,147 @@
+# tests/test_timer_engine.py
+"""
+TimerEngine без Qt: время — из clock.VirtualClock, переданного движку
+(его будильники не используются), «будильник ОС» — список взведений.
+QtTimerEngine — на виртуальных часах процесса.
+"""
+import pytest
+
+from clock import VirtualClock
+from conftest import NS
+from timer_engine import TimerEngine
+
+T0 = 1_000 * NS
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(start_ns=T0)
+
+
+@pytest.fixture
+def armed():
+    return []
+
+
+@pytest.fixture
+def engine(clock, armed):
+    return TimerEngine(arm=armed.append, clock=clock)
+
+
+def test_add_starts_timer_and_arms_earliest_deadline(engine, armed):
+    engine.add("tea", 180)
+    engine.add("eggs", 420)
+    assert engine.get("tea").running
+    assert engine.next_deadline() == T0 + 180 * NS
+    assert armed == [T0 + 180 * NS]             # второй дедлайн позже — не перевзводим
+
+
+def test_add_without_start_keeps_timer_stopped(engine, armed):
+    engine.add("tea", 180, start=False)
+    assert not engine.get("tea").running
+    assert engine.next_deadline() is None
+    assert armed == []
+
+
+def test_add_to_running_timer_moves_its_deadline(engine, armed, clock):
+    engine.add("tea", 180)
+    clock.advance(60 * NS)
+    engine.add("tea", 60, start=False)
+    assert engine.get("tea").running
+    assert armed == [T0 + 180 * NS, T0 + 240 * NS]
+
+
+def test_pause_drops_deadline_and_resume_shifts_it(engine, armed, clock):
+    engine.add("tea", 180)
+    clock.advance(60 * NS)
+    assert engine.pause("tea")
+    assert not engine.pause("tea")               # уже на паузе
+    assert engine.next_deadline() is None
+
+    clock.advance(30 * NS)
+    assert engine.resume("tea")
+    assert not engine.resume("tea")              # уже идёт
+    assert engine.next_deadline() == T0 + 210 * NS
+    assert armed == [T0 + 180 * NS, None, T0 + 210 * NS]
+
+
+def test_toggle_set_and_reset(engine, clock):
+    engine.add("tea", 180)
+    assert engine.toggle("tea") and not engine.get("tea").running
+    assert engine.toggle("tea") and engine.get("tea").running
+
+    engine.set("tea", 60)
+    assert not engine.get("tea").running and engine.next_deadline() is None
+    engine.resume("tea")
+    assert engine.next_deadline() == clock() + 60 * NS
+
+    engine.reset("tea")
+    assert engine.get("tea").duration_ns == 0
+    assert not engine.toggle("tea")              # без длительности не запускается
+
+
+def test_cancel_forgets_timer_and_rearms(engine, armed):
+    engine.add("tea", 180)
+    engine.add("eggs", 420)
+    assert engine.cancel("tea")
+    assert not engine.cancel("tea")
+    assert "tea" not in engine and len(engine) == 1
+    assert armed[-1] == T0 + 420 * NS
+
+
+def test_fire_returns_due_timers_in_deadline_order(engine, armed, clock):
+    for i, secs in enumerate((300, 100, 200, 400)):
+        engine.add(f"t{i}", secs)
+    clock.advance(250 * NS)
+    assert engine.fire() == ["t1", "t2"]
+    assert not engine.get("t1").running
+    assert engine.get("t1").elapsed_ns == 100 * NS
+    assert engine.get("t0").running
+    assert armed[-1] == T0 + 300 * NS
+
+    clock.advance(1_000 * NS)
+    assert engine.fire() == ["t0", "t3"]
+    assert engine.next_deadline() is None
+    assert armed[-1] == T0 + 300 * NS            # сработавший будильник не снимают
+    assert engine.fire() == []
+
+
+def test_fire_skips_paused_cancelled_and_moved_timers(engine, clock):
+    engine.add("paused", 100)
+    engine.add("cancelled", 100)
+    engine.add("moved", 100)
+    engine.pause("paused")
+    engine.cancel("cancelled")
+    engine.add("moved", 100, start=False)
+    clock.advance(150 * NS)
+    assert engine.fire() == []
+    clock.advance(50 * NS)
+    assert engine.fire() == ["moved"]
+
+
+def test_fire_skips_core_stopped_outside_engine(engine, clock):
+    core = engine.add("tea", 100)
+    clock.advance(100 * NS)
+    assert core.tick()                           # финиш заметил сам владелец
+    assert engine.fire() == []
+
+
+def test_stale_entries_are_compacted(engine):
+    engine.add("tea", 10_000)
+    for _ in range(1_000):
+        engine.pause("tea")
+        engine.resume("tea")
+    assert len(engine._heap) <= 2 * len(engine) + 16
+
+
+def test_qt_engine_emits_finished_at_deadline(vclock):
+    from timer_engine_qt import QtTimerEngine
+    qt = QtTimerEngine()
+    done = []
+    qt.finished.connect(lambda timer_id: done.append((timer_id, vclock())))
+    qt.engine.add("tea", 2)
+    qt.engine.add("eggs", 1)
+
+    fired = vclock.advance(5 * NS)
+    assert done == [("eggs", T0 + NS), ("tea", T0 + 2 * NS)]
+    assert fired == 2                            # один будильник на дедлайн
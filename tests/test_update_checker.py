@@ -0,0 +1,374 @@
+# tests/test_update_checker.py
+"""
+UpdateChecker против локального сервера (tests/standin.py): установленная
+версия — копия кода, иконок и звуков приложения во временной папке, новая —
+та же копия с одним изменённым файлом. Сервер отдаёт её манифест, файлы
+и полный ZIP; тесты считают запросы и байты, прошедшие по сети.
+"""
+import io
+import os
+import json
+import time
+import shutil
+import zipfile
+
+import pytest
+
+from conftest import ROOT, spin_until
+
+NEW_VERSION = "99.0.0"
+CHANGED     = "timer.py"
+
+
+def _copy_app(dst: str) -> None:
+    os.makedirs(dst)
+    for name in os.listdir(ROOT):
+        if name.endswith(".py"):
+            shutil.copy2(os.path.join(ROOT, name), dst)
+    for name in ("icons", "sounds"):
+        shutil.copytree(os.path.join(ROOT, name), os.path.join(dst, name))
+
+
+def _zip(root: str) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                z.write(path, os.path.relpath(path, root))
+    return buf.getvalue()
+
+
+class Update:
+    """Установленная версия (app_dir) и то, что сервер знает о новой."""
+
+    def __init__(self, standin, tmp_path):
+        from update_manifest import build_manifest
+        self.standin = standin
+        self.app_dir = str(tmp_path / "app")
+        new_dir      = str(tmp_path / "new")
+        _copy_app(self.app_dir)
+        _copy_app(new_dir)
+        with open(os.path.join(new_dir, CHANGED), "a", encoding="utf-8") as f:
+            f.write("\n# новая версия\n")
+
+        self.manifest = build_manifest(new_dir, NEW_VERSION)
+        self.manifest_route = standin.add("/manifest.json", json.dumps(self.manifest).encode("utf-8"),
+                                          etag='"m1"')
+        self.file_routes = {}
+        for rel in self.manifest["files"]:
+            with open(os.path.join(new_dir, *rel.split("/")), "rb") as f:
+                self.file_routes[rel] = standin.add("/files/" + rel, f.read())
+        self.zip_route = standin.add("/update.zip", _zip(new_dir), etag='"z1"')
+        self.new_dir = new_dir
+
+    @property
+    def file_bytes(self) -> int:
+        return sum(route.bytes_sent for route in self.file_routes.values())
+
+
+@pytest.fixture
+def update(standin, tmp_path, monkeypatch):
+    import update_checker
+    from update_checker import UpdateChecker
+    monkeypatch.setattr(update_checker, "UPDATE_DOWNLOAD_DIR", str(tmp_path / "download"))
+    monkeypatch.setattr(update_checker, "SERVER_UPDATE_URL", standin.url("/update.zip"))
+    env = Update(standin, tmp_path)
+    monkeypatch.setattr(UpdateChecker, "_app_dir", staticmethod(lambda: env.app_dir))
+    return env
+
+
+@pytest.fixture
+def make_checker(update):
+    """Создаёт UpdateChecker с заданными источниками; поток установки — до конца теста."""
+    from update_checker import UpdateChecker
+    made = []
+
+    def make(sources):
+        checker = UpdateChecker(sources=sources)
+        checker.result = {}
+        checker.update_downloaded.connect(lambda d: checker.result.update(installed=d))
+        checker.update_available.connect(lambda tag, url: checker.result.update(release=(tag, url)))
+        checker.update_failed.connect(lambda stage: checker.result.update(failed=stage))
+        made.append(checker)
+        return checker
+
+    yield make
+    for checker in made:
+        checker.shutdown()
+
+
+def _manifest_source(update, **kwargs):
+    from update_sources import ManifestSource
+    return ManifestSource(update.standin.url("/manifest.json"), **kwargs)
+
+
+def _run(checker, force: bool = False) -> dict:
+    checker.check_for_update(force=force)
+    assert spin_until(lambda: checker._stage is None, timeout_s=30)
+    return checker.result
+
+
+def _tree(root: str) -> dict:
+    from update_manifest import build_manifest
+    return build_manifest(root, "")["files"]
+
+
+# ──────────────────────────────────────────────────────────────
+#  дельта против полного ZIP
+# ──────────────────────────────────────────────────────────────
+def test_delta_downloads_only_the_changed_file(update, make_checker):
+    checker = make_checker([_manifest_source(update)])
+    result  = _run(checker)
+
+    assert "installed" in result, result
+    assert _tree(result["installed"]) == _tree(update.new_dir)
+    changed_size = update.manifest["files"][CHANGED]["size"]
+    assert [rel for rel, r in update.file_routes.items() if r.requests] == [CHANGED]
+    assert update.file_bytes == changed_size
+    assert update.zip_route.requests == []
+    assert checker.bytes_downloaded == update.manifest_route.bytes_sent + changed_size
+    assert checker.bytes_downloaded == update.standin.bytes_sent
+    assert checker.requests_sent == 2                       # манифест и один файл
+
+
+def test_delta_costs_a_fraction_of_full_zip(update, make_checker):
+    delta = make_checker([_manifest_source(update)])
+    assert "installed" in _run(delta)
+    delta_bytes = update.standin.bytes_sent
+
+    # манифест недоступен — та же новая версия полным архивом
+    update.standin.reset_counts()
+    update.manifest_route.status = 503
+    shutil.rmtree(os.path.join(update.app_dir, "versions"))
+    os.remove(os.path.join(update.app_dir, "current.json"))
+    full = make_checker([_manifest_source(update)])
+    result = _run(full)
+    assert "installed" in result, result
+    assert _tree(result["installed"]) == _tree(update.new_dir)
+    zip_bytes = update.standin.bytes_sent
+
+    assert update.zip_route.bytes_sent == update.zip_route.size
+    assert full.bytes_downloaded == update.zip_route.bytes_sent
+    print(f"\nдельта: {delta_bytes} байт, полный ZIP: {zip_bytes} байт "
+          f"({zip_bytes / delta_bytes:.0f}×)")
+    assert delta_bytes * 10 < zip_bytes
+
+
+# ──────────────────────────────────────────────────────────────
+#  условные запросы и задержка после неудач
+# ──────────────────────────────────────────────────────────────
+class WallClock:
+    """Настенные часы UpdateCache, которые двигает тест."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _with_cache(checker, clock=None, rand=None):
+    from update_cache import UpdateCache
+    checker._cache = UpdateCache(checker._cache.path, clock=clock or WallClock(),
+                                 rand=rand or (lambda: 1.0))
+    return checker
+
+
+def _github_source(update):
+    from update_sources import GitHubSource
+    return GitHubSource(update.standin.url("/releases/latest"))
+
+
+def _no_newer_version(update):
+    from constants import __version__
+    body = json.dumps(dict(update.manifest, version=__version__)).encode("utf-8")
+    update.manifest_route.body = body
+    release = json.dumps({"tag_name": f"v{__version__}", "html_url": "https://example.invalid/r"})
+    return update.standin.add("/releases/latest", release.encode("utf-8"), etag='"r1"')
+
+
+def test_unchanged_sources_cost_one_304_each(update, make_checker):
+    release = _no_newer_version(update)
+    update.manifest_route.delay = 0.05     # иначе ответ сервера решает гонку и GitHub отменяется
+    checks  = 5
+    checker = make_checker([_manifest_source(update), _github_source(update)])
+    for _ in range(checks):
+        assert _run(checker) == {}
+    # перезапуск приложения: валидаторы и тела ответов — из файла кэша
+    restarted = make_checker([_manifest_source(update), _github_source(update)])
+    assert _run(restarted) == {}
+
+    for route, etag in ((update.manifest_route, '"m1"'), (release, '"r1"')):
+        assert len(route.requests) == checks + 1
+        assert "If-None-Match" not in route.requests[0]
+        assert all(r.get("If-None-Match") == etag for r in route.requests[1:])
+        assert route.bytes_sent == route.size                # тело — один раз
+    assert checker.requests_sent == 2 * checks and restarted.requests_sent == 2
+    assert checker.bytes_downloaded == update.manifest_route.size + release.size
+    assert restarted.bytes_downloaded == 0
+    assert update.file_bytes == 0 and update.zip_route.requests == []
+
+
+def test_installed_zip_is_not_downloaded_again(update, make_checker):
+    update.manifest_route.status = 503
+    checker = make_checker([_manifest_source(update)])
+    assert "installed" in _run(checker, force=True)
+
+    checker.result = {}
+    assert _run(checker, force=True) == {}
+    assert [r.get("If-None-Match") for r in update.zip_route.requests] == [None, '"z1"']
+    assert update.zip_route.bytes_sent == update.zip_route.size
+    assert checker.bytes_downloaded == update.zip_route.size
+    assert checker.requests_sent == 4                        # манифест и ZIP, дважды
+
+
+def test_failing_server_backs_off_exponentially(update, make_checker):
+    from update_cache import UpdateCache
+    update.manifest_route.status = update.zip_route.status = 503
+    clock   = WallClock()
+    start   = clock.now
+    checker = _with_cache(make_checker([_manifest_source(update)]), clock)
+
+    # автоматическая проверка раз в минуту в течение двух часов
+    attempts = []
+    for t in range(0, 2 * 3600 + 1, 60):
+        clock.now = start + t
+        sent = checker.requests_sent
+        _run(checker)
+        if checker.requests_sent > sent:
+            attempts.append(t)
+    base = UpdateCache.BACKOFF_BASE_S
+    assert attempts == [0, base, 3 * base, 7 * base, 15 * base]     # задержки 1, 2, 4, 8 × base
+    assert len(update.manifest_route.requests) == len(update.zip_route.requests) == len(attempts)
+    assert checker.requests_sent == 2 * len(attempts)
+    assert checker.bytes_downloaded == 0
+
+    # ручная проверка задержку не ждёт
+    checker.result = {}
+    assert _run(checker, force=True) == {"failed": "server"}
+    assert len(update.manifest_route.requests) == len(attempts) + 1
+
+    # сервер ожил: после задержки — успех, и следующая проверка уже не ждёт
+    checker.result = {}
+    update.manifest_route.status = 200
+    _no_newer_version(update)
+    clock.now += UpdateCache.BACKOFF_MAX_S
+    assert _run(checker) == {}
+    clock.now += 60
+    sent = checker.requests_sent
+    _run(checker)
+    assert checker.requests_sent == sent + 1
+
+
+@pytest.mark.parametrize("rand, factor", [(0.0, 0.5), (0.5, 0.75), (1.0, 1.0)])
+def test_backoff_delay_is_jittered_and_capped(tmp_path, rand, factor):
+    from update_cache import UpdateCache
+    cache  = UpdateCache(str(tmp_path / "cache.json"), clock=WallClock(), rand=lambda: rand)
+    delays = [cache.record_failure("u") for _ in range(10)]
+    expected = [min(UpdateCache.BACKOFF_BASE_S * 2 ** n, UpdateCache.BACKOFF_MAX_S) * factor
+                for n in range(10)]
+    assert delays == pytest.approx(expected)
+
+
+# ──────────────────────────────────────────────────────────────
+#  выбор среди источников
+# ──────────────────────────────────────────────────────────────
+@pytest.fixture
+def github(qapp):
+    """Второй локальный сервер — заместитель GitHub API."""
+    from standin import StandInServer
+    server = StandInServer()
+    yield server
+    server.close()
+
+
+def _release(server, tag: str, delay: float):
+    body = json.dumps({"tag_name": tag, "html_url": f"https://example.invalid/{tag}"})
+    return server.add("/releases/latest", body.encode("utf-8"), delay=delay)
+
+
+def _race(checker) -> float:
+    """Проверка до решения гонки; секунды от запуска до решения."""
+    decided, accept, finished = [], checker._accept, checker._race_finished
+    checker._accept = lambda offer: (decided.append(time.perf_counter()), accept(offer))
+    checker._race_finished = lambda: (decided.append(time.perf_counter()), finished())
+    t0 = time.perf_counter()
+    _run(checker)
+    assert decided, checker.result
+    return decided[0] - t0
+
+
+def _sources(update, github, **kwargs):
+    from update_sources import GitHubSource
+    return [_manifest_source(update, **kwargs), GitHubSource(github.url("/releases/latest"))]
+
+
+def test_answer_from_top_source_settles_at_once(update, github, make_checker):
+    update.manifest_route.delay = 0.1
+    slow    = _release(github, "v99.1.0", delay=3.0)
+    sources = _sources(update, github)
+    checker = make_checker(sources)
+    elapsed = _race(checker)
+
+    assert "installed" in checker.result, checker.result
+    assert 0.1 <= elapsed < 0.1 + checker.GRACE_MS / 2000   # GitHub ниже по списку — не ждём
+    assert len(slow.requests) == 1 and slow.bytes_sent == 0
+    assert checker._cache.ready(sources[1].url)               # отмена — не неудача источника
+
+
+def test_up_to_date_top_source_settles_at_once(update, github, make_checker):
+    from update_checker import CURRENT_VERSION
+    update.manifest_route.body = json.dumps({**update.manifest, "version": CURRENT_VERSION}).encode("utf-8")
+    update.manifest_route.delay = 0.1
+    slow    = _release(github, "v99.1.0", delay=3.0)
+    checker = make_checker(_sources(update, github))
+    elapsed = _race(checker)
+
+    assert checker.result == {}
+    assert 0.1 <= elapsed < 0.1 + checker.GRACE_MS / 2000
+    assert slow.bytes_sent == 0 and update.file_bytes == 0 and update.zip_route.requests == []
+
+
+def test_higher_release_wins_once_top_source_answered(update, github, make_checker):
+    update.manifest_route.delay = 0.3
+    _release(github, "v99.1.0", delay=0.05)
+    checker = make_checker(_sources(update, github))
+    elapsed = _race(checker)
+
+    assert checker.result == {"release": ("v99.1.0", "https://example.invalid/v99.1.0")}
+    assert update.file_bytes == 0
+    assert 0.3 <= elapsed < 0.05 + checker.GRACE_MS / 1000    # сервер ответил — окно не дожидается
+
+
+def test_equal_versions_prefer_top_source(update, github, make_checker):
+    update.manifest_route.delay = 0.3
+    release = _release(github, f"v{NEW_VERSION}", delay=0.05)
+    checker = make_checker(_sources(update, github))
+    elapsed = _race(checker)
+
+    assert "installed" in checker.result, checker.result
+    assert release.bytes_sent == release.size                # GitHub ответил первым
+    assert update.file_bytes == update.manifest["files"][CHANGED]["size"]
+    assert 0.3 <= elapsed < 0.05 + checker.GRACE_MS / 1000
+
+
+def test_slow_top_source_is_awaited_only_for_grace_window(update, github, make_checker, monkeypatch):
+    from update_checker import UpdateChecker
+    monkeypatch.setattr(UpdateChecker, "GRACE_MS", 200)
+    update.manifest_route.delay = 3.0
+    _release(github, "v99.1.0", delay=0.3)                  # первый ответ — позже GRACE_MS от запуска
+    sources = _sources(update, github, timeout_ms=8000)
+    checker = make_checker(sources)
+    answered, reply = [], checker._on_source_reply
+    checker._on_source_reply = lambda *args: (answered.append(time.perf_counter()), reply(*args))
+    decided, accept = [], checker._accept
+    checker._accept = lambda offer: (decided.append(time.perf_counter()), accept(offer))
+    _run(checker)
+
+    assert checker.result == {"release": ("v99.1.0", "https://example.invalid/v99.1.0")}
+    assert update.manifest_route.bytes_sent == 0
+    # окно — от первого ответа, а не от запуска проверки (тогда решение было бы сразу)
+    waited = decided[0] - answered[0]
+    assert checker.GRACE_MS / 1000 - 0.001 <= waited < checker.GRACE_MS / 1000 + 0.3, waited
+    assert checker._cache.ready(sources[0].url)               # отмена — не неудача источника
@@ -0,0 +1,129 @@
+# tests/test_update_download.py
+"""
+StreamingDownload против локального сервера (tests/standin.py): архив
+в ARCHIVE_MB мегабайт (XTIMER_TEST_ARCHIVE_MB, по умолчанию 200) качается
+с ограниченной памятью, обрыв докачивается запросом Range, а хэш уже
+скачанной части при докачке досчитывается вне GUI-потока.
+"""
+import os
+import time
+import hashlib
+
+import pytest
+
+from conftest import spin_until
+
+ARCHIVE_MB  = int(os.environ.get("XTIMER_TEST_ARCHIVE_MB", "200"))
+RSS_GROWTH  = 64 * 2**20          # допустимый рост RSS за загрузку
+ETAG        = '"v2"'
+
+
+@pytest.fixture(scope="module")
+def archive(tmp_path_factory):
+    """Файл ARCHIVE_MB МБ с неповторяющимися кусками и его SHA-256."""
+    path = tmp_path_factory.mktemp("archive") / "update.zip"
+    digest = hashlib.sha256()
+    block = os.urandom(1 << 20)
+    with open(path, "wb") as f:
+        for i in range(ARCHIVE_MB):
+            chunk = i.to_bytes(8, "little") + block[8:]
+            f.write(chunk)
+            digest.update(chunk)
+    return str(path), digest.hexdigest()
+
+
+def _rss() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _download(standin, path: str, dest: str, sha: str):
+    from PyQt5 import QtCore, QtNetwork
+    from update_download import StreamingDownload
+    mgr = QtNetwork.QNetworkAccessManager()
+    dl = StreamingDownload(mgr, QtCore.QUrl(standin.url(path)), dest, sha)
+    dl._mgr_ref = mgr                    # менеджер живёт, пока живёт загрузка
+    result = {}
+    dl.finished.connect(lambda p, d: result.update(path=p, sha=d))
+    dl.failed.connect(lambda reason: result.update(error=reason))
+    return dl, result
+
+
+def test_large_download_keeps_memory_bounded(standin, archive, tmp_path):
+    src, sha = archive
+    standin.add("/update.zip", file=src, etag=ETAG)
+    dl, result = _download(standin, "/update.zip", str(tmp_path / "update.zip"), sha)
+
+    base = _rss()
+    peak = [base or 0]
+    dl.progress.connect(lambda got, total: peak.__setitem__(0, max(peak[0], _rss() or 0)))
+    dl.start()
+    assert spin_until(lambda: result, timeout_s=120)
+
+    assert result.get("sha") == sha, result
+    assert os.path.getsize(result["path"]) == ARCHIVE_MB << 20
+    assert not os.path.exists(result["path"] + ".part")
+    if base is not None:
+        assert peak[0] - base < RSS_GROWTH, f"RSS вырос на {(peak[0] - base) >> 20} МБ"
+
+
+def test_dropped_connection_resumes_with_range(standin, tmp_path, monkeypatch):
+    from update_download import StreamingDownload
+    monkeypatch.setattr(StreamingDownload, "RETRY_DELAY_MS", 10)
+    body = os.urandom(3 << 20)
+    route = standin.add("/update.zip", body, etag=ETAG, drop_after=1 << 20)
+    dl, result = _download(standin, "/update.zip", str(tmp_path / "update.zip"),
+                           hashlib.sha256(body).hexdigest())
+    dl.start()
+    assert spin_until(lambda: result)
+
+    assert "sha" in result, result
+    assert len(route.requests) == 2
+    resumed_at = int(route.requests[1]["Range"][len("bytes="):-1])
+    assert 0 < resumed_at <= 1 << 20
+    assert route.requests[1]["If-Range"] == ETAG
+    assert route.bytes_sent == len(body) + (1 << 20) - resumed_at
+
+
+def test_resume_rehashes_part_off_gui_thread(standin, archive, tmp_path):
+    src, sha = archive
+    route = standin.add("/update.zip", file=src, etag=ETAG)
+    dest = str(tmp_path / "update.zip")
+    half = (ARCHIVE_MB // 2) << 20
+    with open(src, "rb") as f, open(dest + ".part", "wb") as part:
+        part.write(f.read(half))
+    with open(dest + ".part.validator", "w", encoding="utf-8") as f:
+        f.write(ETAG)
+
+    dl, result = _download(standin, "/update.zip", dest, sha)
+    t0 = time.perf_counter()
+    dl.start()
+    start_ms = (time.perf_counter() - t0) * 1000
+    assert dl._hasher is not None and dl.is_running()
+    assert route.requests == []                      # Range — после хэша
+    assert start_ms < 50, f"start() занял {start_ms:.0f} мс"
+
+    assert spin_until(lambda: result, timeout_s=120)
+    assert result.get("sha") == sha, result
+    assert route.requests[0]["Range"] == f"bytes={half}-"
+    assert dl.bytes_received == (ARCHIVE_MB << 20) - half
+
+
+def test_abort_while_hashing_sends_nothing(standin, archive, tmp_path):
+    src, sha = archive
+    route = standin.add("/update.zip", file=src, etag=ETAG)
+    dest = str(tmp_path / "update.zip")
+    with open(src, "rb") as f, open(dest + ".part", "wb") as part:
+        part.write(f.read(ARCHIVE_MB << 19))
+    with open(dest + ".part.validator", "w", encoding="utf-8") as f:
+        f.write(ETAG)
+
+    dl, result = _download(standin, "/update.zip", dest, sha)
+    dl.start()
+    dl.abort()
+    assert not dl.is_running()
+    spin_until(lambda: False, timeout_s=0.2)
+    assert route.requests == [] and result == {}
@@ -1,10 +1,9 @@
 from utils import load_presets
-import sys, time, math, ctypes, os
+import sys, time, math, ctypes, os, itertools
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtGui import QPainter, QPixmap, QColor, QIcon, QFontDatabase, QDesktopServices, QIcon
 from PyQt5.QtWidgets import QStyle, QSizePolicy, QSystemTrayIcon, QMenu, QAction, QApplication
 from PyQt5.QtCore import QPropertyAnimation, QAbstractAnimation, QRect, Qt, QTimer, QUrl
-from PyQt5.QtMultimedia import QSound
 from winapi import (
     taskbar_rect_edge, SetWindowPos, HWND_TOPMOST,
     SWP_NOMOVE, SWP_NOSIZE, SWP_NOACTIVATE,
@@ -12,37 +11,48 @@ from winapi import (
     SM_CXSCREEN, SM_CYSCREEN,
     HWND_NOTOPMOST,
 )
-from dialogs import SettingsDialog
+from dialogs import SettingsDialog, StatsOverlay, cached_icon
 from menu    import TimerMenu
+from glyph_atlas import GlyphAtlas
+from timer_core import NS
+from timer_engine_qt import QtTimerEngine
+from frame_clock import FrameClock
+from settings_store import SettingsStore
+from alarm import AlarmPlayer
 from constants import SETTINGS_ICON, TRAY_ICON
 from logging_config import log_exceptions
 from update_checker import UpdateChecker
+from app_versions import launcher_path
+import instrumentation
 import logging
 
 class TaskbarTimer(QtWidgets.QMainWindow):
     MIN_LEN, WIDTH_RATIO = 70, 0.09
+    _ids = itertools.count(1)           # id окон в общем движке таймеров
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        icon_path = SETTINGS_ICON
-        self.setWindowIcon(QIcon(icon_path))
+        self.setWindowIcon(cached_icon(SETTINGS_ICON))
         
         self.setWindowFlags(
             QtCore.Qt.FramelessWindowHint |
             QtCore.Qt.WindowStaysOnTopHint |
             QtCore.Qt.Tool
         )
-        app = QtWidgets.QApplication.instance()
-        app.applicationStateChanged.connect(
-            lambda _state: QtCore.QTimer.singleShot(0, self._force_topmost)
-        )
+        # связанный метод, а не lambda: соединение снимается вместе с окном
+        QtWidgets.QApplication.instance().applicationStateChanged.connect(self._on_app_state_changed)
         self._base_style = ""
         self._always_on_top = False
-        # — состояние таймера —
-        self.duration   = 0.0
-        self.start_time = 0.0
-        self.elapsed    = 0.0
-        self.running    = False
+        # — состояние таймера: Qt-free ядро на целых наносекундах в общем
+        #   движке — финиши всех окон будит один будильник —
+        engine = QtTimerEngine.instance()
+        self._timers   = engine.engine
+        self._timer_id = f"window-{next(self._ids)}"
+        self.core = self._timers.add(self._timer_id, 0, start=False)
+        engine.finished.connect(self._on_timer_finished)
+        self.destroyed.connect(lambda _=None, t=self._timers, i=self._timer_id: t.cancel(i))
+        # — звук окончания: загружается заранее, при применении настроек —
+        self._alarm = AlarmPlayer(self)
 
         self.time_font_family = "Arial"
         # Размер шрифта (по умолчанию)
@@ -50,9 +60,10 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         self._count_direction = "up"
         
         # — параметры «мигания» по завершении —
+        self.blink_enabled      = False
         self.blink_min_width    = 2
         self.blink_max_width    = 8
-        self.blink_start_time   = None
+        self.blink_start_ns     = None   # момент финиша по часам ядра
         self.blink_pulse_freq   = 2.0     # Гц
         self.blink_border_width = 2
 
@@ -65,6 +76,7 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         # — вспомогательные окна —
         self.dialog = None
         self.menu   = None
+        self._presets = []
 
         # — drag’n’drop —
         self._drag = False
@@ -74,20 +86,22 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         self._place_horizontal()
         self._snap_and_orient()
 
-        # — два QTimer’а: UI (~30 FPS) и логика (~5 FPS) —
-        # внутри TaskbarTimer.__init__:
-        self._ui_timer    = QtCore.QTimer(self, timeout=self.update)
-        self._ui_timer.start(33)   # ~30 FPS для перерисовки (метод paintEvent)
-        self._logic_timer = QtCore.QTimer(self, timeout=self._tick)
-        self._logic_timer.start(26) # ~5 FPS для логики таймера (__tick)
+        # — «тики» планируются через общие FrameClock на ближайший момент, когда
+        # что-то меняется (граница секунды, пиксель прогресс-бара, финиш, кадр
+        # мигания); на паузе и в простое окно отписано → ноль пробуждений.
         
+        # сторож «поверх всех»: идёт, только пока включено always_on_top
+        # (см. _apply_window_flags_setting)
         self._stay_top_timer = QtCore.QTimer(self, timeout=self._force_topmost)
-        # интервал, который вам нужен
-        self._stay_top_timer.setInterval(3000) 
+        self._stay_top_timer.setInterval(3000)
+
+        # атлас заранее отрисованных глифов надписи (см. _glyph_atlas)
+        self._atlas = None
 
-        # кэш метрики tightBoundingRect для текста времени
-        self._prev_label  = ""
-        self._tight_cache = QtCore.QRect()
+        # что было нарисовано в последнем кадре (для частичной перерисовки)
+        self._shown_border = None
+        self._shown_fill   = QRect()
+        self._shown_label  = None
         logging.getLogger(__name__).debug("BASE_DIR     = %r", os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else os.path.dirname(__file__))
         logging.getLogger(__name__).debug("TRAY_ICON    = %r", TRAY_ICON)
         logging.getLogger(__name__).debug("Icon exists? = %s", os.path.exists(TRAY_ICON))
@@ -129,6 +143,11 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         settings_action = QAction("Настройки", self)
         settings_action.triggered.connect(self._open_settings)
         tray_menu.addAction(settings_action)
+
+        # Пункт «Статистика» — гистограммы таймингов (instrumentation)
+        stats_action = QAction("Статистика…", self)
+        stats_action.triggered.connect(self._open_stats)
+        tray_menu.addAction(stats_action)
         # Разделитель
         tray_menu.addSeparator()
 
@@ -149,13 +168,13 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         
         self._hide_from_taskbar()
         self.apply_settings()
+        # дальше — только изменившиеся настройки (см. _SETTING_ACTIONS)
+        SettingsStore.instance().batch_changed.connect(self.apply_settings)
         self.show()
-        QtWidgets.QApplication.instance().applicationStateChanged.connect(
-            lambda _state: QtCore.QTimer.singleShot(0, self._force_topmost)
-        )
-        self._stay_top_timer = QtCore.QTimer(self, timeout=self._force_topmost)
-        self._stay_top_timer.start(3000)
-    
+
+    def _on_app_state_changed(self, _state) -> None:
+        QtCore.QTimer.singleShot(0, self._force_topmost)
+
     def _toggle_visibility(self) -> None:
         """
         • Если таймер полностью видим и НЕ свёрнут → прячем (`hide`).
@@ -178,42 +197,76 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         self.activateWindow()
         self._force_topmost()
         
+    def _open_stats(self):
+        if getattr(self, "stats_overlay", None) is None:
+            self.stats_overlay = StatsOverlay()
+        self.stats_overlay.show()
+        self.stats_overlay.raise_()
+
     def _open_settings(self):
+        """
+        Окно настроек одно на всё время работы: создаётся при первом открытии
+        (вместе с соединениями — один раз), закрытие его только прячет,
+        а перед показом поля заново заполняются из хранилища.
+        """
+        dialog = getattr(self, "settings_dialog", None)
         # если уже открыто – поднимаем
-        if hasattr(self, "settings_dialog") and self.settings_dialog.isVisible():
-            self.settings_dialog.raise_()
+        if dialog is not None and dialog.isVisible():
+            dialog.raise_()
             return
 
-        # СОЗДАЁМ БЕЗ РОДИТЕЛЯ  ↓
-        self.settings_dialog = SettingsDialog()
-
-        # подписываемся на сигнал
-        self.settings_dialog.settings_changed.connect(self.apply_settings)
-
-        self.settings_dialog.check_updates.connect(self._do_autoupdate)
+        if dialog is None:
+            # СОЗДАЁМ БЕЗ РОДИТЕЛЯ  ↓
+            dialog = self.settings_dialog = SettingsDialog()
+            dialog.check_updates.connect(self._do_manual_update)
+            # чтобы обновить статус кнопки в диалоге по результатам
+            self._update_checker.update_available.connect(dialog.on_update_available)
+            self._update_checker.update_downloaded.connect(dialog.on_update_downloaded)
+            self._update_checker.update_failed.connect(dialog.on_update_failed)
+        else:
+            dialog.reload()
 
-        # чтобы обновить статус кнопки в диалоге по результатам
-        self._update_checker.update_available.connect(
-            lambda tag, url: self.settings_dialog.lbl_update_status.setText(f"Найдена версия {tag}")
-        )
-        self._update_checker.update_downloaded.connect(
-            lambda _:        self.settings_dialog.lbl_update_status.setText("Обновление установлено")
-        )
-        self._update_checker.update_failed.connect(
-            lambda stage:    self.settings_dialog.lbl_update_status.setText(f"Ошибка: {stage} и сервер проекта недоступен")
-        )
         # позиционируем (центр экрана)
-        self._position_dialog(self.settings_dialog)
-
-        self.settings_dialog.show()
-
-
-
-    def apply_settings(self):
-        settings = QtCore.QSettings("MyCompany", "TaskbarTimer")
+        self._position_dialog(dialog)
+
+        dialog.show()
+
+    # настройка → самое узкое действие, которое нужно для её применения
+    # (порядок словаря = порядок действий при полном применении)
+    _SETTING_ACTIONS = {
+        "always_on_top":    "_apply_window_flags_setting",   # пересоздаёт нативное окно
+        "minimize_to_tray": "_apply_tray_setting",
+        "auto_start":       "_apply_behavior_settings",
+        "sound_enabled":    "_apply_behavior_settings",
+        "sound_file":       "_apply_behavior_settings",
+        "theme":            "_apply_theme_setting",          # re-polish стилей
+        "progress_color":   "_apply_look_settings",          # только перерисовка
+        "font":             "_apply_look_settings",          # атлас глифов по ключу
+        "font_size":        "_apply_look_settings",
+        "count_direction":  "_apply_look_settings",
+        "blink_enabled":    "_apply_look_settings",
+        "blink_freq":       "_apply_look_settings",
+        "presets":          "_apply_presets_setting",        # точечно кнопки меню
+        "auto_update":      "_apply_autoupdate_settings",
+        "update_interval":  "_apply_autoupdate_settings",
+    }
+
+    def apply_settings(self, changed=None):
+        """
+        Применяет настройки из SettingsStore. changed — set изменившихся
+        настроек (из SettingsStore.batch_changed): выполняются только нужные
+        им действия, без изменений — ничего. None — применить всё (старт).
+        """
+        keys    = self._SETTING_ACTIONS if changed is None else changed
+        actions = dict.fromkeys(
+            self._SETTING_ACTIONS[k] for k in self._SETTING_ACTIONS if k in keys
+        )
+        for action in actions:
+            getattr(self, action)(SettingsStore.instance())
 
+    def _apply_window_flags_setting(self, settings):
         # 1) чекбокс «Всегда поверх окон»
-        always_on_top = settings.value("timer/always_on_top", False, type=bool)
+        always_on_top = settings.always_on_top
         self._always_on_top = always_on_top         # ← запоминаем
 
         # запустить / остановить сторож-таймер
@@ -223,91 +276,80 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         else:
             self._stay_top_timer.stop()
 
-        # применяем флаги окна (без show!)
+        # setWindowFlags пересоздаёт нативное окно и прячет его —
+        # возвращаем видимость и «невидимость» в панели задач
+        was_visible = self.isVisible()
         self._apply_window_flags(always_on_top)
+        self._hide_from_taskbar()
+        if was_visible:
+            self.show()
 
         # ↓ один вызов, чтобы сразу выставить нужный уровень TOPMOST/NOTOPMOST
         self._force_topmost()
 
+    def _apply_tray_setting(self, settings):
         # 2) Флаг «Сворачивать в трей при старте»
-        self.minimize_to_tray = settings.value("timer/minimize_to_tray", False, type=bool)
+        self.minimize_to_tray = settings.minimize_to_tray
         if self.minimize_to_tray:
             self.hide()
         else:
             self.show()
-            
-        # 3) Флаг «Автостарт при добавлении времени»
-        self.auto_start_on_add = settings.value("timer/auto_start", False, type=bool)
 
-        self._count_direction = QtCore.QSettings("MyCompany", "TaskbarTimer") \
-            .value("timer/count_direction", "up", type=str)
+    def _apply_behavior_settings(self, settings):
+        # 3) Флаг «Автостарт при добавлении времени»
+        self.auto_start_on_add = settings.auto_start
 
-        # === Внешний вид ===
+        # 7) Включён ли звук при окончании и путь к файлу звука —
+        # файл проверяется и декодируется сейчас, а не в момент финиша
+        self.sound_enabled = settings.sound_enabled
+        self.sound_file    = settings.sound_file
+        self._alarm.load(self.sound_file if self.sound_enabled else "")
 
-        # 4) Тема: «system», «light» или «dark»
-        theme = settings.value("appearance/theme", "dark")
+    def _apply_theme_setting(self, settings):
+        # 4) Тема: «light» или «dark»
+        theme = settings.theme
         self._theme = theme
         if theme == "dark":
             # устанавливаем только фон окна таймера (белая рамка/текст будет рисоваться вручную в paintEvent)
             self.setStyleSheet(self._base_style + "background:#202020;")
         elif theme == "light":
             self.setStyleSheet(self._base_style + "background:#FFFFFF;")
+        self._invalidate_frame()
 
-        # 5) Цвет прогресс-бара (он остаётся без изменений)
-        color = settings.value("appearance/progress_color", "#55FF55")
-        self.progress_color = QtGui.QColor(color)
-        
-        font_family = settings.value("appearance/font", self.time_font_family, type=str)
-        if font_family:
-            self.time_font_family = font_family
-        # ... и далее остальные настройки (звук, пресеты и т.д.) ...
-        font_family = settings.value("appearance/font", self.time_font_family, type=str)
-        font_size   = settings.value("appearance/font_size", self.time_font_size, type=int)
-        if font_family:
-            self.time_font_family = font_family
-        if font_size:
-            self.time_font_size = font_size
-
-        # === Оповещения ===
-
-        # 6) Включён ли звук при окончании
-        self.sound_enabled = settings.value("alerts/sound_enabled", False, type=bool)
+    def _apply_look_settings(self, settings):
+        # 5) Цвет прогресс-бара
+        self.progress_color = QtGui.QColor(settings.progress_color)
 
-        # 7) Путь к файлу звука
-        self.sound_file = settings.value("alerts/sound_file", "", type=str)
+        # 6) Шрифт и размер надписи (атлас глифов перестроится сам по ключу)
+        self.time_font_family = settings.font
+        self.time_font_size   = settings.font_size
 
-        # 8) Включено ли мигание рамки при окончании
-        self.blink_enabled = settings.value("alerts/blink_enabled", False, type=bool)
+        self._count_direction = settings.count_direction
 
+        # 9) Мигание рамки при окончании и его частота (в герцах)
+        self.blink_enabled = settings.blink_enabled
         if not self.blink_enabled:
-            self.blink_start_time = None
-        # 9) Частота мигания (в герцах)
-        self.blink_pulse_freq = settings.value("alerts/blink_freq", 2.0, type=float)
+            self.blink_start_ns = None
+        self.blink_pulse_freq = settings.blink_freq
 
-        # === Пресеты кнопок быстрого добавления времени ===
-
-        presets = load_presets()
-
-        # Пересоздаём TimerMenu с новыми пресетами
-        if hasattr(self, "menu") and self.menu:
-            self.menu.close()
-            self.menu.deleteLater()
-            self.menu = None
-
-        self.menu = TimerMenu(self, presets=presets)
-        self.menu.add_time.connect(self._add_duration)
-        self.menu.start_pause.connect(self._toggle_start_pause)
-        self.menu.reset_signal.connect(self._reset_timer)
-        self.menu.custom_time.connect(self._open_dialog)
+        self._invalidate_frame()
+        self._schedule_tick()
 
-        # === Автообновление ===
+    def _apply_presets_setting(self, settings):
+        # === Пресеты кнопок быстрого добавления времени ===
+        # Список читаем здесь, а не на каждый ПКМ; меню лишь «докручивает»
+        # изменившиеся кнопки (или строится фоном после старта — см. _ensure_menu)
+        self._presets = load_presets()
+        if self.menu:
+            self.menu.set_presets(self._presets)
+        else:
+            QtCore.QTimer.singleShot(0, self._ensure_menu)
 
-        # 12) Флаг «Включить автообновление»
-        autoupd = settings.value("general/auto_update_enabled", False, type=bool)
+    def _apply_autoupdate_settings(self, settings):
+        # 12) Флаг «Включить автообновление» и 13) интервал проверки (в минутах)
+        autoupd  = settings.auto_update
+        interval = settings.update_interval
 
-        # 13) Интервал проверки (в минутах)
-        interval = settings.value("general/update_interval", 10080, type=int)
-    
         if autoupd:
             if not hasattr(self, "_autoupd_timer"):
                 self._autoupd_timer = QtCore.QTimer(self)
@@ -317,7 +359,6 @@ class TaskbarTimer(QtWidgets.QMainWindow):
             if hasattr(self, "_autoupd_timer"):
                 self._autoupd_timer.stop()
 
-        
     def on_tray_icon_activated(self, reason):
         """
         Обработка кликов по иконке.
@@ -408,6 +449,8 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         self.setGeometry(x, y, self.W, self.H)
         self._force_topmost()
         self._close_menu()
+        self._invalidate_frame()
+        self._schedule_tick()
 
     def _force_topmost(self):
         """Поднимает или опускает окно в TOPMOST-группе по флагу self._always_on_top."""
@@ -454,47 +497,38 @@ class TaskbarTimer(QtWidgets.QMainWindow):
     # ──────────────────────────────────────────────────────────────
     #  меню  +  диалог
     # ──────────────────────────────────────────────────────────────
+    def _ensure_menu(self) -> TimerMenu:
+        """Единственный экземпляр TimerMenu: строится один раз и переиспользуется."""
+        if self.menu is None:
+            self.menu = TimerMenu(self, presets=self._presets)
+            self.menu.add_time.connect(self._add_duration)
+            self.menu.start_pause.connect(self._toggle_start_pause)
+            self.menu.reset_signal.connect(self._reset_timer)
+            self.menu.custom_time.connect(self._open_settings)
+            self.menu.reflect_state(self.running)
+        return self.menu
+
     def _open_menu(self):
         """
         Открываем меню с кнопками добавления времени.
-        Берём список пресетов из QSettings (как в apply_settings()).
+        Меню уже построено (и пресеты в нём актуальны после apply_settings()) —
+        остаётся подогнать размер, поставить рядом с таймером и показать.
         """
-        presets = load_presets()
-
-        # Пересоздаём меню
-        if hasattr(self, "menu") and self.menu:
-            self.menu.close()
-            self.menu.deleteLater()
-            self.menu = None
+        menu = self._ensure_menu()
 
-        self.menu = TimerMenu(self, presets=presets)
-
-        # -------------- ЭТОТ БЛОК ЗАМЕНИТЕ --------------
         if self.orientation in ("horizontal", "top", "bottom"):
             # таймер широкий → меню такой же ширины
-            self.menu.setFixedWidth(self.width())
+            menu.setFixedWidth(self.width())
         else:
             # таймер узкий вертикальный → «натуральная» ширина меню
-            self.menu.adjustSize()
+            menu.setMinimumWidth(0)
+            menu.setMaximumWidth(QtWidgets.QWIDGETSIZE_MAX)
+            menu.adjustSize()
         # затем в любом случае:
         self._position_menu()
 
-        # сигналы – без изменений
-        self.menu.add_time.connect(self._add_duration)
-        self.menu.start_pause.connect(self._toggle_start_pause)
-        self.menu.reset_signal.connect(self._reset_timer)
-        self.menu.custom_time.connect(self._open_settings)
-        
-        self.menu.reflect_state(self.running)
-
-        self.menu.setWindowOpacity(0.0)
-        self.menu.show()
-        anim = QPropertyAnimation(self.menu, b"windowOpacity", self)
-        anim.setDuration(200)
-        anim.setStartValue(0.0)
-        anim.setEndValue(1.0)
-        anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
-        anim.start(QAbstractAnimation.DeleteWhenStopped)
+        menu.reflect_state(self.running)
+        menu.fade_in()
 
     # обязательно после show() !
         self._position_menu()
@@ -502,13 +536,7 @@ class TaskbarTimer(QtWidgets.QMainWindow):
     def _close_menu(self):
         if not (self.menu and self.menu.isVisible()):
             return
-        anim = QPropertyAnimation(self.menu, b"windowOpacity", self)
-        anim.setDuration(200)
-        anim.setStartValue(self.menu.windowOpacity())
-        anim.setEndValue(0.0)
-        anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
-        anim.finished.connect(self.menu.close)
-        anim.start(QAbstractAnimation.DeleteWhenStopped)
+        self.menu.fade_out()
 
     # timer.py  ─ метод _position_menu --------------------------------
     # файл: timer.py  ── метод _position_menu
@@ -581,8 +609,11 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         from dialogs import SettingsDialog
         if isinstance(child, SettingsDialog):
             scr = QtWidgets.QApplication.primaryScreen().geometry()
-            dw  = child.sizeHint().width()
-            dh  = child.sizeHint().height()
+            # размер, который окно получит (вкладки строятся при первом
+            # показе — sizeHint растёт по мере их построения)
+            size = child.sizeHint().expandedTo(child.minimumSize()).boundedTo(child.maximumSize())
+            dw  = size.width()
+            dh  = size.height()
             cx  = scr.x() + (scr.width()  - dw) // 2
             cy  = scr.y() + (scr.height() - dh) // 2
             child.move(cx, cy)
@@ -663,21 +694,35 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         super().mouseReleaseEvent(e)
     
     def hideEvent(self, event: QtGui.QHideEvent) -> None:
-        # При скрытии окна останавливаем только UI-таймер
-        self._ui_timer.stop()
+        # Скрытое окно рисовать не нужно — будим себя только к финишу
         super().hideEvent(event)
+        self._schedule_tick()
 
     def showEvent(self, event: QtGui.QShowEvent) -> None:
-        # При показе – снова запускаем UI-таймер (~30 FPS)
-        self._ui_timer.start(33)
+        # При показе — снова планируем кадры надписи/прогресса/мигания
         super().showEvent(event)
+        self._schedule_tick()
     # ──────────────────────────────────────────────────────────────
     #  управление временем
     # ──────────────────────────────────────────────────────────────
+    @property
+    def running(self) -> bool:
+        return self.core.running
+
+    @property
+    def duration(self) -> float:
+        """Длительность в секундах (для отображения; источник истины — self.core)."""
+        return self.core.duration_ns / NS
+
+    @property
+    def elapsed(self) -> float:
+        """Прошедшее время в секундах на момент последнего тика."""
+        return self.core.elapsed_ns / NS
+
     @log_exceptions
     def _add_duration(self, secs: int):
-        self.duration += secs
-        self.blink_start_time = None
+        self._timers.add(self._timer_id, secs, start=False)
+        self.blink_start_ns = None
 
         if self.auto_start_on_add:
             if not self.running:
@@ -691,79 +736,146 @@ class TaskbarTimer(QtWidgets.QMainWindow):
             self.menu.reflect_state(self.running)
 
         self.update()
+        self._schedule_tick()
 
 
     def _set_duration(self, secs: int):
-        self.duration = secs
-        self.elapsed  = 0.0
-        self.running  = False
-        self.blink_start_time = None
+        self._timers.set(self._timer_id, secs)
+        self.blink_start_ns = None
         self.update()
+        self._schedule_tick()
 
     def _toggle_start_pause(self):
-        if not self.duration:
+        if not self._timers.toggle(self._timer_id):
             return
-        if not self.running:
-            self.start_time = time.monotonic() - self.elapsed
-            self.running    = True
-        else:
-            self.running    = False
+        if self.running and self.sound_enabled:
+            # файл звука могли подменить — перечитаем сейчас, а не на финише
+            self._alarm.refresh()
         if self.menu:
             self.menu.reflect_state(self.running)
+        self._schedule_tick()
         if self.running and getattr(self, "minimize_to_tray", False):
             self.hide()
                 
     @log_exceptions
     def _reset_timer(self):
-        self.duration = self.elapsed = 0.0
-        self.running  = False
-        self.blink_start_time = None
+        self._timers.reset(self._timer_id)
+        self.blink_start_ns = None
         self.update()
+        self._schedule_tick()
         if self.menu:
             self.menu.reflect_state(self.running)
 
     # ──────────────────────────────────────────────────────────────
     #  «тик» логики и перерисовка
     # ──────────────────────────────────────────────────────────────
-    @log_exceptions
     def _tick(self):
+        # без @log_exceptions: вызывается на каждом кадре из FrameClock;
+        # исключение логирует install_exception_guard
         # … (логика скрытия/показа окна в зависимости от фуллскрина) …
-        if self.running:
-            self.elapsed = min(time.monotonic() - self.start_time, self.duration)
-            if self.elapsed >= self.duration:
-                # проигрываем звук при окончании, если включено
-                if self.sound_enabled and self.sound_file:
-                    if os.path.isfile(self.sound_file):
-                        ext = os.path.splitext(self.sound_file)[1].lower()
-                        if ext == ".wav":
-                            QSound.play(self.sound_file)
-                        else:
-                            logging.getLogger(__name__).warning(
-                                "Неподдерживаемый формат звука %s — используйте WAV", self.sound_file
-                            )
-                    else:
-                        logging.getLogger(__name__).warning(
-                            "Звуковой файл не найден: %s", self.sound_file
-                        )
-
-                self.running = False
-                # Запускаем мигание только если пользователь включил его в настройках
-                if self.blink_enabled:
-                    self.blink_start_time = time.monotonic()
-                if self.menu:
-                    self.menu.reflect_state(self.running)
+        if self.core.tick():
+            # кадр опоздал за финиш раньше будильника движка
+            self._finish()
+        self._update_dirty()
+        self._schedule_tick()
+
+    @log_exceptions
+    def _on_timer_finished(self, timer_id: str):
+        # сигнал общего движка — приходит всем окнам, наш только один id
+        if timer_id != self._timer_id:
+            return
+        self._finish()
+        self._update_dirty()
+        self._schedule_tick()
+
+    def _finish(self) -> None:
+        """Отсчёт дошёл до конца (ядро уже остановлено): звук, мигание, меню."""
+        finish_ns = self.core.start_ns + self.core.duration_ns
+        if instrumentation.enabled:
+            instrumentation.record("finish_delay", self.core.now() - finish_ns)
+        # проигрываем звук при окончании, если включено (уже загружен)
+        if self.sound_enabled:
+            self._alarm.play(finish_ns)
+
+        # Запускаем мигание только если пользователь включил его в настройках
+        if self.blink_enabled:
+            self.blink_start_ns = self.core.now()
+        if self.menu:
+            self.menu.reflect_state(self.running)
+
+    def _next_tick_deadlines(self) -> tuple[int | None, int | None]:
+        """
+        Ближайшие моменты (по часам ядра), когда может что-то измениться:
+        (финиш — точно, следующий кадр — с точностью до кадра). Кадр нужен на
+        границе секунды в надписи, на следующем пикселе прогресс-бара и для
+        мигания рамки — только пока окно видно и не свёрнуто. None — не нужно.
+        """
+        core    = self.core
+        now     = core.now()
+        visible = self.isVisible() and not self.isMinimized()
+        finish  = None
+        frames  = []
+
+        if core.running:
+            dur    = core.duration_ns
+            el     = now - core.start_ns
+            finish = core.start_ns + dur
+
+            if visible:
+                # надпись: up меняется на целых секундах el, down — на целых (dur - el)
+                phase = el - dur if self._count_direction == "down" else el
+                frames.append(now + NS - phase % NS)
+
+                # прогресс-бар: один пиксель полосы = dur / длина полосы
+                if self.orientation in ("horizontal", "top", "bottom"):
+                    length = self.W - 4
+                else:
+                    length = self.H - 4
+                if length > 0:
+                    step = dur / length
+                    frames.append(core.start_ns + math.ceil((math.floor(el / step) + 1) * step))
+
+        if visible and self.blink_enabled and self.blink_start_ns is not None:
+            frames.append(now + 1)                           # просто следующий кадр
+
+        return finish, (min(frames) if frames else None)
+
+    def _schedule_tick(self) -> None:
+        """
+        Просит общие FrameClock разбудить окно к следующему кадру; если
+        кадр не нужен — отписывается (ноль пробуждений). Финиш будит общий
+        движок таймеров (_on_timer_finished), поэтому кадр сравнивается с
+        финишем уже округлённым до сетки кадров — кадр в том же слоте или
+        позже был бы лишним пробуждением.
+        """
+        finish, frame = self._next_tick_deadlines()
+        clock = FrameClock.instance()
+        if frame is not None and (finish is None or clock.align(frame) < finish):
+            clock.request(self, self._tick, frame)
+        else:
+            clock.request(self, self._tick, None)
+
+    def changeEvent(self, event: QtCore.QEvent) -> None:
+        # свернули/развернули — кадры нужны (или уже не нужны)
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            self._schedule_tick()
 
-        self.update()
-        
     @log_exceptions
     def _do_autoupdate(self):
         """Вызывается по таймеру — стартуем full-check."""
         self._update_checker.check_for_update()
 
+    @log_exceptions
+    def _do_manual_update(self):
+        """Кнопка в настройках — проверка без учёта задержек после неудач."""
+        self._update_checker.check_for_update(force=True)
+
     def _on_server_update(self, app_dir: str):
         """Обновление с сервера установлено — перезапускаем приложение."""
         self.tray.showMessage("XTimer", "Обновление с сервера установлено. Перезапуск через 2s...", QSystemTrayIcon.Information, 5000)
-        QTimer.singleShot(2000, lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(sys.argv[0])))
+        launcher = launcher_path(os.path.dirname(__file__))
+        QTimer.singleShot(2000, lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(launcher)))
 
     def _on_github_update(self, tag: str, url: str):
         """Найден новый релиз на GitHub — показываем ссылку."""
@@ -779,127 +891,157 @@ class TaskbarTimer(QtWidgets.QMainWindow):
         if hasattr(self, "_update_url"):
             QDesktopServices.openUrl(QUrl(self._update_url))
 
-    def paintEvent(self, _ev):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing)
-
-        # 1) Рамка (мигание по завершении, если включено)
-        if self.blink_enabled and self.blink_start_time is not None:
-            t     = time.monotonic() - self.blink_start_time
+    # ──────────────────────────────────────────────────────────────
+    #  состояние кадра: рамка, заливка, надпись
+    # ──────────────────────────────────────────────────────────────
+    def _border_params(self) -> tuple[int, int]:
+        """(толщина, альфа) рамки: пульсирует, пока идёт мигание по завершении."""
+        if self.blink_enabled and self.blink_start_ns is not None:
+            t     = (self.core.now() - self.blink_start_ns) / NS
             alpha = int(((math.sin(2 * math.pi * self.blink_pulse_freq * t) + 1) / 2) * 255)
-            bw    = self.blink_border_width
-        else:
-            bw    = 2
-            alpha = 255
+            return self.blink_border_width, alpha
+        return 2, 255
 
-        # Цвет рамки по теме
-        if getattr(self, "_theme", "dark") == "light":
-            border_color = QColor(0, 0, 0, alpha)       # чёрная рамка в светлой теме
-        else:
-            border_color = QColor(255, 255, 255, alpha) # белая рамка в тёмной теме
-
-        pen = QtGui.QPen(border_color, bw)
-        p.setPen(pen)
-        half = bw // 2
-        p.drawRect(half, half, self.W - bw, self.H - bw)
-
-        # 2) Прогресс-бар
-        dur = float(self.duration) if self.duration else 0.0
-        el  = min(float(self.elapsed), dur) if dur else 0.0
+    def _fill_rect(self, bw: int) -> QRect:
+        """Прямоугольник заливки прогресс-бара (пустой, если заливать нечего)."""
+        dur = self.core.duration_ns
+        el  = min(self.core.elapsed_ns, dur)
         ratio_elapsed = (el / dur) if dur else 0.0
 
         # для "down" хотим показывать остаток → бар «усыхает»
         is_down = (getattr(self, "_count_direction", "up") == "down")
         ratio   = (1.0 - ratio_elapsed) if is_down else ratio_elapsed
-
-        brush = QtGui.QBrush(self.progress_color)
+        half    = bw // 2
 
         if self.orientation in ("horizontal", "top", "bottom"):
-            # горизонталь: всегда рисуем слева направо,
-            # но при "down" ширина уменьшается к нулю
+            # горизонталь: всегда слева направо, при "down" ширина уменьшается к нулю
             fill_w = int((self.W - bw - 2) * ratio)
             if fill_w > 0:
-                p.fillRect(
-                    half + 1,
-                    half + 1,
-                    fill_w,
-                    self.H - bw - 2,
-                    brush,
-                )
+                return QRect(half + 1, half + 1, fill_w, self.H - bw - 2)
+        elif is_down:
+            # вертикаль "down" — сверху вниз (усыхает к нулю)
+            fill_h = int((self.H - bw - 2) * ratio)
+            if fill_h > 0:
+                return QRect(half + 1, half + 1, self.W - bw - 2, fill_h)
         else:
-            # вертикаль:
-            # при "up" заполняем снизу вверх (как было),
-            # при "down" — сверху вниз (усыхает к нулю).
-            if is_down:
-                fill_h = int((self.H - bw - 2) * ratio)  # остаток
-                if fill_h > 0:
-                    p.fillRect(
-                        half + 1,
-                        half + 1,
-                        self.W - bw - 2,
-                        fill_h,
-                        brush,
-                    )
-            else:
-                fill_h = int((self.H - bw - 2) * ratio_elapsed)
-                if fill_h > 0:
-                    p.fillRect(
-                        half + 1,
-                        self.H - half - 1 - fill_h,
-                        self.W - bw - 2,
-                        fill_h,
-                        brush,
-                    )
-
-        # 3) Текст «HH:MM:SS»
-        # up: показываем прошедшее; down: показываем оставшееся
-        if is_down:
-            total = max(dur - el, 0.0)
+            # вертикаль "up" — снизу вверх
+            fill_h = int((self.H - bw - 2) * ratio_elapsed)
+            if fill_h > 0:
+                return QRect(half + 1, self.H - half - 1 - fill_h, self.W - bw - 2, fill_h)
+        return QRect()
+
+    def _label_text(self) -> str:
+        """Надпись «HH:MM:SS»: up — прошедшее, down — оставшееся."""
+        dur = self.core.duration_ns
+        el  = min(self.core.elapsed_ns, dur)
+        if getattr(self, "_count_direction", "up") == "down":
+            total = max(dur - el, 0)
         else:
-            total = el if (self.running or el) else dur
+            total = el if (self.core.running or el) else dur
 
-        hh, rem = divmod(int(total), 3600)
+        hh, rem = divmod(total // NS, 3600)
         mm, ss  = divmod(rem, 60)
-        label   = f"{hh:02d}:{mm:02d}:{ss:02d}"
+        return f"{hh:02d}:{mm:02d}:{ss:02d}"
+
+    def _glyph_atlas(self) -> GlyphAtlas:
+        """
+        Атлас глифов надписи; перестраивается, только когда меняется шрифт,
+        размер, тема, ориентация или devicePixelRatio.
+        """
+        key = (
+            self.time_font_family,
+            self.time_font_size,
+            getattr(self, "_theme", "dark"),
+            self.orientation not in ("horizontal", "top", "bottom"),
+            self.devicePixelRatioF(),
+        )
+        if self._atlas is None or self._atlas.key != key:
+            self._atlas = GlyphAtlas(*key)
+        return self._atlas
+
+    def _label_rect(self, label: str) -> QRect:
+        """Область окна, которую занимает надпись вместе с обводкой."""
+        return self._glyph_atlas().bounds(label, self.rect())
+
+    def _invalidate_frame(self) -> None:
+        """Сбрасывает запомненный кадр: следующий paintEvent рисует всё окно."""
+        self._shown_border = None
+        self._shown_fill   = QRect()
+        self._shown_label  = None
+        self.update()
+
+    def _update_dirty(self) -> None:
+        """
+        Запрашивает перерисовку только того, что изменилось с прошлого кадра:
+        кольца рамки (альфа при мигании), полосы между старой и новой заливкой
+        и прямоугольника текста — если сменилась надпись. Ничего не изменилось —
+        ничего не перерисовываем.
+        """
+        bw, alpha = self._border_params()
+        fill      = self._fill_rect(bw)
+        label     = self._label_text()
+        dirty     = QtGui.QRegion()
+
+        if (bw, alpha) != self._shown_border:
+            outer = QtGui.QRegion(self.rect())
+            m     = max(bw, 2) + 1
+            dirty = dirty.united(outer.subtracted(
+                QtGui.QRegion(self.rect().adjusted(m, m, -m, -m))
+            ))
+        if fill != self._shown_fill:
+            dirty = dirty.united(QtGui.QRegion(fill).xored(QtGui.QRegion(self._shown_fill)))
+        if label != self._shown_label:
+            if self._shown_label is not None:
+                dirty = dirty.united(self._label_rect(self._shown_label))
+            dirty = dirty.united(self._label_rect(label))
+
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+    def paintEvent(self, ev):
+        if not instrumentation.enabled:
+            self._paint(ev)
+            return
+        t0 = time.perf_counter_ns()
+        self._paint(ev)
+        instrumentation.record("paint", time.perf_counter_ns() - t0)
 
-        # 4) Шрифт пользователя
-        font = QtGui.QFont(self.time_font_family, self.time_font_size, QtGui.QFont.Bold)
-        p.setFont(font)
+    def _paint(self, ev):
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing)
 
-        # 5) Прямоугольник рисования текста
-        rect = self.rect()  # QRect(0, 0, self.W, self.H)
+        # 1) Рамка (мигание по завершении, если включено)
+        bw, alpha = self._border_params()
 
-        # 6) Рисуем текст с обводкой (по теме)
-        if self.orientation in ("horizontal", "top", "bottom"):
-            if getattr(self, "_theme", "dark") == "light":
-                p.setPen(QtGui.QPen(QColor(255, 255, 255), 3))
-                p.drawText(rect, Qt.AlignCenter, label)
-                p.setPen(QtGui.QPen(QColor(0, 0, 0), 1))
-                p.drawText(rect, Qt.AlignCenter, label)
-            else:
-                p.setPen(QtGui.QPen(QColor(0, 0, 0), 3))
-                p.drawText(rect, Qt.AlignCenter, label)
-                p.setPen(QtGui.QPen(QColor(255, 255, 255), 1))
-                p.drawText(rect, Qt.AlignCenter, label)
+        # Цвет рамки по теме
+        if getattr(self, "_theme", "dark") == "light":
+            border_color = QColor(0, 0, 0, alpha)       # чёрная рамка в светлой теме
         else:
-            # вертикальный режим (поворот текста)
-            p.save()
-            p.translate(self.W / 2, self.H / 2)
-            p.rotate(-90)
-            rect_rotated = QtCore.QRectF(-self.H / 2, -self.W / 2, self.H, self.W)
-
-            if getattr(self, "_theme", "dark") == "light":
-                p.setPen(QtGui.QPen(QColor(255, 255, 255), 3))
-                p.drawText(rect_rotated, Qt.AlignCenter, label)
-                p.setPen(QtGui.QPen(QColor(0, 0, 0), 1))
-                p.drawText(rect_rotated, Qt.AlignCenter, label)
-            else:
-                p.setPen(QtGui.QPen(QColor(0, 0, 0), 3))
-                p.drawText(rect_rotated, Qt.AlignCenter, label)
-                p.setPen(QtGui.QPen(QColor(255, 255, 255), 1))
-                p.drawText(rect_rotated, Qt.AlignCenter, label)
-            p.restore()
+            border_color = QColor(255, 255, 255, alpha) # белая рамка в тёмной теме
 
-        p.end()
+        pen = QtGui.QPen(border_color, bw)
+        p.setPen(pen)
+        half = bw // 2
+        p.drawRect(half, half, self.W - bw, self.H - bw)
 
+        # 2) Прогресс-бар
+        fill = self._fill_rect(bw)
+        if not fill.isEmpty():
+            p.fillRect(fill, QtGui.QBrush(self.progress_color))
 
+        # 3) Текст «HH:MM:SS»
+        label = self._label_text()
+        self._shown_border = (bw, alpha)
+        self._shown_fill   = fill
+        self._shown_label  = label
+
+        # мигает только рамка — текст в области перерисовки не попал
+        if not ev.region().intersects(self._label_rect(label)):
+            p.end()
+            return
+
+        # 4) Текст с обводкой — блиты готовых глифов из атласа
+        for pos, pix in self._glyph_atlas().layout(label, self.rect()):
+            p.drawPixmap(pos, pix)
+
+        p.end()
@@ -0,0 +1,102 @@
+# timer_core.py
+"""
+Ядро таймера без Qt и WinAPI: чистая машина состояний обратного отсчёта
+на целых наносекундах time.monotonic_ns (без накопления ошибок float
+на многочасовых отсчётах). TaskbarTimer только «ведёт» его и рисует;
+из скриптов и тестов ядро можно использовать напрямую, в т.ч. на Linux.
+"""
+import time
+
+NS = 1_000_000_000   # наносекунд в секунде
+
+
+class TimerCore:
+    """
+    Состояние одного таймера: длительность, прошедшее время, «идёт / стоит».
+
+    Время берётся из `clock()` (по умолчанию time.monotonic_ns), но любой
+    метод принимает явный `now` — удобно для пакетной обработки и бенчмарков.
+    """
+    __slots__ = ("_clock", "duration_ns", "elapsed_ns", "start_ns", "running")
+
+    def __init__(self, clock=time.monotonic_ns):
+        self._clock      = clock
+        self.duration_ns = 0       # полная длительность
+        self.elapsed_ns  = 0       # прошедшее на момент последнего tick/pause
+        self.start_ns    = 0       # «виртуальный» старт: now - elapsed при запуске
+        self.running     = False
+
+    # ──────────────────────────────────────────────────────────────
+    #  чтение состояния
+    # ──────────────────────────────────────────────────────────────
+    def now(self) -> int:
+        return self._clock()
+
+    def elapsed_at(self, now: int | None = None) -> int:
+        """Прошедшее время «вживую» (не дожидаясь tick), не больше длительности."""
+        if not self.running:
+            return self.elapsed_ns
+        if now is None:
+            now = self._clock()
+        return min(now - self.start_ns, self.duration_ns)
+
+    @property
+    def remaining_ns(self) -> int:
+        return max(self.duration_ns - self.elapsed_ns, 0)
+
+    @property
+    def deadline_ns(self) -> int | None:
+        """Момент финиша по часам ядра или None, если таймер стоит."""
+        return self.start_ns + self.duration_ns if self.running else None
+
+    # ──────────────────────────────────────────────────────────────
+    #  переходы
+    # ──────────────────────────────────────────────────────────────
+    def add(self, secs: float) -> None:
+        """Добавляет secs секунд к длительности (бег/пауза не меняются)."""
+        self.duration_ns += int(round(secs * NS))
+
+    def set(self, secs: float) -> None:
+        """Задаёт новую длительность и ставит таймер на ноль в паузе."""
+        self.duration_ns = int(round(secs * NS))
+        self.elapsed_ns  = 0
+        self.running     = False
+
+    def reset(self) -> None:
+        self.duration_ns = self.elapsed_ns = 0
+        self.running     = False
+
+    def start(self, now: int | None = None) -> bool:
+        """Запускает отсчёт с накопленного места; без длительности — ничего не делает."""
+        if not self.duration_ns or self.running:
+            return False
+        if now is None:
+            now = self._clock()
+        self.start_ns = now - self.elapsed_ns
+        self.running  = True
+        return True
+
+    def pause(self, now: int | None = None) -> bool:
+        """Останавливает отсчёт, фиксируя прошедшее время на момент паузы."""
+        if not self.running:
+            return False
+        self.elapsed_ns = self.elapsed_at(now)
+        self.running    = False
+        return True
+
+    def toggle(self, now: int | None = None) -> bool:
+        """Запуск ↔ пауза; возвращает True, если состояние изменилось."""
+        return self.pause(now) if self.running else self.start(now)
+
+    def tick(self, now: int | None = None) -> bool:
+        """
+        Обновляет прошедшее время. Возвращает True ровно один раз —
+        на тике, где отсчёт дошёл до конца (таймер при этом останавливается).
+        """
+        if not self.running:
+            return False
+        self.elapsed_ns = self.elapsed_at(now)
+        if self.elapsed_ns >= self.duration_ns:
+            self.running = False
+            return True
+        return False
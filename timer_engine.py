@@ -0,0 +1,161 @@
+# timer_engine.py
+"""
+Много именованных таймеров на одной min-куче дедлайнов (без Qt и WinAPI).
+
+Каждый таймер — это TimerCore; в куче лежат только дедлайны запущенных.
+Движок держит ровно один «будильник» ОС на самый ранний дедлайн (через
+колбэк `arm`), а финиши снимает с вершины кучи за O(log n) каждый.
+Устаревшие записи (после паузы/отмены/добавления времени) не ищутся
+в куче, а отбрасываются лениво по номеру поколения.
+"""
+import heapq
+import time
+
+from timer_core import TimerCore
+
+
+class TimerEngine:
+    """
+    add / pause / resume / toggle / set / reset / cancel по id; `fire()`
+    вызывается, когда сработал будильник, и возвращает id закончившихся
+    таймеров.
+
+    arm(deadline_ns | None) — колбэк «взвести единственный таймер ОС»
+    на абсолютный момент по часам `clock` (None — будить не нужно).
+    """
+
+    def __init__(self, arm=None, clock=time.monotonic_ns):
+        self._clock  = clock
+        self._arm    = arm
+        self._timers: dict[str, TimerCore] = {}
+        self._gen:    dict[str, int] = {}         # поколение записи в куче
+        self._heap:   list[tuple[int, int, str]] = []   # (deadline_ns, gen, id)
+        self._armed  = None
+
+    # ──────────────────────────────────────────────────────────────
+    #  чтение состояния
+    # ──────────────────────────────────────────────────────────────
+    def now(self) -> int:
+        return self._clock()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, timer_id: str) -> bool:
+        return timer_id in self._timers
+
+    def get(self, timer_id: str) -> TimerCore:
+        return self._timers[timer_id]
+
+    def ids(self) -> list[str]:
+        return list(self._timers)
+
+    def next_deadline(self) -> int | None:
+        """Самый ранний актуальный дедлайн (устаревшие записи снимаются по пути)."""
+        heap = self._heap
+        while heap:
+            deadline, gen, timer_id = heap[0]
+            if self._gen.get(timer_id) == gen:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    # ──────────────────────────────────────────────────────────────
+    #  операции по id
+    # ──────────────────────────────────────────────────────────────
+    def add(self, timer_id: str, secs: float, *, start: bool = True,
+            now: int | None = None) -> TimerCore:
+        """
+        Создаёт таймер на secs секунд (или добавляет время к существующему)
+        и, если start=True, запускает его.
+        """
+        core = self._timers.get(timer_id)
+        if core is None:
+            core = self._timers[timer_id] = TimerCore(self._clock)
+        core.add(secs)
+        if start:
+            core.start(now)
+        self._push(timer_id)
+        return core
+
+    def pause(self, timer_id: str, now: int | None = None) -> bool:
+        core = self._timers[timer_id]
+        if not core.pause(now):
+            return False
+        self._push(timer_id)
+        return True
+
+    def resume(self, timer_id: str, now: int | None = None) -> bool:
+        core = self._timers[timer_id]
+        if not core.start(now):
+            return False
+        self._push(timer_id)
+        return True
+
+    def toggle(self, timer_id: str, now: int | None = None) -> bool:
+        """Запуск ↔ пауза; возвращает True, если состояние изменилось."""
+        core = self._timers[timer_id]
+        return self.pause(timer_id, now) if core.running else self.resume(timer_id, now)
+
+    def set(self, timer_id: str, secs: float) -> None:
+        """Новая длительность, таймер на нуле в паузе (см. TimerCore.set)."""
+        self._timers[timer_id].set(secs)
+        self._push(timer_id)
+
+    def reset(self, timer_id: str) -> None:
+        self._timers[timer_id].reset()
+        self._push(timer_id)
+
+    def cancel(self, timer_id: str) -> bool:
+        if self._timers.pop(timer_id, None) is None:
+            return False
+        del self._gen[timer_id]
+        self._rearm()
+        return True
+
+    def fire(self, now: int | None = None) -> list[str]:
+        """
+        Снимает с кучи все дедлайны, наступившие к `now`, останавливает
+        эти таймеры и возвращает их id в порядке дедлайнов.
+        """
+        if now is None:
+            now = self._clock()
+        done = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, gen, timer_id = heapq.heappop(heap)
+            if self._gen.get(timer_id) != gen:
+                continue
+            # ядро могли остановить в обход движка (тик окна после финиша)
+            if self._timers[timer_id].tick(max(now, deadline)):
+                done.append(timer_id)
+        self._compact()
+        self._armed = None          # будильник только что сработал — взводим заново
+        self._rearm()
+        return done
+
+    # ──────────────────────────────────────────────────────────────
+    #  куча и будильник
+    # ──────────────────────────────────────────────────────────────
+    def _push(self, timer_id: str) -> None:
+        """Новое поколение для таймера; в кучу — только если он идёт."""
+        gen  = self._gen.get(timer_id, 0) + 1
+        self._gen[timer_id] = gen
+        core = self._timers[timer_id]
+        if core.running:
+            heapq.heappush(self._heap, (core.deadline_ns, gen, timer_id))
+        self._compact()
+        self._rearm()
+
+    def _compact(self) -> None:
+        """Пересобирает кучу, когда устаревших записей больше половины."""
+        if len(self._heap) > 2 * len(self._timers) + 16:
+            self._heap = [e for e in self._heap if self._gen.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+
+    def _rearm(self) -> None:
+        deadline = self.next_deadline()
+        if deadline != self._armed:
+            self._armed = deadline
+            if self._arm is not None:
+                self._arm(deadline)
@@ -0,0 +1,47 @@
+# timer_engine_qt.py
+import math
+
+from PyQt5 import QtCore
+from clock import get_clock
+from logging_config import log_exceptions
+from timer_engine import TimerEngine
+
+
+class QtTimerEngine(QtCore.QObject):
+    """
+    TimerEngine, привязанный к циклу событий Qt: один single-shot QTimer
+    всегда взведён на самый ранний дедлайн, по срабатыванию — сигнал
+    finished(id) для каждого закончившегося таймера. Время и будильник —
+    из часов процесса (clock.get_clock()), если не переданы явно.
+
+    Окна таймеров держат свои TimerCore в общем движке (instance()) —
+    финиши всех окон обслуживает один будильник.
+    """
+    finished = QtCore.pyqtSignal(str)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "QtTimerEngine":
+        """Общий движок приложения (создаётся при первом обращении)."""
+        if cls._instance is None:
+            cls._instance = cls(QtCore.QCoreApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None, clock=None):
+        super().__init__(parent)
+        clock = clock or get_clock()
+        self._timer = clock.timer(self, self._on_timeout)
+        self.engine = TimerEngine(arm=self._arm, clock=clock)
+
+    def _arm(self, deadline_ns: int | None) -> None:
+        if deadline_ns is None:
+            self._timer.stop()
+            return
+        delay = deadline_ns - self.engine.now()
+        self._timer.start(max(math.ceil(delay / 1_000_000), 0))
+
+    @log_exceptions
+    def _on_timeout(self):
+        for timer_id in self.engine.fire():
+            self.finished.emit(timer_id)
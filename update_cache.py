@@ -0,0 +1,117 @@
+# update_cache.py
+"""
+Состояние проверок обновлений между запусками, по каждому адресу:
+
+  • валидаторы (ETag, Last-Modified) и тело последнего ответа — следующий
+    запрос уходит условным, и неизменившийся релиз стоит одного ответа 304;
+  • число неудач подряд и время, раньше которого адрес не опрашивается
+    (экспоненциальная задержка со случайным разбросом).
+
+Хранится в одном JSON-файле; время повтора — по настенным часам (time.time),
+чтобы задержка переживала перезапуск приложения.
+"""
+import os
+import json
+import time
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateCache:
+    BACKOFF_BASE_S = 5 * 60          # первая задержка после неудачи
+    BACKOFF_MAX_S  = 12 * 60 * 60    # потолок задержки
+
+    def __init__(self, path: str, clock=time.time, rand=random.random):
+        self.path    = path
+        self._clock  = clock
+        self._rand   = rand
+        self._urls   = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._urls = {str(k): dict(v) for k, v in data.get("urls", {}).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError, TypeError):
+            logger.warning("Кэш проверок обновлений повреждён, начинаем заново: %s", self.path)
+            self._urls = {}
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"urls": self._urls}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.exception("Не удалось сохранить кэш проверок обновлений")
+
+    def _entry(self, url: str) -> dict:
+        return self._urls.setdefault(url, {})
+
+    # ──────────────────────────────────────────────────────────────
+    #  условные запросы
+    # ──────────────────────────────────────────────────────────────
+    def conditional_headers(self, url: str, need_body: bool = True) -> dict:
+        """
+        Заголовки If-None-Match / If-Modified-Since для url. Если ответ 304
+        должен заменить собой тело (need_body), а тела в кэше нет — пусто.
+        """
+        entry = self._urls.get(url, {})
+        if need_body and entry.get("body") is None:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, etag: str = "", last_modified: str = "", body: str | None = None) -> None:
+        """Запоминает валидаторы (и тело) успешного ответа."""
+        entry = self._entry(url)
+        entry.update(etag=etag, last_modified=last_modified, body=body)
+        self._save()
+
+    def body(self, url: str) -> str | None:
+        return self._urls.get(url, {}).get("body")
+
+    def forget(self, url: str) -> None:
+        if self._urls.pop(url, None) is not None:
+            self._save()
+
+    # ──────────────────────────────────────────────────────────────
+    #  задержка после неудач
+    # ──────────────────────────────────────────────────────────────
+    def ready(self, url: str) -> bool:
+        """Можно ли опрашивать url сейчас (не истекла ли задержка)."""
+        return self._clock() >= self._urls.get(url, {}).get("retry_at", 0)
+
+    def retry_in(self, url: str) -> float:
+        return max(self._urls.get(url, {}).get("retry_at", 0) - self._clock(), 0.0)
+
+    def record_success(self, url: str) -> None:
+        entry = self._urls.get(url)
+        if entry and (entry.get("failures") or entry.get("retry_at")):
+            entry.pop("failures", None)
+            entry.pop("retry_at", None)
+            self._save()
+
+    def record_failure(self, url: str) -> float:
+        """
+        Учитывает неудачу и возвращает задержку до следующей попытки в секундах:
+        base·2^(n-1), не больше BACKOFF_MAX_S, случайно в [½; 1] от неё.
+        """
+        entry = self._entry(url)
+        failures = entry.get("failures", 0) + 1
+        delay = min(self.BACKOFF_BASE_S * 2 ** (failures - 1), self.BACKOFF_MAX_S)
+        delay *= 0.5 + 0.5 * self._rand()
+        entry["failures"] = failures
+        entry["retry_at"] = self._clock() + delay
+        self._save()
+        return delay
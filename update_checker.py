@@ -2,100 +2,457 @@
 
 import os
 import sys
-import json
+import time
 import tempfile
-import zipfile
 import logging
+import functools
+from urllib.parse import quote
 
-from PyQt5.QtCore    import QObject, pyqtSignal, QUrl
+from PyQt5.QtCore    import QObject, QThread, QTimer, QCoreApplication, Qt, pyqtSignal, QUrl
 from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest
 from PyQt5.QtGui     import QDesktopServices
-from constants       import __version__ as CURRENT_VERSION, SERVER_UPDATE_URL
+from constants       import __version__ as CURRENT_VERSION, SERVER_UPDATE_URL, SERVER_MANIFEST_URL
 from logging_config  import log_exceptions
+from update_download import StreamingDownload, InstallWorker
+from update_cache    import UpdateCache
+from update_sources  import ManifestSource, GitHubSource
+from app_versions    import install_root
 
 logger = logging.getLogger(__name__)
 
+UPDATE_DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), "xtimer_update")
+GITHUB_RELEASES_URL = "https://api.github.com/repos/End1essspace/XTimer/releases/latest"
+
+
+def default_sources() -> list:
+    """Манифест на вашем сервере и GitHub Releases — в порядке приоритета."""
+    return [ManifestSource(SERVER_MANIFEST_URL), GitHubSource(GITHUB_RELEASES_URL)]
+
+
 class UpdateChecker(QObject):
     """
-    Проверяет сначала ZIP-архив на вашем сервере,
-    при неудаче — GitHub Releases.
+    Опрашивает все источники (update_sources) одновременно, у каждого свой
+    срок ответа; порядок в списке — приоритет. Побеждает самая новая версия
+    среди ответивших, при равных — источник выше по списку. Решение
+    принимается, как только ответ на руках уже нельзя перебить: все
+    источники выше победителя ответили (или не смогли) — остальные запросы
+    отменяются сразу. Пока ответа ждут от источника выше, новую версию
+    держат не дольше GRACE_MS. Первым по умолчанию стоит манифест вашего
+    сервера: это дельта-обновление, которое устанавливается само
+    (скачиваются только изменившиеся файлы), а GitHub Releases даёт лишь
+    ссылку на релиз. Если манифест недоступен, а новой версии никто не
+    предложил — как и раньше, ZIP-архив с сервера.
+
+    Файлы скачиваются потоково (StreamingDownload: кусками на диск, SHA-256
+    на лету, докачка по Range); сверка и сборка новой версии идут в отдельном
+    потоке (InstallWorker). Запущенная версия не трогается: новая собирается
+    рядом и становится текущей атомарной заменой указателя (app_versions).
+
+    Запросы условные (ETag / Last-Modified из UpdateCache): неизменившийся
+    манифест или релиз стоит одного ответа 304. Источник, который не ответил,
+    не опрашивается до истечения экспоненциальной задержки (кроме ручной
+    проверки, force=True).
     """
-    update_downloaded = pyqtSignal(str)      # путь к папке приложения после установки
+    update_downloaded = pyqtSignal(str)      # папка установленной (ещё не запущенной) версии
     update_available  = pyqtSignal(str, str) # (tag, html_url) для GitHub
     update_failed     = pyqtSignal(str)      # 'server' или 'github'
+    download_progress = pyqtSignal("qint64", "qint64")  # (получено, всего; -1 — неизвестно)
+
+    _install_zip_requested   = pyqtSignal(str, str, str)
+    _diff_requested          = pyqtSignal(object, str)
+    _install_delta_requested = pyqtSignal(object, str, str, object)
+
+    GRACE_MS = 500      # сколько ждать источник выше по списку, когда новая версия уже предложена
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, sources=None):
         super().__init__(parent)
-        self._mgr   = QNetworkAccessManager(self)
+        self._sources  = list(sources) if sources is not None else default_sources()
+        self._race     = {}                # источник → (reply, таймер срока ответа)
+        self._race_failed = []             # источники без ответа (ошибка, срок, задержка)
+        self._race_answers = []            # разобранные ответы (Offer), в т. ч. без новой версии
+        self._race_t0  = 0
+        self._grace    = QTimer(self)      # ожидание источника выше после первого предложения
+        self._grace.setSingleShot(True)
+        self._grace.setTimerType(Qt.PreciseTimer)   # грубый таймер срабатывает до 5 % раньше
+        self._grace.timeout.connect(self._decide_race)
+        self._mgr      = QNetworkAccessManager(self)
         self._mgr.finished.connect(self._on_reply)
-        self._stage = None
+        self._handlers = {}                # reply → обработчик (загрузки читают свои ответы сами)
+        self._stage    = None
+        self._download = None
+        self._thread   = None              # поток установки — при первом обновлении
+        self._delta    = None              # текущее дельта-обновление
+        self._force    = False             # ручная проверка — без учёта задержек
+        self._zip_validators = None        # (ETag, Last-Modified) скачанного ZIP до установки
+        self._zip_archive    = None
+        self._cache    = UpdateCache(os.path.join(UPDATE_DOWNLOAD_DIR, "check_cache.json"))
+        self.requests_sent    = 0          # запросов отправлено
+        self.bytes_downloaded = 0          # байт получено из сети (тела ответов)
 
-    @log_exceptions
-    def check_for_update(self):
-        """Запустить проверку: сначала сервер, потом GitHub."""
-        self._stage = "server"
-        req = QNetworkRequest(QUrl(SERVER_UPDATE_URL))
-        self._mgr.get(req)
+    @staticmethod
+    def _app_dir() -> str:
+        return os.path.dirname(__file__)
 
     @log_exceptions
-    def _on_reply(self, reply):
-        # === 1) Серверный ZIP ===
-        if self._stage == "server":
-            if reply.error():
-                logger.warning("Server update unavailable, falling back to GitHub")
-                self._stage = "github"
-                return self._check_github()
+    def check_for_update(self, force: bool = False):
+        """
+        Запустить проверку: все источники разом, без манифеста — ZIP.
+        force — ручная проверка: источники опрашиваются, даже если после
+        неудач для них ещё не истекла задержка.
+        """
+        if self._stage is not None:
+            logger.info("Update check already in progress (%s)", self._stage)
+            return
+        self._force = force
+        self._start_race()
+
+    def _backing_off(self, url: str) -> bool:
+        if self._force or self._cache.ready(url):
+            return False
+        logger.info("Skipping %s after failures, next attempt in %.0f s",
+                    url, self._cache.retry_in(url))
+        return True
+
+    def _get(self, req, handler):
+        # условный запрос: тело прошлого ответа лежит в кэше
+        for name, value in self._cache.conditional_headers(req.url().toString()).items():
+            req.setRawHeader(name.encode("latin-1"), value.encode("latin-1"))
+        self.requests_sent += 1
+        reply = self._mgr.get(req)
+        self._handlers[reply] = handler
+        return reply
 
+    def _on_reply(self, reply):
+        handler = self._handlers.pop(reply, None)
+        if handler is None:
+            return                         # ответы StreamingDownload
+        reply.deleteLater()
+        url    = reply.request().url().toString()
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status == 304:
+            logger.info("%s not modified", url)
+            self._cache.record_success(url)
+            handler(self._cache.body(url), "")
+        elif reply.error():
+            delay = self._cache.record_failure(url)
+            logger.warning("%s failed: %s (next automatic attempt in %.0f s)",
+                           url, reply.errorString(), delay)
+            handler(None, reply.errorString())
+        else:
             data = bytes(reply.readAll())
-            try:
-                tmpdir   = tempfile.mkdtemp(prefix="xtimer_upd_")
-                url_path = reply.request().url().path()
-                filename = os.path.basename(url_path) or "update.zip"
-                arc_path = os.path.join(tmpdir, filename)
-                with open(arc_path, "wb") as f:
-                    f.write(data)
+            self.bytes_downloaded += len(data)
+            body = data.decode("utf-8", "replace")
+            self._cache.record_success(url)
+            self._cache.store(
+                url,
+                etag=bytes(reply.rawHeader(b"ETag")).decode("latin-1"),
+                last_modified=bytes(reply.rawHeader(b"Last-Modified")).decode("latin-1"),
+                body=body,
+            )
+            handler(body, "")
 
-                app_dir = os.path.dirname(__file__)
-                # Распаковываем только ZIP
-                with zipfile.ZipFile(arc_path, "r") as z:
-                    z.extractall(app_dir)
+    # === 1) Опрос источников ===
+    def _start_race(self):
+        self._race.clear()
+        self._race_failed = []
+        self._race_answers = []
+        self._grace.stop()
+        self._race_t0 = time.monotonic_ns()
+        self._stage = "race"
+        for source in self._sources:
+            if self._backing_off(source.url):
+                self._race_failed.append(source)
+                continue
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(functools.partial(self._on_source_timeout, source))
+            timer.start(source.timeout_ms)
+            reply = self._get(source.request(), functools.partial(self._on_source_reply, source))
+            self._race[source] = (reply, timer)
+        if not self._race:
+            self._race_finished()
 
-                logger.info("Server ZIP update installed into %s", app_dir)
-                self.update_downloaded.emit(app_dir)
+    def _race_ms(self) -> float:
+        return (time.monotonic_ns() - self._race_t0) / 1e6
 
+    @log_exceptions
+    def _on_source_reply(self, source, body, error):
+        entry = self._race.pop(source, None)
+        if entry is None:
+            return
+        entry[1].stop()
+        entry[1].deleteLater()
+
+        offer = None
+        if body is None:
+            self._race_failed.append(source)
+        else:
+            try:
+                offer = source.parse(body)
             except Exception:
-                logger.exception("Failed to install update from server")
-                self.update_failed.emit("server")
+                logger.exception("Bad answer from %s", source)
+                self._cache.record_failure(source.url)
+                self._race_failed.append(source)
+
+        if offer is not None:
+            if self._is_newer(offer.version, CURRENT_VERSION):
+                logger.info("%s offered %s after %.0f ms", source.name, offer.version, self._race_ms())
+            else:
+                logger.info("%s: no newer version (%s, current=%s)",
+                            source.name, offer.version, CURRENT_VERSION)
+            self._race_answers.append(offer)
+        self._settle()
 
+    def _on_source_timeout(self, source):
+        entry = self._race.get(source)
+        if entry is None:
             return
+        reply = entry[0]
+        self._handlers.pop(reply, None)
+        delay = self._cache.record_failure(source.url)
+        logger.warning("%s did not answer in %d ms (next automatic attempt in %.0f s)",
+                       source.name, source.timeout_ms, delay)
+        reply.abort()
+        reply.deleteLater()
+        self._on_source_reply(source, None, "timeout")
 
-        # === 2) GitHub Releases ===
-        if self._stage == "github":
-            if reply.error():
-                logger.error("GitHub update check failed: %s", reply.errorString())
-                self.update_failed.emit("github")
+    def _best_answer(self):
+        # самая новая версия; при равных — источник выше по списку
+        return max(self._race_answers, default=None,
+                   key=lambda o: (self._version_key(o.version), -self._sources.index(o.source)))
+
+    def _settle(self):
+        """
+        Решает гонку, если ответ на руках уже не перебить: перебить его может
+        только источник выше по списку (ему хватает и равной версии). Пока
+        такой источник не ответил, новую версию держат не дольше GRACE_MS.
+        """
+        best = self._best_answer()
+        if self._race:
+            if best is None:
+                return
+            rank = self._sources.index(best.source)
+            if any(self._sources.index(source) < rank for source in self._race):
+                if self._is_newer(best.version, CURRENT_VERSION) and not self._grace.isActive():
+                    self._grace.start(self.GRACE_MS)
                 return
+        self._decide_race()
 
-            try:
-                info = json.loads(bytes(reply.readAll()).decode())
-                tag  = info.get("tag_name", "")
-                url  = info.get("html_url", "")
-                if tag and self._is_newer(tag, CURRENT_VERSION):
-                    self.update_available.emit(tag, url)
-                else:
-                    logger.info("No newer GitHub release found (current=%s)", CURRENT_VERSION)
-            except Exception:
-                logger.exception("Failed to parse GitHub release info")
+    @log_exceptions
+    def _decide_race(self):
+        # ответ не перебить, все ответили (или истекли сроки) либо вышло GRACE_MS
+        self._grace.stop()
+        best, answers = self._best_answer(), len(self._race_answers)
+        self._race_answers = []
+        if self._race:
+            logger.info("Cancelling %d request(s) still pending after %.0f ms",
+                        len(self._race), self._race_ms())
+            self._cancel_race()
+        if best is None or not self._is_newer(best.version, CURRENT_VERSION):
+            return self._race_finished()
+        logger.info("Accepting %s from %s after %.0f ms (%d answer(s))",
+                    best.version, best.source.name, self._race_ms(), answers)
+        self._accept(best)
+
+    def _cancel_race(self):
+        for reply, timer in self._race.values():
+            timer.stop()
+            timer.deleteLater()
+            self._handlers.pop(reply, None)   # отмена — не неудача источника
+            reply.abort()
+            reply.deleteLater()
+        self._race.clear()
+
+    def _race_finished(self):
+        failed = self._race_failed
+        if any(source.kind == "delta" for source in failed):
+            logger.info("No update offered and the server manifest is unavailable, trying full ZIP")
+            return self._start_zip_download()
+        self._stage = None
+        if failed and len(failed) == len(self._sources):
+            self.update_failed.emit(failed[-1].name)
+        else:
+            logger.info("No newer version found in %.0f ms (current=%s)", self._race_ms(), CURRENT_VERSION)
+
+    def _accept(self, offer):
+        if offer.kind == "release":
+            self._stage = None
+            self.update_available.emit(offer.version, offer.data)
+            return
+        self._stage = "delta"
+        self._ensure_installer()
+        self._diff_requested.emit(offer, self._app_dir())
+
+    def _start_zip_download(self):
+        if self._backing_off(SERVER_UPDATE_URL):
+            self._stage = None
+            return
+        self._stage = "server"
+        url      = QUrl(SERVER_UPDATE_URL)
+        filename = os.path.basename(url.path()) or "update.zip"
+        # 304 — уже установленный архив не изменился
+        headers  = self._cache.conditional_headers(SERVER_UPDATE_URL, need_body=False)
+        self.requests_sent += 1
+        self._download = StreamingDownload(
+            self._mgr, url, os.path.join(UPDATE_DOWNLOAD_DIR, filename),
+            headers=headers, parent=self,
+        )
+        self._download.progress.connect(self.download_progress)
+        self._download.finished.connect(self._on_server_downloaded)
+        self._download.not_modified.connect(self._on_server_not_modified)
+        self._download.failed.connect(self._on_server_failed)
+        self._download.start()
+
+    def shutdown(self):
+        """Прерывает загрузку и останавливает поток распаковки (при выходе)."""
+        if self._download is not None:
+            self._download.abort()
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+
+    # === 2) Дельта по манифесту ===
+    def _on_diffed(self, offer, changed: list):
+        manifest = offer.data
+        if not changed:
+            logger.info("Server version %s: all files already up to date", manifest["version"])
+            self._stage = None
+            return
+        files = manifest["files"]
+        self._delta = {
+            "source":   offer.source,
+            "manifest": manifest,
+            "files":    changed,
+            "pending":  list(changed),
+            "done":     0,                                     # байт в скачанных файлах
+            "total":    sum(files[rel]["size"] for rel in changed),
+            "staging":  os.path.join(install_root(self._app_dir()), ".update_staging"),
+        }
+        logger.info("Delta update to %s: %d of %d files, %d bytes",
+                    manifest["version"], len(changed), len(files), self._delta["total"])
+        self._download_next_file()
+
+    def _download_next_file(self):
+        delta = self._delta
+        if not delta["pending"]:
+            self._install_delta_requested.emit(
+                delta["manifest"], delta["staging"], self._app_dir(), delta["files"]
+            )
             return
+        rel  = delta["pending"].pop(0)
+        meta = delta["manifest"]["files"][rel]
+        url  = QUrl(delta["source"].url).resolved(QUrl(quote(delta["manifest"]["base_url"] + rel)))
+        dest = os.path.join(delta["staging"], *rel.split("/"))
+        self.requests_sent += 1
+        self._download = StreamingDownload(self._mgr, url, dest, meta["sha256"], parent=self)
+        self._download.progress.connect(
+            lambda got, _total: self.download_progress.emit(delta["done"] + got, delta["total"])
+        )
+        self._download.finished.connect(lambda _path, _sha: self._on_delta_file(meta["size"]))
+        self._download.failed.connect(self._on_delta_failed)
+        self._download.start()
+
+    @log_exceptions
+    def _on_delta_file(self, size: int):
+        self._drop_download()
+        self._delta["done"] += size
+        self._download_next_file()
+
+    def _on_delta_failed(self, reason: str):
+        self._drop_download()
+        source, self._delta = self._delta["source"], None
+        delay = self._cache.record_failure(source.url)
+        logger.error("Delta update download failed: %s (next automatic attempt in %.0f s)",
+                     reason, delay)
+        self._finish_failed("server")
+
 
+    # === 3) Серверный ZIP ===
     @log_exceptions
-    def _check_github(self):
-        gh_url = "https://api.github.com/repos/End1essspace/XTimer/releases/latest"
-        req    = QNetworkRequest(QUrl(gh_url))
-        req.setRawHeader(b"Accept", b"application/vnd.github.v3+json")
-        self._mgr.get(req)
+    def _on_server_downloaded(self, arc_path: str, sha256: str):
+        self._cache.record_success(SERVER_UPDATE_URL)
+        self._zip_validators = (self._download.etag, self._download.last_modified)
+        self._zip_archive    = arc_path
+        self._drop_download()
+        self._ensure_installer()
+        # у архива нет номера версии — называем версию по его хэшу
+        self._install_zip_requested.emit(arc_path, self._app_dir(), f"zip-{sha256[:12]}")
+
+    def _on_server_not_modified(self):
+        self._cache.record_success(SERVER_UPDATE_URL)
+        self._drop_download()
+        self._stage = None
+        logger.info("Server ZIP not modified since the last installed update")
+
+    @log_exceptions
+    def _on_server_failed(self, reason: str):
+        received = self._download.bytes_received
+        self._drop_download()
+        delay = self._cache.record_failure(SERVER_UPDATE_URL)
+        if received:
+            # сервер отвечал, но архив так и не докачался
+            logger.error("Server update download failed: %s (next automatic attempt in %.0f s)",
+                         reason, delay)
+        else:
+            logger.warning("Server update unavailable: %s", reason)
+        self._finish_failed("server")
+
+    def _ensure_installer(self):
+        if self._thread is not None:
+            return
+        self._thread = QThread(self)
+        self._installer = InstallWorker()
+        self._installer.moveToThread(self._thread)
+        self._install_zip_requested.connect(self._installer.install_zip)
+        self._diff_requested.connect(self._installer.diff)
+        self._install_delta_requested.connect(self._installer.install_delta)
+        self._installer.diffed.connect(self._on_diffed)
+        self._installer.installed.connect(self._on_installed)
+        self._installer.failed.connect(self._on_install_failed)
+        self._thread.finished.connect(self._installer.deleteLater)
+        self._thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def _on_installed(self, version: str, version_dir: str):
+        self._stage = None
+        if self._delta is not None:
+            self._delta = None
+            logger.info("Delta update %s installed into %s (%d bytes downloaded in total)",
+                        version, version_dir, self.bytes_downloaded)
+        else:
+            if self._zip_validators is not None:
+                etag, last_modified = self._zip_validators
+                self._cache.store(SERVER_UPDATE_URL, etag=etag, last_modified=last_modified)
+                self._zip_validators = None
+            try:
+                os.remove(self._zip_archive)
+            except OSError:
+                pass
+            logger.info("Server ZIP update installed into %s", version_dir)
+        self.update_downloaded.emit(version_dir)
+
+    def _on_install_failed(self, op: str, reason: str):
+        logger.error("Failed to install update from server (%s): %s", op, reason)
+        self._delta = None
+        self._zip_validators = None
+        self._finish_failed("server")
+
+    def _drop_download(self):
+        if self._download is not None:
+            self.bytes_downloaded += self._download.bytes_received
+            self._download.deleteLater()
+            self._download = None
+
+    def _finish_failed(self, stage: str):
+        self._stage = None
+        self.update_failed.emit(stage)
+
+    @staticmethod
+    def _version_key(version: str) -> list:
+        return [int(x) for x in version.strip("v").split(".") if x.isdigit()]
 
     def _is_newer(self, new: str, curr: str) -> bool:
-        def parts(v):
-            return [int(x) for x in v.strip("v").split(".") if x.isdigit()]
-        return parts(new) > parts(curr)
+        return self._version_key(new) > self._version_key(curr)
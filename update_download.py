@@ -0,0 +1,382 @@
+# update_download.py
+"""
+Потоковая загрузка файлов обновления и их установка вне GUI-потока.
+
+StreamingDownload пишет ответ на диск кусками по мере readyRead и считает
+SHA-256 на лету — в памяти держится не больше READ_BUFFER байт, сколько бы
+ни весил архив. Недокачанный файл (<имя>.part) докачивается запросом
+«Range: bytes=N-» с If-Range, чтобы не склеить куски разных версий; хэш
+уже скачанной части досчитывается в отдельном потоке (PartHasher).
+"""
+import os
+import time
+import hashlib
+import logging
+import shutil
+import zipfile
+
+from PyQt5 import QtCore
+from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+from update_manifest import diff_tree
+from app_versions import VersionStore, install_root
+
+logger = logging.getLogger(__name__)
+
+
+class PartHasher(QtCore.QThread):
+    """
+    Досчитывает SHA-256 уже скачанной части файла перед докачкой — вне
+    GUI-потока: .part может весить сотни мегабайт. hashed(sha256, байт);
+    байт = -1, если файл прочитать не удалось. Прерванный (abort) поток
+    ничего не эмитит.
+    """
+    hashed = QtCore.pyqtSignal(object, "qint64")
+
+    def __init__(self, path: str, chunk: int, parent=None):
+        super().__init__(parent)
+        self._path  = path
+        self._chunk = chunk
+
+    def run(self):
+        digest, size = hashlib.sha256(), 0
+        try:
+            with open(self._path, "rb") as f:
+                for chunk in iter(lambda: f.read(self._chunk), b""):
+                    if self.isInterruptionRequested():
+                        return
+                    digest.update(chunk)       # hashlib отпускает GIL на больших кусках
+                    size += len(chunk)
+        except OSError:
+            logger.exception("Не удалось прочитать %s", self._path)
+            digest, size = hashlib.sha256(), -1
+        self.hashed.emit(digest, size)
+
+
+class StreamingDownload(QtCore.QObject):
+    """
+    Одна загрузка url → dest_path. Сигналы:
+      progress(получено, всего)  — всего = -1, если сервер не сообщил размер;
+      finished(путь, sha256)     — файл полностью скачан и проверен;
+      not_modified()             — на условный запрос (headers) пришёл 304;
+      failed(причина)            — загрузка прервана окончательно.
+    """
+    progress     = QtCore.pyqtSignal("qint64", "qint64")
+    finished     = QtCore.pyqtSignal(str, str)
+    not_modified = QtCore.pyqtSignal()
+    failed       = QtCore.pyqtSignal(str)
+
+    READ_BUFFER    = 256 * 1024    # потолок буфера QNetworkReply и размер куска записи
+    MAX_RETRIES    = 3             # докачек подряд после обрыва
+    RETRY_DELAY_MS = 1000          # задержка перед докачкой, растёт вдвое
+
+    def __init__(self, manager, url: QtCore.QUrl, dest_path: str,
+                 expected_sha256: str | None = None, headers: dict | None = None, parent=None):
+        super().__init__(parent)
+        self._mgr      = manager
+        self._url      = url
+        self.dest_path = dest_path
+        self._part     = dest_path + ".part"
+        self._meta     = dest_path + ".part.validator"   # ETag/Last-Modified недокачанного файла
+        self._expected = (expected_sha256 or "").lower() or None
+        self._headers  = headers or {}  # доп. заголовки первого запроса (If-None-Match, …)
+        self.etag          = ""        # валидаторы последнего ответа 200/206
+        self.last_modified = ""
+        self._reply    = None
+        self._hasher   = None          # PartHasher, пока досчитывается .part
+        self._file     = None
+        self._hash     = None
+        self._offset   = 0             # байт уже на диске
+        self._total    = -1
+        self._retries  = 0
+        self._attempt_bytes = 0        # байт получено в текущей попытке
+        self._restarted = False        # 416 на Range — один перезапуск с нуля
+        self._aborted  = False
+        self.bytes_received = 0        # байт получено из сети в этом сеансе
+        self._t0       = 0
+
+    def is_running(self) -> bool:
+        return self._reply is not None or self._hasher is not None
+
+    # ──────────────────────────────────────────────────────────────
+    #  запуск / остановка
+    # ──────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        os.makedirs(os.path.dirname(self.dest_path) or ".", exist_ok=True)
+        self._hash   = hashlib.sha256()
+        self._offset = 0
+        self._t0     = time.monotonic_ns()
+        if self._read_validator() and os.path.isfile(self._part):
+            # хэш должен покрывать весь файл — уже скачанную часть досчитываем
+            # в потоке, запрос с Range уйдёт, когда он закончит
+            self._hasher = PartHasher(self._part, self.READ_BUFFER, self)
+            self._hasher.hashed.connect(self._on_part_hashed)
+            self._hasher.finished.connect(self._hasher.deleteLater)
+            self._hasher.start()
+            return
+        self._discard_part()
+        self._request()
+
+    def _on_part_hashed(self, digest, size: int) -> None:
+        self._hasher = None
+        if self._aborted:
+            return
+        if size < 0:
+            self._discard_part()
+        else:
+            self._hash, self._offset = digest, size
+            logger.info("Докачка %s с %d байт", self._url.toString(), size)
+        self._request()
+
+    def abort(self) -> None:
+        self._aborted = True
+        if self._hasher is not None:
+            # поток проверяет прерывание на каждом куске — ждать недолго
+            self._hasher.requestInterruption()
+            self._hasher.wait()
+            self._hasher = None
+        if self._reply is not None:
+            self._reply.abort()
+
+    def _request(self) -> None:
+        if self._aborted:
+            return
+        req = QNetworkRequest(self._url)
+        req.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        if self._offset:
+            req.setRawHeader(b"Range", f"bytes={self._offset}-".encode())
+            validator = self._read_validator()
+            if validator:
+                req.setRawHeader(b"If-Range", validator.encode())
+        else:
+            for name, value in self._headers.items():
+                req.setRawHeader(name.encode("latin-1"), value.encode("latin-1"))
+        reply = self._mgr.get(req)
+        # неподобранные данные не копятся в памяти: сеть ждёт, пока читаем
+        reply.setReadBufferSize(self.READ_BUFFER)
+        reply.metaDataChanged.connect(self._on_headers)
+        reply.readyRead.connect(self._on_ready_read)
+        reply.finished.connect(self._on_finished)
+        self._reply = reply
+        self._attempt_bytes = 0
+
+    # ──────────────────────────────────────────────────────────────
+    #  ответ
+    # ──────────────────────────────────────────────────────────────
+    def _on_headers(self) -> None:
+        if self._reply is not None:
+            self._open_part(self._reply)
+
+    def _open_part(self, reply) -> None:
+        if self._file is not None:
+            return
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status not in (200, 206):
+            return                      # ошибку обработает _on_finished
+
+        if status == 206 and self._offset and self._range_start(reply) == self._offset:
+            self._file = open(self._part, "ab")
+        else:
+            # сервер прислал файл целиком (Range не поддержан или файл сменился)
+            if self._offset:
+                logger.info("Сервер вернул файл целиком — загрузка с начала")
+            self._hash   = hashlib.sha256()
+            self._offset = 0
+            self._file   = open(self._part, "wb")
+
+        self.etag          = bytes(reply.rawHeader(b"ETag")).decode("latin-1")
+        self.last_modified = bytes(reply.rawHeader(b"Last-Modified")).decode("latin-1")
+        self._write_validator(self.etag or self.last_modified)
+        if self._expected is None:
+            header = bytes(reply.rawHeader(b"X-Checksum-Sha256")).decode("latin-1").strip().lower()
+            self._expected = header or None
+
+        length = reply.header(QNetworkRequest.ContentLengthHeader)
+        self._total = self._offset + int(length) if length is not None else -1
+
+    def _on_ready_read(self) -> None:
+        if self._reply is not None:
+            self._drain(self._reply)
+
+    def _drain(self, reply) -> None:
+        if self._file is None:
+            self._open_part(reply)
+            if self._file is None:
+                reply.readAll()         # тело ошибки — не пишем
+                return
+        got = 0
+        while True:
+            chunk = reply.read(self.READ_BUFFER)
+            if not chunk:
+                break
+            self._file.write(chunk)
+            self._hash.update(chunk)
+            got += len(chunk)
+        if got:
+            self._offset         += got
+            self._attempt_bytes  += got
+            self.bytes_received  += got
+            self.progress.emit(self._offset, self._total)
+
+    def _on_finished(self) -> None:
+        reply, self._reply = self._reply, None
+        if reply is None:
+            return
+        self._drain(reply)              # хвост, пришедший вместе с finished
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        error  = reply.error()
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        reason = reply.errorString()
+        reply.deleteLater()
+
+        if self._aborted:
+            return
+        if status == 304:
+            self._discard_part()
+            self.not_modified.emit()
+            return
+        if error == QNetworkReply.NoError and status in (200, 206):
+            self._complete()
+            return
+
+        if status == 416 and self._offset and not self._restarted:
+            # сохранённый кусок серверу не подходит — начинаем заново
+            self._restarted = True
+            self._discard_part()
+            self._hash, self._offset = hashlib.sha256(), 0
+            self._request()
+            return
+
+        # докачиваем, только если соединение обрывается посреди передачи;
+        # недоступный сервер сразу отдаём вызывающему (там — запасной источник)
+        if self._attempt_bytes and self._retries < self.MAX_RETRIES:
+            self._retries += 1
+            delay = self.RETRY_DELAY_MS * 2 ** (self._retries - 1)
+            logger.warning("Обрыв загрузки на %d байт (%s), докачка через %d мс",
+                           self._offset, reason, delay)
+            QtCore.QTimer.singleShot(delay, self._request)
+            return
+
+        self.failed.emit(reason or f"HTTP {status}")
+
+    def _complete(self) -> None:
+        digest = self._hash.hexdigest()
+        if self._expected and digest != self._expected:
+            self._discard_part()
+            self.failed.emit(f"SHA-256 не совпадает: {digest} вместо {self._expected}")
+            return
+        os.replace(self._part, self.dest_path)
+        self._discard_validator()
+        secs = (time.monotonic_ns() - self._t0) / 1e9
+        logger.info("Скачано %s: %d байт за %.1f с, sha256=%s",
+                    self.dest_path, self._offset, secs, digest)
+        self.finished.emit(self.dest_path, digest)
+
+    # ──────────────────────────────────────────────────────────────
+    #  служебное
+    # ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def _range_start(reply) -> int:
+        # Content-Range: bytes 100-199/200
+        value = bytes(reply.rawHeader(b"Content-Range")).decode("latin-1")
+        try:
+            return int(value.split()[1].split("-")[0])
+        except (IndexError, ValueError):
+            return -1
+
+    def _read_validator(self) -> str:
+        try:
+            with open(self._meta, encoding="utf-8") as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def _write_validator(self, validator: str) -> None:
+        if not validator:
+            self._discard_validator()
+            return
+        with open(self._meta, "w", encoding="utf-8") as f:
+            f.write(validator)
+
+    def _discard_validator(self) -> None:
+        try:
+            os.remove(self._meta)
+        except OSError:
+            pass
+
+    def _discard_part(self) -> None:
+        for path in (self._part, self._meta):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class InstallWorker(QtCore.QObject):
+    """
+    Живёт в отдельном QThread: всё, что трогает диск при установке
+    обновления — сверка файлов с манифестом и сборка новой версии
+    (app_versions.VersionStore: staging-папка, объекты с жёсткими ссылками,
+    атомарное переключение указателя). Запущенная версия не меняется.
+    """
+    installed = QtCore.pyqtSignal(str, str)      # (версия, её папка)
+    diffed    = QtCore.pyqtSignal(object, object)  # (Offer с манифестом, список отличающихся путей)
+    failed    = QtCore.pyqtSignal(str, str)      # (операция, причина)
+
+    @QtCore.pyqtSlot(str, str, str)
+    def install_zip(self, archive: str, app_dir: str, version: str):
+        """Распаковывает ZIP в новую версию; одинаковые файлы берутся из store."""
+        try:
+            store   = VersionStore(install_root(app_dir))
+            staging = store.begin(version)
+            root    = os.path.realpath(staging)
+            with zipfile.ZipFile(archive, "r") as z:
+                for info in z.infolist():
+                    target = os.path.realpath(os.path.join(root, info.filename))
+                    if os.path.commonpath([root, target]) != root:
+                        raise ValueError(f"Путь вне папки приложения: {info.filename}")
+                    z.extract(info, root)
+            store.absorb(staging)
+            final = store.commit(version, staging)
+        except Exception as exc:
+            logger.exception("Ошибка установки %s", archive)
+            self.failed.emit("extract", str(exc))
+            return
+        logger.info("Версия %s собрана: %d файлов по ссылкам, %d новых объектов",
+                    version, store.linked, store.stored)
+        self.installed.emit(version, final)
+
+    @QtCore.pyqtSlot(object, str)
+    def diff(self, offer, app_dir: str):
+        try:
+            changed = diff_tree(offer.data, app_dir)
+        except Exception as exc:
+            logger.exception("Ошибка сверки с манифестом")
+            self.failed.emit("diff", str(exc))
+            return
+        self.diffed.emit(offer, changed)
+
+    @QtCore.pyqtSlot(object, str, str, object)
+    def install_delta(self, manifest: dict, downloads: str, app_dir: str, changed: list):
+        """
+        Собирает версию из манифеста: скачанные файлы (downloads) переносятся
+        в store, неизменившиеся берутся из запущенной версии (app_dir) ссылками.
+        """
+        changed = set(changed)
+        try:
+            store   = VersionStore(install_root(app_dir))
+            staging = store.begin(manifest["version"])
+            for rel, meta in manifest["files"].items():
+                base = downloads if rel in changed else app_dir
+                src  = os.path.join(base, *rel.split("/"))
+                store.add_file(staging, rel, src, meta["sha256"], move=rel in changed)
+            final = store.commit(manifest["version"], staging)
+            shutil.rmtree(downloads, ignore_errors=True)
+        except Exception as exc:
+            logger.exception("Ошибка установки файлов обновления")
+            self.failed.emit("install", str(exc))
+            return
+        logger.info("Версия %s собрана: %d файлов по ссылкам, %d новых объектов",
+                    manifest["version"], store.linked, store.stored)
+        self.installed.emit(manifest["version"], final)
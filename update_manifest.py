@@ -0,0 +1,112 @@
+# update_manifest.py
+"""
+Манифест дельта-обновлений: список файлов приложения с SHA-256 и размером.
+
+    {
+      "version":  "1.0.2",
+      "base_url": "files/",            # относительно адреса манифеста
+      "files": {
+        "timer.py":           {"sha256": "…", "size": 41230},
+        "icons/run_icon.png": {"sha256": "…", "size": 812}
+      }
+    }
+
+Клиент сверяет манифест с установленными файлами (diff_tree), скачивает
+только отличающиеся и собирает из них и неизменившихся файлов новую
+версию (app_versions).
+
+Манифест для сервера собирается командой:
+
+    python update_manifest.py <папка сборки> <версия> > xtimer_manifest.json
+"""
+import os
+import sys
+import json
+import hashlib
+import posixpath
+
+CHUNK = 256 * 1024
+
+# служебное, что не входит в манифест и не сравнивается
+EXCLUDE_DIRS  = {"__pycache__", ".git", ".update_staging", "versions", "store"}
+EXCLUDE_EXTS  = {".pyc", ".log", ".part"}
+EXCLUDE_FILES = {"current.json"}
+
+
+class ManifestError(ValueError):
+    """Манифест повреждён или содержит недопустимый путь."""
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _check_rel(rel: str) -> str:
+    # только относительные пути вида a/b/c без «..»
+    norm = posixpath.normpath(rel)
+    if not rel or rel.startswith(("/", "\\")) or "\\" in rel or ":" in rel \
+            or norm != rel or norm.split("/")[0] == "..":
+        raise ManifestError(f"Недопустимый путь в манифесте: {rel!r}")
+    return rel
+
+
+def parse_manifest(data: bytes) -> dict:
+    """Разбирает и проверяет манифест. Ошибка — ManifestError."""
+    try:
+        info = json.loads(data.decode("utf-8"))
+        files = {
+            _check_rel(rel): {"sha256": str(meta["sha256"]).lower(), "size": int(meta["size"])}
+            for rel, meta in info["files"].items()
+        }
+        return {
+            "version":  str(info["version"]),
+            "base_url": str(info.get("base_url", "")),
+            "files":    files,
+        }
+    except ManifestError:
+        raise
+    except (ValueError, KeyError, TypeError, AttributeError) as exc:
+        raise ManifestError(f"Некорректный манифест: {exc}") from exc
+
+
+def build_manifest(root: str, version: str, base_url: str = "files/") -> dict:
+    """Собирает манифест по содержимому папки root."""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDE_DIRS)
+        for name in sorted(filenames):
+            # xtimer.log.1 … — ротированные копии журнала
+            base, ext = os.path.splitext(name)
+            if ext in EXCLUDE_EXTS or name in EXCLUDE_FILES or (ext[1:].isdigit() and base.endswith(".log")):
+                continue
+            path = os.path.join(dirpath, name)
+            rel  = os.path.relpath(path, root).replace(os.sep, "/")
+            files[rel] = {"sha256": file_sha256(path), "size": os.path.getsize(path)}
+    return {"version": version, "base_url": base_url, "files": files}
+
+
+def diff_tree(manifest: dict, root: str) -> list:
+    """
+    Пути из манифеста, которых нет в root или которые отличаются.
+    Сначала сравнивается размер, хэш считается только при совпадении размера.
+    """
+    changed = []
+    for rel, meta in manifest["files"].items():
+        path = os.path.join(root, *rel.split("/"))
+        try:
+            if os.path.getsize(path) != meta["size"] or file_sha256(path) != meta["sha256"]:
+                changed.append(rel)
+        except OSError:
+            changed.append(rel)
+    return changed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python update_manifest.py <папка сборки> <версия>")
+    json.dump(build_manifest(sys.argv[1], sys.argv[2]), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
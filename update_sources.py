@@ -0,0 +1,73 @@
+# update_sources.py
+"""
+Источники сведений о новой версии для UpdateChecker.
+
+Все источники опрашиваются одновременно, у каждого свой срок ответа
+(timeout_ms). Источник знает, какой запрос отправить и как разобрать
+тело ответа в Offer — предложение обновиться до version.
+
+Чтобы добавить источник, достаточно унаследовать UpdateSource и передать
+список в UpdateChecker(sources=[...]).
+"""
+import json
+from collections import namedtuple
+
+from PyQt5.QtCore    import QUrl
+from PyQt5.QtNetwork import QNetworkRequest
+from update_manifest import parse_manifest
+
+# source — UpdateSource, давший ответ; kind — "delta" (манифест: можно
+# установить) или "release" (только ссылка на страницу релиза); data —
+# манифест или html_url соответственно
+Offer = namedtuple("Offer", "source version kind data")
+
+
+class UpdateSource:
+    """Базовый источник: GET по url, разбор тела в Offer (None — версии нет)."""
+    name       = "source"
+    kind       = ""
+    timeout_ms = 5000
+
+    def __init__(self, url: str, timeout_ms: int | None = None):
+        self.url = url
+        if timeout_ms is not None:
+            self.timeout_ms = timeout_ms
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.url!r})"
+
+    def request(self) -> QNetworkRequest:
+        return QNetworkRequest(QUrl(self.url))
+
+    def parse(self, body: str) -> Offer | None:
+        raise NotImplementedError
+
+
+class ManifestSource(UpdateSource):
+    """Манифест дельта-обновлений на сервере проекта."""
+    name       = "server"
+    kind       = "delta"
+    timeout_ms = 3000
+
+    def parse(self, body: str) -> Offer | None:
+        manifest = parse_manifest(body.encode("utf-8"))
+        return Offer(self, manifest["version"], self.kind, manifest)
+
+
+class GitHubSource(UpdateSource):
+    """Последний релиз в GitHub Releases."""
+    name       = "github"
+    kind       = "release"
+    timeout_ms = 8000
+
+    def request(self) -> QNetworkRequest:
+        req = super().request()
+        req.setRawHeader(b"Accept", b"application/vnd.github.v3+json")
+        return req
+
+    def parse(self, body: str) -> Offer | None:
+        info = json.loads(body)
+        tag  = info.get("tag_name", "")
+        if not tag:
+            return None
+        return Offer(self, tag, self.kind, info.get("html_url", ""))
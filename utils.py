@@ -18,21 +18,19 @@ RAW_DEFAULT_PRESETS = [
 ]
 
 def get_settings() -> QtCore.QSettings:
-    """Единый QSettings для всего приложения."""
+    """
+    Единый QSettings для всего приложения — бэкенд SettingsStore;
+    читать/писать настройки следует через SettingsStore.instance().
+    """
     return QtCore.QSettings("MyCompany", "TaskbarTimer")
 
 def load_raw_presets() -> list[dict]:
     """
-    Загружает список пресетов из QSettings (список dict {'name', 'minutes'}),
-    или возвращает RAW_DEFAULT_PRESETS, если настроек нет или они некорректны.
+    Список пресетов (list[dict{'name', 'minutes'}]) из хранилища настроек —
+    уже проверенный при загрузке; RAW_DEFAULT_PRESETS, если своих нет.
     """
-    settings = get_settings()
-    raw = settings.value("presets/list", [], type=list)
-    cleaned = []
-    for item in raw:
-        if isinstance(item, dict) and "name" in item and "minutes" in item:
-            cleaned.append(item)
-    return cleaned or RAW_DEFAULT_PRESETS
+    from settings_store import SettingsStore   # settings_store сам импортирует utils
+    return SettingsStore.instance().presets
 
 def load_presets() -> list[tuple[str,int]]:
     """Возвращает список пресетов в виде [(name, minutes), ...]."""
@@ -40,9 +38,10 @@ def load_presets() -> list[tuple[str,int]]:
 
 def save_presets(presets: list[dict | tuple]) -> None:
     """
-    Сохраняет пресеты в QSettings.
+    Сохраняет пресеты в хранилище настроек (в QSettings — отложенным flush).
     Аргумент — либо list[dict{'name','minutes'}], либо list[(name,minutes)].
     """
+    from settings_store import SettingsStore
     dicts = []
     for item in presets:
         if isinstance(item, tuple):
@@ -52,4 +51,4 @@ def save_presets(presets: list[dict | tuple]) -> None:
         else:
             continue
         dicts.append({"name": name, "minutes": mins})
-    get_settings().setValue("presets/list", dicts)
+    SettingsStore.instance().update(presets=dicts)